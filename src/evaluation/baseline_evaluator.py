@@ -1,13 +1,21 @@
 import pandas as pd
 import numpy as np
 
+try:
+    from modeling.coverage import nearest_grid_positions, radius_covered_demand
+    from evaluation.random_baseline import simulate_random_installation
+except ImportError:
+    from src.modeling.coverage import nearest_grid_positions, radius_covered_demand
+    from src.evaluation.random_baseline import simulate_random_installation
+
 def evaluate_existing_stations(
     features: pd.DataFrame,
     station_df: pd.DataFrame,
     lat_col: str = 'lat',
     lon_col: str = 'lon',
     coord_col: str = '위도경도',
-    verbose: bool = True
+    verbose: bool = True,
+    radius_km: float = None
 ) -> dict:
     """
     기존 충전소 위치를 기반으로 커버 수요를 계산하는 baseline 평가 함수
@@ -18,78 +26,124 @@ def evaluate_existing_stations(
     - lat_col, lon_col: 위도/경도 열 이름
     - coord_col: '위도,경도' 문자열 열 이름
     - verbose: 평가 지표 출력 여부
+    - radius_km: 지정하면 충전소 좌표에서 반경(km) 이내 격자의 수요를 커버로 계산 (MCLP와 같은 기준)
+      (None이면 충전소가 위치한 격자의 수요만 계산)
 
     Returns:
     - dict: {'coverage': float, 'coverage_rate': float, 'covered_grids': int}
+      (radius_km 지정 시 'radius_km', 'covered_demand_grids' 추가)
     """
 
     # 위도, 경도 추출
     if coord_col and coord_col in station_df.columns:
         station_df[[lat_col, lon_col]] = station_df[coord_col].str.split(",", expand=True).astype(float)
 
-    # 가장 가까운 격자 grid_id 찾기
-    def find_nearest_grid(lat, lon):
-        dists = ((features['center_lat'] - lat) ** 2 + (features['center_lon'] - lon) ** 2)
-        return features.loc[dists.idxmin(), 'grid_id']
-
     # 좌표 결측 제거
     station_df = station_df.dropna(subset=[lat_col, lon_col]).copy()
 
-    # grid_id 매핑
-    station_df['grid_id'] = station_df.apply(
-        lambda row: find_nearest_grid(row[lat_col], row[lon_col]),
-        axis=1
-    )
-
+    # grid_id 매핑 (가장 가까운 격자 중심, KDTree로 한 번에 조회)
+    nearest = nearest_grid_positions(features, station_df[lat_col], station_df[lon_col])
+    station_df['grid_id'] = features['grid_id'].to_numpy()[nearest]
 
     # 중복된 grid_id 제거 후 coverage 계산
     station_grids = station_df['grid_id'].unique()
-    covered = features[features['grid_id'].isin(station_grids)]
-    coverage = covered['predicted_demand_score'].sum()
+    if radius_km is None:
+        covered = features[features['grid_id'].isin(station_grids)]
+        coverage = covered['predicted_demand_score'].sum()
+    else:
+        coverage, covered_demand_grids = radius_covered_demand(
+            features, radius_km, points=(station_df[lat_col], station_df[lon_col])
+        )
     total = features['predicted_demand_score'].sum()
     rate = coverage / total * 100
 
     if verbose:
         print(f"[Baseline ① 기존 충전소 기준]")
         print(f"- 설치 격자 수: {len(station_grids)}")
+        if radius_km is not None:
+            print(f"- 커버 반경: {radius_km}km (반경 내 격자 {covered_demand_grids}개)")
         print(f"- 커버 수요: {coverage:,.2f}")
         print(f"- 전체 수요: {total:,.2f}")
         print(f"- 커버율: {rate:.2f}%")
 
-    return {
+    result = {
         'coverage': coverage,
         'coverage_rate': rate,
         'covered_grids': len(station_grids)
     }
+    if radius_km is not None:
+        result.update({'radius_km': radius_km, 'covered_demand_grids': covered_demand_grids})
+    return result
     
-def evaluate_random_installation(features: pd.DataFrame, n: int, seed: int = 42, verbose: bool = True) -> dict:
+def evaluate_random_installation(
+    features: pd.DataFrame,
+    n: int,
+    seed: int = 42,
+    verbose: bool = True,
+    radius_km: float = None,
+    n_draws: int = None,
+    mclp_grid_ids=None
+) -> dict:
     """
     전체 격자 중 무작위로 n개를 선택해 커버 수요 평가
 
+    Parameters:
+    - radius_km: 지정하면 선택 격자에서 반경(km) 이내 격자의 수요를 커버로 계산
+    - n_draws: 지정하면 Monte-Carlo 모드 (무작위 n개 선택을 n_draws번 샘플링한 분포,
+      random_baseline.simulate_random_installation 참고)
+    - mclp_grid_ids: Monte-Carlo 모드에서 분포 내 백분위를 계산할 MCLP 선택 격자 ID
+
     Returns:
     - dict with keys: 'coverage', 'coverage_rate', 'covered_grids'
+      (radius_km 지정 시 'radius_km', 'covered_demand_grids' 추가,
+       Monte-Carlo 모드는 coverage/coverage_rate가 평균이고 std, quantiles, mclp_percentile_rank 등 추가)
     """
+    if n_draws is not None:
+        return simulate_random_installation(
+            features, n, n_draws=n_draws, seed=seed, radius_km=radius_km,
+            mclp_grid_ids=mclp_grid_ids, verbose=verbose
+        )
+
     np.random.seed(seed)
     sampled = features.sample(n=n, random_state=seed)
-    coverage = sampled['predicted_demand_score'].sum()
+    if radius_km is None:
+        coverage = sampled['predicted_demand_score'].sum()
+    else:
+        coverage, covered_demand_grids = radius_covered_demand(
+            features, radius_km, site_mask=features.index.isin(sampled.index)
+        )
     total = features['predicted_demand_score'].sum()
     rate = coverage / total * 100
 
     if verbose:
         print(f"[Baseline ② 랜덤 설치]")
         print(f"- 설치 격자 수: {n}")
+        if radius_km is not None:
+            print(f"- 커버 반경: {radius_km}km (반경 내 격자 {covered_demand_grids}개)")
         print(f"- 커버 수요: {coverage:,.2f}")
         print(f"- 전체 수요: {total:,.2f}")
         print(f"- 커버율: {rate:.2f}%")
 
-    return {'coverage': coverage, 'coverage_rate': rate, 'covered_grids': n}
+    result = {'coverage': coverage, 'coverage_rate': rate, 'covered_grids': n}
+    if radius_km is not None:
+        result.update({'radius_km': radius_km, 'covered_demand_grids': covered_demand_grids})
+    return result
 
-def evaluate_cluster_centers(features: pd.DataFrame, cluster_col: str = 'cluster', verbose: bool = True) -> dict:
+def evaluate_cluster_centers(
+    features: pd.DataFrame,
+    cluster_col: str = 'cluster',
+    verbose: bool = True,
+    radius_km: float = None
+) -> dict:
     """
     클러스터 중심에 가장 가까운 격자를 선택하여 커버 수요 평가
 
+    Parameters:
+    - radius_km: 지정하면 선택 격자에서 반경(km) 이내 격자의 수요를 커버로 계산
+
     Returns:
     - dict with keys: 'coverage', 'coverage_rate', 'covered_grids'
+      (radius_km 지정 시 'radius_km', 'covered_demand_grids' 추가)
     """
     selected_ids = []
 
@@ -100,23 +154,33 @@ def evaluate_cluster_centers(features: pd.DataFrame, cluster_col: str = 'cluster
         nearest = group.loc[dists.idxmin(), 'grid_id']
         selected_ids.append(nearest)
 
-    selected = features[features['grid_id'].isin(selected_ids)]
-    coverage = selected['predicted_demand_score'].sum()
+    selected_mask = features['grid_id'].isin(selected_ids)
+    if radius_km is None:
+        coverage = features.loc[selected_mask, 'predicted_demand_score'].sum()
+    else:
+        coverage, covered_demand_grids = radius_covered_demand(
+            features, radius_km, site_mask=selected_mask.to_numpy()
+        )
     total = features['predicted_demand_score'].sum()
     rate = coverage / total * 100
 
     if verbose:
         print(f"[Baseline ③ 클러스터 중심 설치]")
         print(f"- 설치 격자 수: {len(selected_ids)}")
+        if radius_km is not None:
+            print(f"- 커버 반경: {radius_km}km (반경 내 격자 {covered_demand_grids}개)")
         print(f"- 커버 수요: {coverage:,.2f}")
         print(f"- 전체 수요: {total:,.2f}")
         print(f"- 커버율: {rate:.2f}%")
 
-    return {
+    result = {
         'coverage': coverage,
         'coverage_rate': rate,
         'covered_grids': len(selected_ids)
     }
+    if radius_km is not None:
+        result.update({'radius_km': radius_km, 'covered_demand_grids': covered_demand_grids})
+    return result
 
 def evaluate_mclp_result(
     df: pd.DataFrame,
@@ -1,30 +1,159 @@
+import numpy as np
 import pandas as pd
 
+# 8비트 popcount 테이블 (np.bitwise_count가 없는 NumPy < 2.0용)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# 수요 순위표 캐시 (같은 DataFrame의 grid_id/수요가 그대로면 정렬을 다시 하지 않음)
+_RANK_CACHE = {}
+_RANK_CACHE_SIZE = 4
+
+
+def popcount(words):
+    """uint64 비트셋 배열의 마지막 축 방향 1비트 개수"""
+    words = np.asarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class GridBitsets:
+    """
+    격자 집합을 정수 격자 인덱스 위의 packed 비트셋(uint64 word 배열)으로 표현합니다.
+    (전략 간 교집합/합집합/차집합과 격자 수 계산을 AND/OR/popcount로 처리)
+    """
+
+    def __init__(self, grid_ids):
+        self.grid_ids = pd.Index(pd.unique(pd.Series(grid_ids).dropna()))
+        self.n_grids = len(self.grid_ids)
+        self.n_words = max(1, -(-self.n_grids // 64))
+        self.all_bits = self.pack_mask(np.ones(self.n_grids, dtype=bool))
+
+    def pack_mask(self, mask):
+        """격자 bool 마스크 (…, n_grids) → uint64 비트셋 (…, n_words)"""
+        mask = np.asarray(mask, dtype=bool)
+        padded = np.zeros(mask.shape[:-1] + (self.n_words * 64,), dtype=bool)
+        padded[..., :self.n_grids] = mask
+        packed = np.packbits(padded, axis=-1, bitorder='little')
+        return np.ascontiguousarray(packed).view(np.uint64)
+
+    def unpack(self, bits):
+        """uint64 비트셋 (…, n_words) → 격자 bool 마스크 (…, n_grids)"""
+        as_bytes = np.ascontiguousarray(bits, dtype=np.uint64).view(np.uint8)
+        return np.unpackbits(as_bytes, axis=-1, bitorder='little')[..., :self.n_grids].astype(bool)
+
+    def pack(self, grid_ids):
+        """grid_id 집합 → 비트셋 (격자 목록에 없는 ID는 무시)"""
+        positions = self.grid_ids.get_indexer(list(grid_ids))
+        mask = np.zeros(self.n_grids, dtype=bool)
+        mask[positions[positions >= 0]] = True
+        return self.pack_mask(mask)
+
+    def to_ids(self, bits):
+        """비트셋 → grid_id 집합"""
+        return set(self.grid_ids[self.unpack(bits)])
+
+
 def analyze_new_coverage(features_df, strategy_sets, base_label="기존 충전소 전체", demand_col="predicted_demand_score", verbose=True):
-    total_demand = features_df[demand_col].sum()
-    uncovered = set(features_df['grid_id']) - strategy_sets[base_label]
+    """
+    기존 설치(base_label)가 커버하지 않은 격자 중 전략별로 새롭게 커버한 격자/수요를 계산합니다.
+
+    - 모든 전략을 (전략 수 × word 수) 비트셋 행렬로 만들어 AND/OR/popcount로 한 번에 계산
+    - 신규 수요는 격자별 수요 합 벡터와 신규 격자 마스크 행렬의 곱
+
+    Returns:
+    - results (dict): 전략별 new_grids(set), count, covered_demand, overlap_count(기존과 겹치는 격자 수), bits
+    - uncovered (set): 기존 설치가 커버하지 않는 격자
+    """
+    bitsets = GridBitsets(features_df['grid_id'])
+    codes = bitsets.grid_ids.get_indexer(features_df['grid_id'])
+    valid = codes >= 0
+    # 수요 결측은 pandas sum처럼 0으로 (bincount 전에 채워야 같은 격자의 다른 행 수요가 보존됨)
+    demand = features_df[demand_col].fillna(0).to_numpy(dtype=float)
+    grid_demand = np.bincount(codes[valid], weights=demand[valid], minlength=bitsets.n_grids)
+
+    base_bits = bitsets.pack(strategy_sets[base_label])
+    uncovered_bits = bitsets.all_bits & ~base_bits
 
+    labels = [label for label in strategy_sets if label != base_label]
     results = {}
-    for label, grid_ids in strategy_sets.items():
-        if label == base_label:
-            continue
-        new_coverage = grid_ids & uncovered
-        demand = features_df[features_df['grid_id'].isin(new_coverage)][demand_col].sum()
-        results[label] = {
-            "new_grids": new_coverage,
-            "count": len(new_coverage),
-            "covered_demand": demand
-        }
-        if verbose:
-            print(f"{label}가 새롭게 커버한 격자 수: {len(new_coverage)}")
-            print(f"{label}가 새롭게 커버한 수요: {demand:,.2f}")
-    return results, uncovered
+    if labels:
+        strategy_bits = np.vstack([bitsets.pack(strategy_sets[label]) for label in labels])
+        new_bits = strategy_bits & uncovered_bits
+        new_counts = popcount(new_bits)
+        overlap_counts = popcount(strategy_bits & base_bits)
+        new_demand = bitsets.unpack(new_bits).astype(float) @ grid_demand
 
-def compute_percentiles(features_df, grid_ids, demand_col='predicted_demand_score', label='전략'):
-    sorted_df = features_df.sort_values(by=demand_col, ascending=False).reset_index(drop=True)
-    sorted_df['rank'] = sorted_df.index + 1
-    sorted_df['percentile'] = sorted_df['rank'] / len(sorted_df) * 100
+        for row, label in enumerate(labels):
+            results[label] = {
+                "new_grids": bitsets.to_ids(new_bits[row]),
+                "count": int(new_counts[row]),
+                "covered_demand": float(new_demand[row]),
+                "overlap_count": int(overlap_counts[row]),
+                "bits": new_bits[row]
+            }
+            if verbose:
+                print(f"{label}가 새롭게 커버한 격자 수: {new_counts[row]}")
+                print(f"{label}가 새롭게 커버한 수요: {new_demand[row]:,.2f}")
+
+    return results, bitsets.to_ids(uncovered_bits)
+
+
+class DemandRanks:
+    """
+    수요 내림차순 순위표를 한 번만 만들어 두고, 전략별 백분위 조회는 배열 인덱싱으로 처리합니다.
+    """
+
+    def __init__(self, features_df, demand_col='predicted_demand_score'):
+        self.demand_col = demand_col
+        # 캐시 재사용 시 원본이 바뀌지 않았는지 확인하기 위한 스냅샷
+        self._source_ids = features_df['grid_id'].to_numpy(copy=True)
+        self._source_demand = features_df[demand_col].to_numpy(dtype=float, copy=True)
+
+        sorted_df = features_df.sort_values(by=demand_col, ascending=False).reset_index(drop=True)
+        sorted_df['rank'] = sorted_df.index + 1
+        sorted_df['percentile'] = sorted_df['rank'] / len(sorted_df) * 100
+        self.table = sorted_df[['grid_id', demand_col, 'rank', 'percentile']]
+
+        # grid_id → 순위표 행 위치 (grid_id가 유일할 때만 해시 조회 사용)
+        self._index = pd.Index(self.table['grid_id'])
+        self._unique = self._index.is_unique
 
-    selected = sorted_df[sorted_df['grid_id'].isin(grid_ids)].copy()
+    def matches(self, features_df):
+        """features_df의 grid_id/수요가 순위표를 만들 때와 같은지 확인 (해시 없이 배열 비교)"""
+        if len(features_df) != len(self._source_ids):
+            return False
+        demand = features_df[self.demand_col].to_numpy(dtype=float)
+        ids = features_df['grid_id'].to_numpy()
+        return bool(np.array_equal(demand, self._source_demand, equal_nan=True)
+                    and pd.Series(ids).equals(pd.Series(self._source_ids)))
+
+    def lookup(self, grid_ids):
+        """grid_id 집합의 순위/백분위 (순위 순서)"""
+        if self._unique:
+            positions = self._index.get_indexer(list(grid_ids))
+            positions = np.sort(positions[positions >= 0])
+        else:
+            positions = np.flatnonzero(self.table['grid_id'].isin(grid_ids).to_numpy())
+        return self.table.iloc[positions]
+
+
+def get_demand_ranks(features_df, demand_col='predicted_demand_score'):
+    """같은 DataFrame이고 grid_id/수요가 그대로면 캐시된 DemandRanks 재사용"""
+    key = (id(features_df), demand_col)
+
+    ranks = _RANK_CACHE.get(key)
+    if ranks is None or not ranks.matches(features_df):
+        ranks = DemandRanks(features_df, demand_col)
+        _RANK_CACHE.pop(key, None)
+        if len(_RANK_CACHE) >= _RANK_CACHE_SIZE:
+            _RANK_CACHE.pop(next(iter(_RANK_CACHE)))
+        _RANK_CACHE[key] = ranks
+    return ranks
+
+
+def compute_percentiles(features_df, grid_ids, demand_col='predicted_demand_score', label='전략'):
+    selected = get_demand_ranks(features_df, demand_col).lookup(grid_ids).copy()
     selected['strategy'] = label
     return selected[['grid_id', demand_col, 'rank', 'percentile', 'strategy']]
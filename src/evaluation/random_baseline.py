@@ -0,0 +1,143 @@
+# src/evaluation/random_baseline.py
+# 랜덤 설치 baseline의 Monte-Carlo 분포 (무작위 n개 선택을 수천 번 한 번에 샘플링)
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+try:
+    from modeling.coverage import grid_coverage
+except ImportError:
+    from src.modeling.coverage import grid_coverage
+
+# 배치당 난수 키 행렬 최대 원소 수 (float32 기준 약 64MB)
+MAX_BATCH_ELEMENTS = 16_000_000
+
+
+def simulate_random_installation(
+    features: pd.DataFrame,
+    n: int,
+    n_draws: int = 10000,
+    seed: int = 42,
+    radius_km: float = None,
+    mclp_grid_ids=None,
+    mclp_coverage: float = None,
+    quantiles: tuple = (0.05, 0.25, 0.5, 0.75, 0.95),
+    demand_col: str = 'predicted_demand_score',
+    batch_size: int = None,
+    return_draws: bool = False,
+    verbose: bool = True
+) -> dict:
+    """
+    전체 격자 중 무작위 n개 설치를 n_draws번 샘플링해 커버 수요 분포를 계산합니다.
+
+    - 배치마다 (draw 수 × 격자 수) 난수 키를 만들고 argpartition으로 draw별 n개 인덱스를 한 번에 선택
+    - radius_km가 없으면 선택 격자 수요 합, 있으면 반경 커버리지 CSR과의 희소 행렬 곱으로
+      draw별 커버 격자(중복 제외) 수요 합을 한 번에 계산
+
+    Parameters:
+    - n: 설치 격자 수
+    - n_draws: 샘플링 횟수
+    - radius_km: 지정하면 선택 격자에서 반경(km) 이내 격자 수요를 커버로 계산 (MCLP와 같은 기준)
+    - mclp_grid_ids: MCLP 선택 격자 ID (같은 기준으로 커버 수요를 계산해 분포 내 백분위 산출)
+    - mclp_coverage: MCLP 커버 수요를 직접 지정 (mclp_grid_ids보다 우선)
+    - quantiles: 보고할 분위수
+    - batch_size: 한 번에 샘플링할 draw 수 (None이면 메모리 한도에 맞춰 자동)
+    - return_draws: True면 draw별 커버 수요 배열도 반환
+
+    Returns:
+    - dict: coverage(평균), coverage_rate(평균 %), covered_grids(n), std, quantiles, n_draws, seconds
+      (MCLP 지정 시 mclp_coverage, mclp_percentile_rank: 랜덤 draw 중 MCLP보다 낮은 비율 %)
+    """
+    start = time.perf_counter()
+    demand = features[demand_col].fillna(0).to_numpy(dtype=float)
+    total = float(demand.sum())
+    n_grids = len(demand)
+    if not 0 < n <= n_grids:
+        raise ValueError(f"n은 1 이상 격자 수({n_grids}) 이하여야 합니다.")
+
+    coverage_matrix = grid_coverage(features, radius_km).matrix if radius_km is not None else None
+    # 배치마다 변환하지 않도록 희소 행렬 곱용 int32 CSR은 한 번만 만듦
+    coverage_counts = coverage_matrix.astype(np.int32) if coverage_matrix is not None else None
+    if batch_size is None:
+        batch_size = max(1, MAX_BATCH_ELEMENTS // n_grids)
+
+    rng = np.random.default_rng(seed)
+    draws = np.empty(n_draws, dtype=float)
+    for batch_start in range(0, n_draws, batch_size):
+        batch = min(batch_size, n_draws - batch_start)
+
+        # draw마다 무작위 키의 하위 n개 = 비복원 균등 추출
+        keys = rng.random((batch, n_grids), dtype=np.float32)
+        selected = np.argpartition(keys, n - 1, axis=1)[:, :n]
+
+        if coverage_matrix is None:
+            draws[batch_start:batch_start + batch] = demand[selected].sum(axis=1)
+        else:
+            draws[batch_start:batch_start + batch] = _radius_coverage(selected, coverage_counts, demand)
+
+    result = {
+        'coverage': float(draws.mean()),
+        'coverage_rate': float(draws.mean() / total * 100) if total else np.nan,
+        'covered_grids': n,
+        'std': float(draws.std(ddof=1)) if n_draws > 1 else 0.0,
+        'quantiles': {q: float(value) for q, value in zip(quantiles, np.quantile(draws, quantiles))},
+        'n_draws': n_draws,
+        'radius_km': radius_km
+    }
+
+    if mclp_coverage is None and mclp_grid_ids is not None:
+        mclp_grid_ids = set(mclp_grid_ids)
+        if len(mclp_grid_ids) != n and verbose:
+            print(f"⚠️ MCLP 선택 격자 수({len(mclp_grid_ids)})와 랜덤 설치 수({n})가 다릅니다.")
+        mclp_coverage = _selection_coverage(features, mclp_grid_ids, demand, coverage_matrix)
+    if mclp_coverage is not None:
+        # 동점은 절반만 반영한 백분위 순위
+        below = np.count_nonzero(draws < mclp_coverage)
+        ties = np.count_nonzero(draws == mclp_coverage)
+        result['mclp_coverage'] = float(mclp_coverage)
+        result['mclp_percentile_rank'] = float((below + 0.5 * ties) / n_draws * 100)
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    if return_draws:
+        result['draws'] = draws
+
+    if verbose:
+        print(f"[Baseline ② 랜덤 설치 Monte-Carlo] {n_draws:,}회, 설치 {n}개"
+              + (f", 반경 {radius_km}km" if radius_km is not None else ""))
+        print(f"- 평균 커버 수요: {result['coverage']:,.2f} (표준편차 {result['std']:,.2f})")
+        print(f"- 평균 커버율: {result['coverage_rate']:.2f}%")
+        print("- 분위수: " + ", ".join(f"{q:.0%} {value:,.2f}" for q, value in result['quantiles'].items()))
+        if 'mclp_percentile_rank' in result:
+            print(f"- MCLP 커버 수요 {result['mclp_coverage']:,.2f} → 랜덤 분포 상위 "
+                  f"{100 - result['mclp_percentile_rank']:.2f}% (백분위 {result['mclp_percentile_rank']:.2f})")
+        print(f"- 소요 시간: {result['seconds']:.2f}초")
+
+    return result
+
+
+def _radius_coverage(selected, coverage_counts, demand):
+    """
+    draw별 선택 격자 (batch × n) → 반경 내 커버 격자 수요 합 (batch,)
+    선택 행렬(batch × 격자)과 커버리지 int32 CSR(격자 × 격자)의 곱에서 0보다 큰 칸이 커버된 격자
+    """
+    batch, n = selected.shape
+    selection = csr_matrix(
+        (np.ones(batch * n, dtype=np.int32), selected.ravel(), np.arange(0, batch * n + 1, n)),
+        shape=(batch, coverage_counts.shape[0])
+    )
+    covered = selection @ coverage_counts
+    covered.data = (covered.data > 0).astype(float)
+    return covered @ demand
+
+
+def _selection_coverage(features, grid_ids, demand, coverage_matrix=None):
+    """선택 격자 ID 집합의 커버 수요 (랜덤 draw와 같은 기준)"""
+    site_mask = features['grid_id'].isin(grid_ids).to_numpy()
+    if coverage_matrix is None:
+        return float(demand[site_mask].sum())
+    covered = np.zeros(len(demand), dtype=bool)
+    covered[coverage_matrix[np.flatnonzero(site_mask)].indices] = True
+    return float(demand[covered].sum())
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def evaluate_strategy(label: str, selected_grids: set, df: pd.DataFrame, demand_col: str = 'predicted_demand_score'):
@@ -13,3 +14,97 @@ def evaluate_strategy(label: str, selected_grids: set, df: pd.DataFrame, demand_
     print(f"- 전체 수요: {total_demand:,.2f}")
     print(f"- 커버율: {coverage_rate:.2f}%")
     print(f"- 설치 1개당 커버 수요 (효율): {efficiency:,.2f}")
+
+
+class StrategyEvaluator:
+    """
+    여러 설치 전략을 한 번에 평가하는 클래스
+
+    - 수요 벡터와 전체 수요는 생성 시 한 번만 계산
+    - 전략들을 (전략 수 × 격자 수) boolean 선택 행렬로 받아 행렬-벡터 곱 한 번으로
+      커버 수요 / 커버율 / 효율을 계산 (evaluate_strategy와 같은 정의)
+    """
+
+    def __init__(self, features: pd.DataFrame, demand_col: str = 'predicted_demand_score', id_col: str = 'grid_id'):
+        """
+        Parameters:
+        - features: 격자별 수요 DataFrame (id_col, demand_col 포함)
+        - demand_col: 수요 컬럼 (결측은 0으로 간주, pandas sum과 동일)
+        - id_col: 격자 ID 컬럼
+        """
+        self.demand_col = demand_col
+        self.grid_ids = features[id_col].to_numpy()
+        self.demand = features[demand_col].fillna(0).to_numpy(dtype=float)
+        self.total_demand = float(self.demand.sum())
+
+        # 격자 ID → 고유 코드 (같은 grid_id가 여러 행이어도 isin과 같이 모두 선택되도록)
+        self._grid_codes, unique_ids = pd.factorize(self.grid_ids)
+        self._unique_ids = pd.Index(unique_ids)
+
+    @property
+    def n_grids(self):
+        return len(self.demand)
+
+    def selection_matrix(self, strategy_sets: dict):
+        """
+        {전략명: grid_id 집합}을 (전략 수 × 격자 수) boolean 선택 행렬로 변환합니다.
+
+        Returns:
+        - labels (list): 전략명 (행 순서)
+        - selection (np.ndarray): bool 행렬
+        - installed (np.ndarray): 전략별 설치 격자 수 (집합 크기, evaluate_strategy와 동일)
+        """
+        labels = list(strategy_sets.keys())
+        unique_selected = np.zeros((len(labels), len(self._unique_ids)), dtype=bool)
+        installed = np.zeros(len(labels), dtype=int)
+
+        for row, label in enumerate(labels):
+            grid_ids = list(strategy_sets[label])
+            installed[row] = len(grid_ids)
+            positions = self._unique_ids.get_indexer(grid_ids)
+            unique_selected[row, positions[positions >= 0]] = True
+
+        return labels, unique_selected[:, self._grid_codes], installed
+
+    def evaluate_matrix(self, selection, labels=None, installed=None, verbose: bool = False) -> pd.DataFrame:
+        """
+        선택 행렬로 모든 전략을 한 번에 평가합니다.
+
+        Parameters:
+        - selection: (전략 수 × 격자 수) boolean 행렬 (numpy 또는 scipy.sparse)
+        - labels: 전략명 리스트 (None이면 0..S-1)
+        - installed: 전략별 설치 수 (None이면 선택 행렬의 행 합)
+
+        Returns:
+        - pd.DataFrame: strategy, installed, covered_demand, total_demand, coverage_rate, efficiency
+        """
+        if selection.shape[1] != self.n_grids:
+            raise ValueError(f"선택 행렬의 열 수({selection.shape[1]})가 격자 수({self.n_grids})와 다릅니다.")
+
+        covered = np.asarray(selection @ self.demand, dtype=float).ravel()
+        if installed is None:
+            installed = np.asarray(selection.sum(axis=1)).ravel()
+        installed = np.asarray(installed)
+        labels = list(labels) if labels is not None else list(range(len(covered)))
+
+        efficiency = np.where(installed > 0, covered / np.maximum(installed, 1), 0.0)
+
+        results = pd.DataFrame({
+            'strategy': labels,
+            'installed': installed.astype(int),
+            'covered_demand': covered,
+            'total_demand': self.total_demand,
+            'coverage_rate': covered / self.total_demand * 100 if self.total_demand else np.nan,
+            'efficiency': efficiency
+        })
+
+        if verbose:
+            print("[전략별 평가]")
+            print(results.to_string(index=False, float_format=lambda value: f"{value:,.2f}"))
+
+        return results
+
+    def evaluate(self, strategy_sets: dict, verbose: bool = False) -> pd.DataFrame:
+        """{전략명: grid_id 집합}을 선택 행렬로 바꿔 한 번에 평가"""
+        labels, selection, installed = self.selection_matrix(strategy_sets)
+        return self.evaluate_matrix(selection, labels=labels, installed=installed, verbose=verbose)
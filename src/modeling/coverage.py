@@ -0,0 +1,172 @@
+# src/modeling/coverage.py
+# 반경 기반 커버리지 (BallTree haversine + CSR 희소 행렬) - 베이스라인 평가 / MCLP 후처리에서 공유
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.neighbors import BallTree, KDTree
+
+# 지구 평균 반경 (km) - BallTree haversine 후보 탐색용
+EARTH_RADIUS_KM = 6371.0088
+
+# WGS84 타원체 (MCLP의 geopy geodesic과 같은 기준으로 반경 경계를 판정)
+WGS84_A_KM = 6378.137
+WGS84_E2 = 6.69437999014e-3
+
+# 구면(haversine)과 타원체 거리 차이(최대 약 0.6%)를 덮는 후보 탐색 여유 비율
+CANDIDATE_MARGIN = 1.01
+
+# 같은 좌표/반경의 커버리지 구조 재사용 (평가 함수 여러 번 호출 시 BallTree/CSR 재생성 방지)
+_COVERAGE_CACHE = {}
+_COVERAGE_CACHE_SIZE = 8
+
+
+class GridCoverage:
+    """
+    격자 중심 좌표로 BallTree(haversine)를 한 번 만들고, 반경 내 격자 목록을 CSR 희소 행렬로 보관합니다.
+
+    - matrix: (설치 후보 격자 × 수요 격자) CSR, matrix[i]의 열 = 격자 i에서 radius_km 이내 격자 위치
+    - cover_points: 임의 좌표(기존 충전소 등)에서 반경 내 격자 CSR
+    - 좌표 결측 격자는 어떤 설치지에서도 커버되지 않음
+    """
+
+    def __init__(self, lat, lon, radius_km):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        self.radius_km = float(radius_km)
+        self.n_grids = len(lat)
+
+        self._valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.tree = BallTree(np.radians(np.column_stack([lat[self._valid], lon[self._valid]])), metric='haversine')
+        self._lat, self._lon = lat, lon
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """격자 × 격자 커버리지 CSR (처음 사용할 때 한 번만 계산)"""
+        if self._matrix is None:
+            self._matrix = self.cover_points(self._lat, self._lon)
+        return self._matrix
+
+    def cover_points(self, lat, lon):
+        """
+        좌표 목록 각각에서 반경 내 격자를 CSR (좌표 수 × 격자 수)로 반환합니다.
+
+        - BallTree(haversine)로 여유 반경 내 후보를 찾은 뒤,
+          WGS84 타원체 국소 거리로 반경 경계를 다시 판정 (geodesic과 같은 결과)
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+
+        counts = np.zeros(len(lat), dtype=np.int64)
+        indices = np.empty(0, dtype=np.int64)
+        if len(valid):
+            points = np.radians(np.column_stack([lat[valid], lon[valid]]))
+            found = self.tree.query_radius(points, r=self.radius_km * CANDIDATE_MARGIN / EARTH_RADIUS_KM)
+
+            found_counts = np.fromiter((len(idx) for idx in found), dtype=np.int64, count=len(found))
+            rows = np.repeat(valid, found_counts)
+            candidates = self._valid[np.concatenate(found)] if len(found) else np.empty(0, dtype=np.int64)
+
+            # 후보 쌍 거리를 한 번에 계산해 반경 밖 후보 제거
+            distance = _ellipsoid_distance_km(lat[rows], lon[rows], self._lat[candidates], self._lon[candidates])
+            inside = distance <= self.radius_km
+            rows, indices = rows[inside], candidates[inside]
+            counts = np.bincount(rows, minlength=len(lat))
+
+            # 행마다 열 위치 정렬 (CSR 정규형)
+            order = np.lexsort((indices, rows))
+            indices = indices[order]
+
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        data = np.ones(len(indices), dtype=bool)
+        return csr_matrix((data, indices, indptr), shape=(len(lat), self.n_grids))
+
+    def covered_mask(self, site_mask=None, points=None):
+        """
+        설치 격자(bool 마스크) 또는 설치 좌표(points=(lat, lon))에서 반경 내에 있는 격자 마스크
+
+        Returns:
+        - np.ndarray: 격자 수 길이의 bool 배열 (여러 설치지가 겹쳐도 한 번만 커버)
+        """
+        mask = np.zeros(self.n_grids, dtype=bool)
+        if site_mask is not None:
+            rows = self.matrix[np.flatnonzero(site_mask)]
+            mask[rows.indices] = True
+        if points is not None:
+            mask[self.cover_points(*points).indices] = True
+        return mask
+
+
+def _ellipsoid_distance_km(lat1, lon1, lat2, lon2):
+    """
+    WGS84 타원체의 국소 평면 근사 거리 (km) - 수 km 이내에서 geodesic과 1e-5 수준으로 일치
+    (두 점 중간 위도의 자오선/묘유선 곡률 반경 사용)
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    mean_phi = (phi1 + phi2) / 2
+    sin2 = np.sin(mean_phi) ** 2
+    w = np.sqrt(1 - WGS84_E2 * sin2)
+    meridian = WGS84_A_KM * (1 - WGS84_E2) / w ** 3
+    prime_vertical = WGS84_A_KM / w
+
+    dy = meridian * (phi2 - phi1)
+    dx = prime_vertical * np.cos(mean_phi) * np.radians(np.asarray(lon2) - np.asarray(lon1))
+    return np.hypot(dx, dy)
+
+
+def grid_coverage(features, radius_km, lat_col='center_lat', lon_col='center_lon'):
+    """격자 좌표 + 반경별 GridCoverage (같은 좌표/반경이면 캐시된 구조 재사용)"""
+    lat = features[lat_col].to_numpy(dtype=float)
+    lon = features[lon_col].to_numpy(dtype=float)
+    digest = hashlib.sha256(np.ascontiguousarray(np.column_stack([lat, lon])).tobytes()).hexdigest()
+    key = (digest, float(radius_km))
+
+    coverage = _COVERAGE_CACHE.get(key)
+    if coverage is None:
+        coverage = GridCoverage(lat, lon, radius_km)
+        if len(_COVERAGE_CACHE) >= _COVERAGE_CACHE_SIZE:
+            _COVERAGE_CACHE.pop(next(iter(_COVERAGE_CACHE)))
+        _COVERAGE_CACHE[key] = coverage
+    return coverage
+
+
+def radius_covered_demand(
+    features: pd.DataFrame,
+    radius_km: float,
+    site_mask=None,
+    points=None,
+    demand_col: str = 'predicted_demand_score',
+    lat_col: str = 'center_lat',
+    lon_col: str = 'center_lon'
+):
+    """
+    설치지에서 radius_km 이내에 있는 격자의 수요 합 (MCLP와 같은 반경 기준 커버)
+
+    Parameters:
+    - features: 격자별 수요 DataFrame (center_lat, center_lon, demand_col 포함)
+    - radius_km: 커버 반경 (km)
+    - site_mask: 설치 격자 bool 마스크 (features 행 순서)
+    - points: 설치 좌표 (lat 배열, lon 배열) - 기존 충전소처럼 격자 중심이 아닌 위치
+
+    Returns:
+    - tuple(float, int): (커버 수요, 커버된 격자 수)
+    """
+    coverage = grid_coverage(features, radius_km, lat_col=lat_col, lon_col=lon_col)
+    mask = coverage.covered_mask(site_mask=site_mask, points=points)
+    demand = features[demand_col].fillna(0).to_numpy(dtype=float)
+    return float(demand[mask].sum()), int(mask.sum())
+
+
+def nearest_grid_positions(features, lat, lon, lat_col='center_lat', lon_col='center_lon'):
+    """
+    좌표별로 가장 가까운 격자 중심의 행 위치 (위경도 평면 유클리드 거리, 기존 find_nearest_grid와 동일 기준)
+    """
+    grid_coords = features[[lat_col, lon_col]].to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(grid_coords).any(axis=1))
+    tree = KDTree(grid_coords[valid])
+    _, idx = tree.query(np.column_stack([np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)]), k=1)
+    return valid[idx[:, 0]]
@@ -0,0 +1,247 @@
+# src/modeling/demand_predictor.py
+# 학습된 XGBoost 모델로 격자 수요를 배치 예측하는 경량 모듈 (학습/시각화 의존성 없음)
+
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+# Parquet 입출력은 pyarrow가 있을 때만 지원
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PREDICTION_COLUMN = 'predicted_demand_score'
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+class DemandPredictor:
+    """
+    저장된 XGBoost 모델(.ubj/.json)을 한 번만 로드해 반복 예측에 재사용합니다.
+
+    - feature 목록/범주형 카테고리는 레지스트리 메타데이터(xgb_<key>.json)가 있으면 사용하고,
+      없으면 모델에 저장된 feature 이름을 사용합니다.
+    - 입력은 float32 행렬로 변환해 inplace_predict로 예측합니다 (범주형은 학습 시 카테고리 코드로 변환).
+    """
+
+    def __init__(self, model_path, features=None, require_complete=True):
+        """
+        Parameters:
+        - model_path: 모델 파일 경로 (model_registry에 저장된 xgb_<key>.ubj 등)
+        - features (list): 입력 feature 순서 (None이면 메타데이터 또는 모델의 feature 이름)
+        - require_complete (bool): True면 feature 결측이 있는 행은 NaN으로 (train_and_predict와 동일)
+        """
+        self.model_path = Path(model_path)
+        self.booster = xgb.Booster(model_file=str(self.model_path))
+        self.metadata = _load_metadata(self.model_path)
+        self.features = list(features or self.metadata.get('features') or self.booster.feature_names or [])
+        if not self.features:
+            raise ValueError("모델에 feature 이름이 없습니다. features를 직접 지정해주세요.")
+        self.categories = self.metadata.get('categories', {})
+        self.require_complete = require_complete
+
+        # XGBRegressor로 저장된 모델은 조기 종료 이후 트리까지 포함하므로 best iteration까지만 사용
+        best_iteration = self.booster.attr('best_iteration')
+        self.iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+
+    @classmethod
+    def from_registry(cls, registry_dir, key, **kwargs):
+        """모델 레지스트리 키로 로드 (예: metrics['model_key'])"""
+        return cls(Path(registry_dir) / f'xgb_{key}.ubj', **kwargs)
+
+    def to_matrix(self, df):
+        """DataFrame의 feature 컬럼을 float32 행렬로 변환 (범주형은 카테고리 코드)"""
+        missing = [col for col in self.features if col not in df.columns]
+        if missing:
+            raise KeyError(f"입력에 feature 컬럼이 없습니다: {missing}")
+
+        matrix = np.empty((len(df), len(self.features)), dtype=np.float32)
+        for j, col in enumerate(self.features):
+            values = df[col]
+            if col in self.categories:
+                codes = pd.Categorical(values, categories=self.categories[col]).codes
+                matrix[:, j] = np.where(codes < 0, np.nan, codes)
+            elif isinstance(values.dtype, pd.CategoricalDtype):
+                matrix[:, j] = values.astype(float).to_numpy(dtype=np.float32, na_value=np.nan)
+            else:
+                matrix[:, j] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+        return matrix
+
+    def predict_matrix(self, matrix):
+        """float32 feature 행렬 예측"""
+        pred = self.booster.inplace_predict(matrix, iteration_range=self.iteration_range)
+        if self.require_complete:
+            pred = np.where(np.isnan(matrix).any(axis=1), np.nan, pred)
+        return pred
+
+    def predict(self, df):
+        """DataFrame 예측 (반환: 행 순서의 예측값 배열)"""
+        return self.predict_matrix(self.to_matrix(df))
+
+
+def score_grid_file(
+    input_path,
+    output_path,
+    model_path,
+    features: list = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keep_columns: list = None,
+    output_col: str = PREDICTION_COLUMN,
+    n_workers: int = 1,
+    max_pending: int = None,
+    verbose: bool = True
+):
+    """
+    격자 feature 파일을 청크 단위로 읽어 예측하고, 결과를 청크마다 바로 출력 파일에 씁니다.
+    (전체 파일을 메모리에 올리지 않으므로 전국 단위 격자도 일정한 메모리로 처리)
+
+    Parameters:
+    - input_path: 입력 파일 (.csv 또는 .parquet)
+    - output_path: 출력 파일 (.csv 또는 .parquet)
+    - model_path: 모델 파일 경로 (DemandPredictor 참고)
+    - features (list): 입력 feature 순서 (None이면 모델 메타데이터)
+    - chunk_size (int): 한 번에 읽어 예측할 행 수
+    - keep_columns (list): 출력에 함께 저장할 입력 컬럼 (None이면 전체 컬럼)
+    - output_col (str): 예측값 컬럼명
+    - n_workers (int): 1이면 현재 프로세스에서 예측, 2 이상이면 프로세스 풀 사용
+      (워커마다 모델을 한 번만 로드하고, 출력은 입력 순서대로 기록)
+    - max_pending (int): 프로세스 풀에 동시에 제출할 최대 청크 수 (None이면 n_workers * 2)
+
+    Returns:
+    - dict: rows, chunks, seconds, rows_per_second, output_path
+    """
+    start = time.perf_counter()
+    input_path, output_path = Path(input_path), Path(output_path)
+    predictor = DemandPredictor(model_path, features=features)
+    columns = None if keep_columns is None else list(dict.fromkeys(list(keep_columns) + predictor.features))
+
+    writer = _ChunkWriter(output_path)
+    rows = chunks = 0
+    try:
+        chunk_iter = _iter_chunks(input_path, chunk_size, columns)
+        if n_workers <= 1:
+            for chunk in chunk_iter:
+                # feature가 keep_columns에 없어도 되도록 전체 청크로 먼저 예측
+                predictions = predictor.predict(chunk)
+                chunk = chunk if keep_columns is None else chunk[list(keep_columns)].copy()
+                writer.write(_attach_predictions(chunk, predictions, output_col))
+                rows += len(chunk)
+                chunks += 1
+        else:
+            # 제출한 청크 수를 max_pending으로 제한해 메모리 사용량을 일정하게 유지
+            max_pending = max_pending or n_workers * 2
+            pending = deque()
+            with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_init_scoring_worker,
+                initargs=(str(predictor.model_path), predictor.features)
+            ) as executor:
+                for chunk in chunk_iter:
+                    matrix = predictor.to_matrix(chunk)
+                    chunk = chunk if keep_columns is None else chunk[list(keep_columns)].copy()
+                    pending.append((chunk, executor.submit(_score_matrix_worker, matrix)))
+                    if len(pending) >= max_pending:
+                        done_chunk, future = pending.popleft()
+                        writer.write(_attach_predictions(done_chunk, future.result(), output_col))
+                        rows += len(done_chunk)
+                        chunks += 1
+                while pending:
+                    done_chunk, future = pending.popleft()
+                    writer.write(_attach_predictions(done_chunk, future.result(), output_col))
+                    rows += len(done_chunk)
+                    chunks += 1
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    summary = {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds > 0 else None,
+        'output_path': str(output_path)
+    }
+    if verbose:
+        print(f"✅ 배치 예측 완료: {rows:,}행 / {chunks}개 청크, {seconds:.2f}초 "
+              f"({summary['rows_per_second']:,.0f}행/초, 워커 {n_workers}개) → {output_path}")
+    return summary
+
+
+def _load_metadata(model_path):
+    """레지스트리 메타데이터 (xgb_<key>.ubj → xgb_<key>.json), 없으면 빈 dict"""
+    metadata_path = Path(model_path).with_suffix('.json')
+    if metadata_path == Path(model_path) or not metadata_path.exists():
+        return {}
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def _attach_predictions(chunk, predictions, output_col):
+    chunk[output_col] = predictions
+    return chunk
+
+
+def _iter_chunks(input_path, chunk_size, columns=None):
+    """CSV/Parquet 파일을 chunk_size 행씩 DataFrame으로 읽기"""
+    suffix = input_path.suffix.lower()
+    if suffix == '.parquet':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet 입력에는 pyarrow가 필요합니다.")
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif suffix == '.csv':
+        yield from pd.read_csv(input_path, chunksize=chunk_size, usecols=columns)
+    else:
+        raise ValueError(f"지원하지 않는 입력 형식입니다: {input_path.suffix} (.csv 또는 .parquet)")
+
+
+class _ChunkWriter:
+    """예측 결과를 청크마다 CSV(append) 또는 Parquet(row group)로 기록"""
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.suffix = self.output_path.suffix.lower()
+        if self.suffix not in ('.csv', '.parquet'):
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {self.output_path.suffix} (.csv 또는 .parquet)")
+        if self.suffix == '.parquet' and not PYARROW_AVAILABLE:
+            raise ImportError("Parquet 출력에는 pyarrow가 필요합니다.")
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, chunk):
+        if self.suffix == '.csv':
+            chunk.to_csv(self.output_path, mode='w' if self._first else 'a', header=self._first, index=False)
+        else:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# 배치 예측 워커 프로세스의 모델 (워커 초기화 시 한 번만 로드)
+_WORKER_PREDICTOR = {}
+
+
+def _init_scoring_worker(model_path, features):
+    _WORKER_PREDICTOR['predictor'] = DemandPredictor(model_path, features=features)
+
+
+def _score_matrix_worker(matrix):
+    return _WORKER_PREDICTOR['predictor'].predict_matrix(matrix)
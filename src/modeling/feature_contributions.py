@@ -0,0 +1,111 @@
+# src/modeling/feature_contributions.py
+# 격자별 XGBoost 예측 기여도(SHAP 값) 일괄 계산 / 저장 / 상위 요인 조회
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+# Parquet 저장은 pyarrow가 있을 때만 지원
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 기여도 테이블에서 기준값(모든 feature 기여도 0일 때의 예측값) 컬럼
+BIAS_COLUMN = 'bias'
+
+
+def compute_contributions(model, df, features, id_col='grid_id'):
+    """
+    전체 격자에 대해 pred_contribs=True 예측을 한 번만 수행해 feature별 기여도를 계산합니다.
+    (행별 기여도 합 + bias = 해당 격자의 예측값)
+
+    Parameters:
+    - model: train_and_predict가 반환한 모델 (XGBRegressor 또는 xgb.Booster)
+    - df (pd.DataFrame): 격자 feature 데이터 (id_col + features)
+    - features (list): 학습에 사용한 feature 리스트 (학습 시 순서 그대로)
+    - id_col (str): 격자 ID 컬럼
+
+    Returns:
+    - pd.DataFrame: id_col + feature별 기여도 + bias (float32, feature 결측 행은 제외)
+    """
+    booster, iteration_range = _booster_and_range(model)
+
+    valid_rows = df[[id_col] + features].dropna(subset=features)
+    dmatrix = xgb.DMatrix(valid_rows[features], enable_categorical=True)
+    contribs = booster.predict(dmatrix, pred_contribs=True, iteration_range=iteration_range)
+
+    result = pd.DataFrame(contribs.astype(np.float32), columns=features + [BIAS_COLUMN])
+    result.insert(0, id_col, valid_rows[id_col].to_numpy())
+    return result
+
+
+def save_contributions(contribs, path):
+    """기여도 테이블을 float32 Parquet으로 저장"""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("기여도 Parquet 저장에는 pyarrow가 필요합니다.")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    value_cols = [col for col in contribs.columns if pd.api.types.is_numeric_dtype(contribs[col])]
+    contribs.astype({col: np.float32 for col in value_cols}).to_parquet(path, index=False)
+    return path
+
+
+def load_contributions(path, id_col='grid_id'):
+    """저장된 기여도 테이블을 격자 ID 인덱스로 읽기"""
+    return pd.read_parquet(path).set_index(id_col)
+
+
+def top_drivers(contribs, k=3, id_col='grid_id'):
+    """
+    격자별 기여도 절댓값 상위 k개 요인을 한 번에 계산합니다 (bias 제외).
+    결과는 격자 ID 인덱스라 격자 하나의 요인 조회는 .loc 한 번 (해시 조회)입니다.
+
+    Returns:
+    - pd.DataFrame: index=id_col, 컬럼 driver_1..k (feature 이름), contrib_1..k (기여도)
+    """
+    if id_col in contribs.columns:
+        contribs = contribs.set_index(id_col)
+    feature_cols = [col for col in contribs.columns if col != BIAS_COLUMN]
+    values = contribs[feature_cols].to_numpy(dtype=np.float32)
+    k = min(k, len(feature_cols))
+
+    # 절댓값 상위 k개를 argpartition으로 뽑은 뒤 그 안에서만 정렬
+    top = np.argpartition(-np.abs(values), k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(values, top, axis=1)
+    order = np.argsort(-np.abs(top_values), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_values = np.take_along_axis(top_values, order, axis=1)
+
+    names = np.asarray(feature_cols, dtype=object)[top]
+    drivers = {}
+    for rank in range(k):
+        drivers[f'driver_{rank + 1}'] = names[:, rank]
+        drivers[f'contrib_{rank + 1}'] = top_values[:, rank]
+    return pd.DataFrame(drivers, index=contribs.index)
+
+
+def format_drivers(drivers_row, separator='<br>'):
+    """top_drivers 결과 한 행을 '요인 (+기여도)' 문자열로 변환 (지도 팝업용)"""
+    k = sum(1 for col in drivers_row.index if col.startswith('driver_'))
+    parts = [
+        f"{drivers_row[f'driver_{rank}']} ({drivers_row[f'contrib_{rank}']:+.1f})"
+        for rank in range(1, k + 1)
+        if pd.notna(drivers_row[f'driver_{rank}'])
+    ]
+    return separator.join(parts)
+
+
+def _booster_and_range(model):
+    """XGBRegressor/Booster에서 Booster와 best iteration 기준 예측 범위를 꺼냄"""
+    if isinstance(model, xgb.XGBModel):
+        booster = model.get_booster()
+    else:
+        booster = model
+
+    best_iteration = booster.attr('best_iteration')
+    iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+    return booster, iteration_range
@@ -1,15 +1,83 @@
+import time
+
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from tqdm import tqdm
+from joblib import Parallel, delayed
+from scipy.cluster.hierarchy import linkage
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+# 이 행 수 이상이면 backend='auto'에서 MiniBatchKMeans 사용
+MINIBATCH_THRESHOLD = 100_000
+
+
+def _resolve_backend(backend, n_rows):
+    """backend='auto'면 데이터 크기에 따라 'kmeans' / 'minibatch' 선택"""
+    if backend == 'auto':
+        return 'minibatch' if n_rows >= MINIBATCH_THRESHOLD else 'kmeans'
+    if backend not in ('kmeans', 'minibatch'):
+        raise ValueError("backend는 'auto', 'kmeans', 'minibatch' 중 하나여야 합니다.")
+    return backend
+
+
+def _fit_kmeans(k, X, backend='kmeans', random_state=42):
+    """k 하나에 대해 모델을 학습하고 (k, 모델, inertia, 학습 시간)을 반환"""
+    start = time.perf_counter()
+    if backend == 'minibatch':
+        model = MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=4096, n_init=3)
+    else:
+        model = KMeans(n_clusters=k, random_state=random_state)
+    model.fit(X)
+    return k, model, float(model.inertia_), time.perf_counter() - start
+
+
+def ward_inertias(X, k_range, coreset_size=2000, random_state=42):
+    """
+    Ward 계층 군집 한 번으로 모든 k의 군집 내 제곱합(SSE)을 추정합니다.
+
+    - 데이터가 coreset_size보다 크면 균등 표본(coreset)만 사용하고 SSE를 N/m 배로 보정
+    - Ward 병합 높이 h는 병합 시 SSE 증가량의 sqrt(2배)이므로,
+      k개 군집의 SSE = 앞쪽 (m - k)번 병합의 h² / 2 누적합
+
+    Returns:
+    - list: k_range 순서의 inertia 추정값
+    """
+    X = np.asarray(X, dtype=float)
+    n_rows = len(X)
+    if n_rows > coreset_size:
+        rng = np.random.default_rng(random_state)
+        X = X[rng.choice(n_rows, size=coreset_size, replace=False)]
+    m = len(X)
+
+    merge_heights = linkage(X, method='ward')[:, 2]
+    sse_after_merges = np.concatenate([[0.0], np.cumsum(merge_heights ** 2 / 2)])
+    scale = n_rows / m
+
+    # k개 군집이 남는 시점 = (m - k)번 병합 후
+    return [float(sse_after_merges[m - k] * scale) for k in k_range]
+
+
+def find_elbow_k(k_range, inertias):
+    """inertia의 2차 차분 절댓값이 가장 큰 지점을 최적 k로 선택 (Elbow Method)"""
+    k_range = list(k_range)
+    inertia_diff = np.diff(inertias)
+    inertia_diff2 = np.diff(inertia_diff)
+    optimal_k_idx = np.argmax(np.abs(inertia_diff2)) + 2
+    return k_range[optimal_k_idx - 2]
+
 
 def run_kmeans(
     df: pd.DataFrame,
     mode: str = 'manual',
     manual_k: int = 5,
     verbose: bool = True,
-    return_top_cluster_only: bool = False
-) -> tuple[pd.DataFrame, int]:
+    return_top_cluster_only: bool = False,
+    backend: str = 'auto',
+    n_jobs: int = -1,
+    k_range=range(2, 11),
+    return_diagnostics: bool = False,
+    k_selection: str = 'lloyd',
+    coreset_size: int = 2000
+):
     """
     KMeans 클러스터링 실행 함수 (k값 반환 포함, 인덱스 안정성 보장)
 
@@ -18,9 +86,17 @@ def run_kmeans(
     - mode: 'manual' 또는 'auto'
     - manual_k: 수동 설정 시 사용할 클러스터 수
     - return_top_cluster_only: 수요가 가장 높은 클러스터만 반환 여부
+    - backend: 'auto' (10만 행 이상이면 MiniBatchKMeans), 'kmeans', 'minibatch'
+    - n_jobs: auto 모드에서 k별 학습을 병렬로 실행할 프로세스 수 (joblib, -1이면 전체 코어)
+    - k_range: auto 모드에서 탐색할 k 후보
+    - k_selection: auto 모드 k 선택 방식
+      'lloyd' (k마다 KMeans 학습) 또는 'ward' (coreset Ward 계층 군집 한 번으로 모든 k의 SSE 추정)
+    - coreset_size: k_selection='ward'일 때 사용할 최대 표본 수
+    - return_diagnostics: True면 k별 학습 시간/inertia/모델을 담은 진단 dict도 반환
 
     Returns:
     - Tuple[pd.DataFrame, int]: 클러스터링된 DataFrame, 사용된 클러스터 수 k
+      (return_diagnostics=True면 (DataFrame, k, diagnostics))
     """
 
     # 클러스터링에 사용할 feature만 추출 + 결측 제거
@@ -29,39 +105,51 @@ def run_kmeans(
     valid_features = features.dropna()
     valid_index = valid_features.index
 
-    # 클러스터 수 결정 (Elbow Method)
-    if mode == 'auto':
-        inertias = []
-        k_range = range(2, 11)
-        for k_val in tqdm(k_range, desc="Finding optimal k"):
-            model = KMeans(n_clusters=k_val, random_state=42)
-            model.fit(valid_features)
-            inertias.append(model.inertia_)
+    backend = _resolve_backend(backend, len(valid_features))
+    if k_selection not in ('lloyd', 'ward'):
+        raise ValueError("k_selection은 'lloyd' 또는 'ward'여야 합니다.")
+    sweep_start = time.perf_counter()
 
-        inertia_diff = np.diff(inertias)
-        inertia_diff2 = np.diff(inertia_diff)
-        optimal_k_idx = np.argmax(np.abs(inertia_diff2)) + 2
-        k = k_range[optimal_k_idx - 2]
+    # 클러스터 수 결정 (Elbow Method) - k별 학습을 병렬 실행하고 학습된 모델은 재사용
+    estimated_inertias = None
+    if mode == 'auto' and k_selection == 'ward':
+        # 계층 구조 하나에서 모든 k의 SSE를 읽고, 선택된 k만 KMeans 학습
+        k_range = list(k_range)
+        estimated_inertias = ward_inertias(valid_features, k_range, coreset_size=coreset_size)
+        k = find_elbow_k(k_range, estimated_inertias)
+        fits = [_fit_kmeans(k, valid_features, backend)]
 
         if verbose:
-            print(f"[AUTO MODE] 최적 k = {k}")
+            print(f"[AUTO MODE] 최적 k = {k} (k_selection=ward, backend={backend})")
+            print("Estimated inertia by k:", dict(zip(k_range, estimated_inertias)))
+    elif mode == 'auto':
+        k_range = list(k_range)
+        fits = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_kmeans)(k_val, valid_features, backend) for k_val in k_range
+        )
+        inertias = [inertia for _, _, inertia, _ in fits]
+        k = find_elbow_k(k_range, inertias)
+
+        if verbose:
+            print(f"[AUTO MODE] 최적 k = {k} (backend={backend})")
             print("Inertia by k:", dict(zip(k_range, inertias)))
     else:
         k = manual_k
+        fits = [_fit_kmeans(k, valid_features, backend)]
         if verbose:
-            print(f"[MANUAL MODE] 수동 설정 k = {k}")
+            print(f"[MANUAL MODE] 수동 설정 k = {k} (backend={backend})")
 
-    # KMeans 학습
-    kmeans = KMeans(n_clusters=k, random_state=42)
-    cluster_labels = kmeans.fit_predict(valid_features)
+    # 선택된 k의 학습 결과 재사용 (다시 학습하지 않음)
+    kmeans = next(model for k_val, model, _, _ in fits if k_val == k)
+    cluster_labels = kmeans.labels_
 
     # 원래 df에 cluster 할당
     df = df.copy()  # 원본 df 수정 방지
     df.loc[valid_index, 'cluster'] = cluster_labels
 
-    # 수요 중심 클러스터 평균 출력
+    # 수요 중심 클러스터 평균
+    cluster_means = df.dropna(subset=['cluster']).groupby('cluster')['demand_score'].mean().sort_values(ascending=False)
     if verbose:
-        cluster_means = df.dropna(subset=['cluster']).groupby('cluster')['demand_score'].mean().sort_values(ascending=False)
         print("\n[Cluster별 평균 수요]")
         print(cluster_means)
 
@@ -72,4 +160,21 @@ def run_kmeans(
         if verbose:
             print(f"\n[필터링] 수요가 가장 높은 클러스터 (cluster={top_cluster})만 반환됨.")
 
-    return df, k
\ No newline at end of file
+    if not return_diagnostics:
+        return df, k
+
+    diagnostics = {
+        'mode': mode,
+        'backend': backend,
+        'selected_k': k,
+        'k_values': [k_val for k_val, _, _, _ in fits],
+        'inertias': {k_val: inertia for k_val, _, inertia, _ in fits},
+        'fit_seconds': {k_val: seconds for k_val, _, _, seconds in fits},
+        'models': {k_val: model for k_val, model, _, _ in fits},
+        'model': kmeans,
+        'total_seconds': time.perf_counter() - sweep_start
+    }
+    if estimated_inertias is not None:
+        diagnostics['k_selection'] = 'ward'
+        diagnostics['estimated_inertias'] = dict(zip(k_range, estimated_inertias))
+    return df, k, diagnostics
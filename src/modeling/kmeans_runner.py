@@ -1,5 +1,27 @@
+import hashlib
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
 import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
 from modeling.kmeans_model import run_kmeans
+from utils.artifact_manifest import write_csv_with_manifest
+
+# KMeans 입력 feature (run_kmeans와 동일)
+KMEANS_FEATURE_COLS = ['demand_score', 'supply_score', 'center_lat', 'center_lon']
+
+# 학습된 모델 / 격자별 클러스터 할당 캐시 위치 (기본값: 출력 파일 폴더의 models/kmeans)
+KMEANS_CACHE_SUBDIR = Path('models') / 'kmeans'
+ASSIGNMENT_FILE = 'cluster_assignments.csv'
+
+
+def kmeans_cache_dir(output_path):
+    """출력 파일 위치 기준 KMeans 캐시 디렉토리 (예: data/modeling/models/kmeans)"""
+    return Path(output_path).parent / KMEANS_CACHE_SUBDIR
+
 
 def generate_kmeans_features(
     grid_path: str,
@@ -8,11 +30,23 @@ def generate_kmeans_features(
     mode: str = 'manual',
     manual_k: int = 5,
     return_top_cluster_only: bool = True,
-    verbose: bool = True
+    verbose: bool = True,
+    scaler: str = None,
+    use_cache: bool = True,
+    cache_dir: str = None
 ) -> tuple[pd.DataFrame, int]:
     """
     KMeans 클러스터링 실행 후, 수요 중심 격자 feature 저장
 
+    - 학습된 모델(+ 스케일러)은 입력 feature 행렬 해시와 k/mode 파라미터로 joblib 저장됩니다.
+    - 같은 행렬/파라미터면 저장된 할당을 그대로 쓰고, 일부 격자만 바뀌었으면
+      같은 파라미터의 기존 모델로 바뀐/새 격자만 predict 합니다.
+
+    Parameters:
+    - scaler: None (스케일링 없음, 기본값) 또는 'standard' (StandardScaler)
+    - use_cache: False면 캐시 없이 매번 새로 학습
+    - cache_dir: 모델/할당 캐시 디렉토리 (None이면 kmeans_cache_dir(output_path))
+
     Returns:
     - features (DataFrame): 병합된 결과
     - used_k (int): 사용된 클러스터 수
@@ -22,15 +56,188 @@ def generate_kmeans_features(
     grid = pd.read_csv(grid_path)
     features_all = pd.read_csv(features_path)
 
-    # 클러스터링
-    grid, used_k = run_kmeans(
-        df=grid,
+    # 클러스터링 (캐시 사용 시 변경된 격자만 predict)
+    if use_cache:
+        grid, used_k = cluster_with_cache(
+            grid, mode=mode, manual_k=manual_k, scaler=scaler,
+            cache_dir=cache_dir or kmeans_cache_dir(output_path), verbose=verbose
+        )
+    else:
+        grid, used_k = _fit_clusters(grid, mode, manual_k, scaler, verbose)[:2]
+
+    if return_top_cluster_only:
+        grid = _select_top_cluster(grid, verbose)
+
+    features = _merge_cluster_features(features_all, grid)
+
+    # 저장
+    write_csv_with_manifest(features, output_path, encoding='utf-8')
+    if verbose:
+        print(f"✅ 저장 완료: {output_path}")
+        print(f"사용 가능한 feature 컬럼: {features.columns.tolist()}")
+
+    return features, used_k
+
+
+def cluster_with_cache(grid, cache_dir, mode='manual', manual_k=5, scaler=None, verbose=True):
+    """
+    저장된 KMeans 모델/할당을 재사용해 격자별 cluster를 붙입니다.
+
+    Returns:
+    - grid (DataFrame): 'cluster' 컬럼이 추가된 전체 격자 (feature 결측 행은 NaN)
+    - used_k (int): 사용된 클러스터 수
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    grid = grid.copy()
+    row_hashes = _row_hashes(grid)
+    params_key = _params_key(mode, manual_k, scaler)
+    matrix_key = hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+    model_path = cache_dir / f'kmeans_{params_key}_{matrix_key}.joblib'
+
+    assignments = load_cluster_assignments(cache_dir)
+    cached = None
+    if assignments is not None:
+        cached = assignments[assignments['params_key'] == params_key].set_index('row_hash')['cluster']
+
+    if model_path.exists():
+        # 1) 같은 행렬 + 같은 파라미터: 저장된 모델 사용 (학습 없음)
+        bundle = joblib.load(model_path)
+        source = '캐시된 모델'
+    else:
+        previous = sorted(cache_dir.glob(f'kmeans_{params_key}_*.joblib'), key=lambda p: p.stat().st_mtime)
+        if previous and cached is not None and len(cached) > 0:
+            # 2) 같은 파라미터의 기존 모델: 바뀐/새 격자만 predict
+            bundle = joblib.load(previous[-1])
+            source = f'기존 모델 재사용 ({previous[-1].name})'
+        else:
+            # 3) 처음 보는 파라미터: 새로 학습 (학습 시 할당된 cluster를 그대로 캐시로 사용)
+            fitted_grid, used_k, model, fitted_scaler = _fit_clusters(grid, mode, manual_k, scaler, verbose)
+            bundle = {'model': model, 'scaler': fitted_scaler, 'k': used_k, 'mode': mode, 'params_key': params_key}
+            cached = pd.Series(fitted_grid['cluster'].to_numpy(), index=row_hashes).dropna()
+            source = '새로 학습'
+        joblib.dump(bundle, model_path)
+
+    # 캐시된 할당이 있는 격자는 그대로 쓰고 나머지만 predict
+    clusters = pd.Series(np.nan, index=grid.index)
+    if cached is not None:
+        cached = cached[~cached.index.duplicated()]
+        clusters[:] = pd.Series(row_hashes).map(cached).to_numpy(dtype=float)
+
+    valid_mask = grid[KMEANS_FEATURE_COLS].notna().all(axis=1).to_numpy()
+    to_predict = valid_mask & np.isnan(clusters.to_numpy())
+    if to_predict.any():
+        X = grid.loc[to_predict, KMEANS_FEATURE_COLS]
+        if bundle['scaler'] is not None:
+            X = bundle['scaler'].transform(X)
+        clusters[to_predict] = bundle['model'].predict(X)
+
+    grid['cluster'] = clusters
+    used_k = int(bundle['k'])
+
+    _save_cluster_assignments(cache_dir, grid, row_hashes, params_key, assignments)
+
+    if verbose:
+        print(f"[KMEANS CACHE] {source}, k = {used_k}, predict {int(to_predict.sum()):,}/{int(valid_mask.sum()):,}개 격자")
+
+    return grid, used_k
+
+
+def load_cluster_assignments(cache_dir, grid_ids=None):
+    """
+    저장된 격자별 cluster 할당을 읽습니다 (클러스터링 단계 없이 하위 단계에서 사용).
+
+    Returns:
+    - DataFrame 또는 None: grid_id, center_lat, center_lon, demand_score, cluster, row_hash, params_key
+    """
+    path = Path(cache_dir) / ASSIGNMENT_FILE
+    if not path.exists():
+        return None
+
+    assignments = pd.read_csv(path, dtype={'row_hash': 'uint64', 'params_key': str})
+    if grid_ids is not None:
+        assignments = assignments[assignments['grid_id'].isin(grid_ids)]
+    return assignments
+
+
+def load_kmeans_features(
+    features_path: str,
+    cache_dir: str,
+    mode: str = 'manual',
+    manual_k: int = 5,
+    scaler: str = None,
+    return_top_cluster_only: bool = True,
+    verbose: bool = True
+):
+    """
+    캐시된 cluster 할당으로 generate_kmeans_features와 같은 feature 테이블을 만듭니다 (KMeans 실행 없음).
+
+    Parameters:
+    - cache_dir: generate_kmeans_features가 사용한 캐시 디렉토리 (예: kmeans_cache_dir(KMEANS_OUTPUT_PATH))
+
+    Returns:
+    - (features, used_k) 또는 None: 해당 파라미터의 할당 캐시가 없으면 None
+    """
+    assignments = load_cluster_assignments(cache_dir)
+    if assignments is None:
+        return None
+
+    params_key = _params_key(mode, manual_k, scaler)
+    grid = assignments[assignments['params_key'] == params_key]
+    if grid.empty:
+        return None
+
+    model_files = sorted(Path(cache_dir).glob(f'kmeans_{params_key}_*.joblib'), key=lambda p: p.stat().st_mtime)
+    used_k = int(joblib.load(model_files[-1])['k']) if model_files else int(grid['cluster'].nunique())
+
+    if return_top_cluster_only:
+        grid = _select_top_cluster(grid, verbose)
+
+    features = _merge_cluster_features(pd.read_csv(features_path), grid)
+    if verbose:
+        print(f"[KMEANS CACHE] 캐시된 할당 사용: {len(features):,}개 격자, k = {used_k}")
+    return features, used_k
+
+
+def _fit_clusters(grid, mode, manual_k, scaler, verbose):
+    """(선택적으로 스케일링한 feature로) KMeans를 학습하고 전체 격자에 cluster를 붙입니다."""
+    fitted_scaler = StandardScaler() if scaler == 'standard' else None
+    if scaler not in (None, 'standard'):
+        raise ValueError("scaler는 None 또는 'standard'여야 합니다.")
+
+    model_input = grid.copy()
+    if fitted_scaler is not None:
+        valid = model_input[KMEANS_FEATURE_COLS].notna().all(axis=1)
+        model_input.loc[valid, KMEANS_FEATURE_COLS] = fitted_scaler.fit_transform(
+            model_input.loc[valid, KMEANS_FEATURE_COLS]
+        )
+
+    clustered, used_k, diagnostics = run_kmeans(
+        df=model_input,
         mode=mode,
         manual_k=manual_k,
-        return_top_cluster_only=return_top_cluster_only,
-        verbose=verbose
+        return_top_cluster_only=False,
+        verbose=verbose,
+        return_diagnostics=True
     )
 
+    grid = grid.copy()
+    grid['cluster'] = clustered['cluster'].to_numpy()
+    return grid, used_k, diagnostics['model'], fitted_scaler
+
+
+def _select_top_cluster(grid, verbose=True):
+    """수요 평균이 가장 높은 클러스터의 격자만 남깁니다."""
+    cluster_means = grid.dropna(subset=['cluster']).groupby('cluster')['demand_score'].mean()
+    top_cluster = cluster_means.idxmax()
+    if verbose:
+        print(f"\n[필터링] 수요가 가장 높은 클러스터 (cluster={top_cluster})만 반환됨.")
+    return grid[grid['cluster'] == top_cluster].copy().reset_index(drop=True)
+
+
+def _merge_cluster_features(features_all, grid):
+    """격자 cluster 정보를 feature 테이블에 병합합니다."""
     # 필요한 컬럼만 유지
     grid = grid[['grid_id', 'center_lat', 'center_lon', 'cluster']]
 
@@ -39,11 +246,33 @@ def generate_kmeans_features(
     features = features_all.merge(grid, on='grid_id', how='inner')
     features['cluster'] = features['cluster'].astype(int)
     features = features.loc[:, ~features.columns.duplicated()]
+    return features
 
-    # 저장
-    features.to_csv(output_path, index=False)
-    if verbose:
-        print(f"✅ 저장 완료: {output_path}")
-        print(f"사용 가능한 feature 컬럼: {features.columns.tolist()}")
 
-    return features, used_k
+def _row_hashes(grid):
+    """격자별 (grid_id + KMeans feature) 해시 - 값이 바뀐 격자를 찾는 데 사용"""
+    return pd.util.hash_pandas_object(
+        grid[['grid_id'] + KMEANS_FEATURE_COLS], index=False
+    ).to_numpy(dtype=np.uint64)
+
+
+def _params_key(mode, manual_k, scaler):
+    params = {'mode': mode, 'manual_k': manual_k if mode != 'auto' else None, 'scaler': scaler,
+              'features': KMEANS_FEATURE_COLS}
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def _save_cluster_assignments(cache_dir, grid, row_hashes, params_key, previous=None):
+    """현재 파라미터의 할당을 갱신하고 다른 파라미터의 할당은 유지합니다."""
+    current = pd.DataFrame({
+        'grid_id': grid['grid_id'].to_numpy(),
+        'center_lat': grid['center_lat'].to_numpy(),
+        'center_lon': grid['center_lon'].to_numpy(),
+        'demand_score': grid['demand_score'].to_numpy(),
+        'cluster': grid['cluster'].to_numpy(),
+        'row_hash': row_hashes,
+        'params_key': params_key
+    })
+    if previous is not None:
+        current = pd.concat([previous[previous['params_key'] != params_key], current], ignore_index=True)
+    current.to_csv(Path(cache_dir) / ASSIGNMENT_FILE, index=False)
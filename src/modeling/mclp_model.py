@@ -1,10 +1,23 @@
+import time
+
 import pandas as pd
 import numpy as np
+from scipy.sparse import csr_matrix, diags, issparse
 from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus
 from geopy.distance import geodesic
 from tqdm.notebook import tqdm
 from pulp import PULP_CBC_CMD
 
+try:
+    from utils.artifact_manifest import write_csv_with_manifest
+except ImportError:
+    from src.utils.artifact_manifest import write_csv_with_manifest
+
+try:
+    from modeling.coverage import grid_coverage
+except ImportError:
+    from src.modeling.coverage import grid_coverage
+
 def solve_mclp(
     df: pd.DataFrame,
     coverage_radius: float = 0.55,  # 단위: km
@@ -106,6 +119,404 @@ def solve_mclp(
 
     return df, summary, coverage_matrix
 
+
+def improve_selection(
+    selected,
+    coverage,
+    demand,
+    max_iters: int = 1000,
+    time_budget: float = None,
+    grid_ids=None,
+    min_gain: float = 1e-9,
+    verbose: bool = True
+) -> tuple:
+    """
+    설치지 교체(swap, 1개 out ↔ 1개 in) 지역 탐색으로 선택 결과의 커버 수요를 개선합니다.
+    (시간 제한으로 끝난 MCLP, greedy, 클러스터 중심 등 어떤 선택에도 후처리로 적용 가능)
+
+    - 수요지별 커버 횟수(count)만 유지하고, 모든 (out, in) 쌍의 이득을 한 번에 계산
+      gain(out, in) = 추가 이득[in] - 제거 손실[out] + 보정[out, in]
+      (추가 이득: in이 새로 커버하는 미커버 수요, 제거 손실: out만 커버하던 수요,
+       보정: out만 커버하던 수요 중 in도 커버하는 수요 - 반경 2배 이내 쌍만 존재하는 희소 행렬)
+    - 이득이 가장 큰 교체를 적용하고 count/손실/이득은 바뀐 수요지만 증분 갱신
+    - 이득이 min_gain 이하이거나 max_iters / time_budget(초)에 도달하면 종료
+
+    Parameters:
+    - selected: 설치 여부 (설치 후보 수 길이의 bool/0-1 배열, 정수 위치 배열, 또는 grid_ids와 함께 grid_id 집합)
+    - coverage: 설치지 × 수요지 커버리지 (scipy CSR, GridCoverage, 또는 solve_mclp의 coverage_matrix dict)
+    - demand: 수요지별 수요 (결측은 0)
+    - max_iters: 최대 교체 횟수
+    - time_budget: 최대 탐색 시간 (초, None이면 제한 없음)
+    - grid_ids: 설치 후보 순서의 grid_id (selected가 grid_id 집합일 때 필요, 결과도 grid_id 집합으로 반환)
+    - min_gain: 적용할 최소 교체 이득
+
+    Returns:
+    - selected: 개선된 선택 (bool 배열, grid_ids 지정 시 grid_id 집합)
+    - summary: covered_demand, initial_covered_demand, improvement, swaps, seconds,
+      stop_reason, covered (수요지별 커버 여부 bool 배열)
+    """
+    start = time.perf_counter()
+    demand = np.nan_to_num(np.asarray(demand, dtype=float))
+    A = _coverage_csr(coverage, n_points=len(demand))
+    AT = A.T.tocsr()
+    mask = _selection_mask(selected, A.shape[0], grid_ids)
+
+    counts = np.asarray(A[np.flatnonzero(mask)].sum(axis=0)).ravel().astype(np.int64)
+    unique = demand * (counts == 1)      # 선택지 하나만 커버하는 수요
+    missing = demand * (counts == 0)     # 아직 커버되지 않은 수요
+    loss = A @ unique                    # 설치지별 제거 손실 (선택지에서만 의미)
+    gain = A @ missing                   # 설치지별 추가 이득 (미선택지에서만 의미)
+    initial = float(demand[counts > 0].sum())
+
+    swaps, stop_reason = 0, 'local_optimum'
+    for iteration in range(max_iters):
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            stop_reason = 'time_budget'
+            break
+
+        move = _best_swap(A, mask, unique, loss, gain)
+        if move is None or move[2] <= min_gain:
+            break
+        out_site, in_site, _ = move
+
+        # 교체 반영: 바뀐 수요지의 count와 그 수요지를 커버하는 설치지의 손실/이득만 갱신
+        mask[out_site], mask[in_site] = False, True
+        out_points = A.indices[A.indptr[out_site]:A.indptr[out_site + 1]]
+        in_points = A.indices[A.indptr[in_site]:A.indptr[in_site + 1]]
+        counts[out_points] -= 1
+        counts[in_points] += 1
+
+        changed = np.union1d(out_points, in_points)
+        new_unique = demand[changed] * (counts[changed] == 1)
+        new_missing = demand[changed] * (counts[changed] == 0)
+        affected = AT[changed]
+        loss += affected.T @ (new_unique - unique[changed])
+        gain += affected.T @ (new_missing - missing[changed])
+        unique[changed], missing[changed] = new_unique, new_missing
+        swaps += 1
+    else:
+        stop_reason = 'max_iters'
+
+    covered = counts > 0
+    covered_demand = float(demand[covered].sum())
+    summary = {
+        'covered_demand': round(covered_demand, 2),
+        'initial_covered_demand': round(initial, 2),
+        'improvement': round(covered_demand - initial, 2),
+        'swaps': swaps,
+        'seconds': round(time.perf_counter() - start, 3),
+        'stop_reason': stop_reason,
+        'covered': covered
+    }
+
+    if verbose:
+        print(f"[교체 탐색] 교체 {swaps}회, 종료 사유: {stop_reason}")
+        print(f"커버 수요: {initial:,.2f} → {covered_demand:,.2f} (+{covered_demand - initial:,.2f})")
+
+    if grid_ids is not None and not _is_mask_like(selected, A.shape[0]):
+        return set(np.asarray(grid_ids)[mask]), summary
+    return mask, summary
+
+
+def solve_mclp_lagrangian(
+    df: pd.DataFrame,
+    coverage_radius: float = 0.55,  # 단위: km
+    facility_limit: int = 30,
+    demand_column: str = 'predicted_demand_score',
+    max_iters: int = 1000,
+    gap_tol: float = 0.005,
+    time_budget: float = None,
+    improve: bool = True,
+    verbose: bool = True
+) -> tuple[pd.DataFrame, dict, csr_matrix]:
+    """
+    대규모 격자용 MCLP 라그랑지안 완화 해법 (CBC MILP가 끝나지 않는 수만 개 격자 대상)
+
+    - 커버리지 행렬은 BallTree 반경 탐색으로 만든 희소 CSR (geodesic과 같은 반경 기준)
+    - 해법은 lagrangian_mclp 참고 (하한 = 실행 가능한 선택의 커버 수요, 상한 = 라그랑지안 쌍대 값)
+
+    Returns:
+    - df: 설치 여부 'selected' 포함 DataFrame
+    - summary: 성능 지표 dict (solve_mclp 지표 + upper_bound, gap(%), iterations, seconds, stop_reason)
+      (coverage_radius_km는 입력 반경(km) 그대로 - solve_mclp는 반경을 도 단위로 보고 111을 곱해 기록)
+    - coverage_matrix: 설치지 × 수요지 CSR
+    """
+    df = df.copy()
+    df['demand'] = df[demand_column]
+    coverage_matrix = grid_coverage(df, coverage_radius).matrix
+
+    mask, summary = lagrangian_mclp(
+        coverage_matrix, df['demand'].to_numpy(dtype=float), facility_limit,
+        max_iters=max_iters, gap_tol=gap_tol, time_budget=time_budget, improve=improve, verbose=verbose
+    )
+    df['selected'] = mask.astype(int)
+
+    total_demand = df['demand'].sum()
+    covered_demand = summary['covered_demand']
+    coverage_rate = covered_demand / total_demand * 100 if total_demand else 0
+    efficiency = covered_demand / facility_limit if facility_limit else 0
+
+    if verbose:
+        print(f"설치지 수: {int(mask.sum())}개")
+        print(f"커버 수요: {covered_demand:,.2f} / 총 수요: {total_demand:,.2f}")
+        print(f"커버율: {coverage_rate:.2f}%")
+
+    summary.update({
+        'selected_count': int(mask.sum()),
+        'total_demand': round(total_demand, 2),
+        'coverage_rate': round(coverage_rate, 2),
+        'demand_satisfaction_ratio': round(efficiency, 2),
+        'coverage_radius_km': coverage_radius,
+        'facility_limit': facility_limit
+    })
+    return df, summary, coverage_matrix
+
+
+def lagrangian_mclp(
+    coverage,
+    demand,
+    facility_limit: int,
+    max_iters: int = 1000,
+    gap_tol: float = 0.005,
+    time_budget: float = None,
+    step_scale: float = 2.0,
+    patience: int = 20,
+    repair_every: int = 10,
+    improve: bool = True,
+    verbose: bool = True
+) -> tuple:
+    """
+    커버 제약 y_j <= Σ_i a_ij x_i 를 승수 λ_j >= 0 로 완화한 MCLP 서브그래디언트 해법
+
+    - 완화 문제: max Σ_j (d_j - λ_j) y_j + Σ_i (A λ)_i x_i,  Σ x_i <= p
+      → y_j = [d_j > λ_j], x = 설치지 가중치 (A λ) 상위 p개 (반복마다 희소 행렬-벡터 곱 + argpartition)
+    - 상한: 완화 문제 최적값의 최솟값 / 하한: 완화 해의 x(또는 보정한 x)인 실행 가능 선택의 커버 수요
+      (보정: 추가 커버가 없는 중복 설치지를 빼고 남은 자리를 미커버 수요 기준 greedy로 채움,
+       쌍대 값이 개선된 반복과 repair_every 반복마다만 수행)
+    - 승수 갱신: λ ← max(0, λ - t·g), g = Aᵀx - y, t = step_scale·(상한 - 최고 하한) / ‖g‖²
+      (patience번 상한이 개선되지 않으면 step_scale 절반)
+    - gap = (최소 상한 - 최고 하한) / 최소 상한 이 gap_tol 이하이거나 max_iters / time_budget(초)에 도달하면 종료
+    - improve=True면 최고 하한 선택에 improve_selection(교체 탐색)을 남은 시간 안에서 적용
+
+    Parameters:
+    - coverage: 설치지 × 수요지 커버리지 (scipy CSR, GridCoverage, 또는 solve_mclp의 coverage_matrix dict)
+    - demand: 수요지별 수요 (결측은 0)
+    - facility_limit: 설치 수 p
+
+    Returns:
+    - selected (np.ndarray): 설치 여부 bool 배열
+    - summary (dict): covered_demand, upper_bound, gap(%), iterations, seconds, stop_reason
+    """
+    if max_iters < 1:
+        raise ValueError("max_iters는 1 이상이어야 합니다.")
+    start = time.perf_counter()
+    demand = np.nan_to_num(np.asarray(demand, dtype=float))
+    A = _coverage_csr(coverage, n_points=len(demand))
+    AT = A.T.tocsr()
+    n_sites = A.shape[0]
+    p = min(int(facility_limit), n_sites)
+
+    # 어떤 설치지로도 커버할 수 없는 수요는 상한에서 제외
+    d = demand * (np.diff(AT.indptr) > 0)
+
+    total = float(d.sum())
+
+    lam = d.copy()
+    best_mask, best_lower = None, -np.inf
+    best_dual, scale, stall = np.inf, step_scale, 0
+    stop_reason, iteration = 'max_iters', 0
+
+    for iteration in range(1, max_iters + 1):
+        # 완화 문제 풀이
+        weights = A @ lam
+        top = np.argpartition(-weights, p - 1)[:p] if p < n_sites else np.arange(n_sites)
+        y = d > lam
+        dual = float((d - lam)[y].sum() + weights[top].sum())
+
+        improved = best_dual - dual > 1e-9 * max(abs(dual), 1.0)
+        if improved:
+            best_dual, stall = dual, 0
+        else:
+            stall += 1
+            if stall >= patience:
+                scale, stall = scale / 2, 0
+        # 전체 커버 가능 수요도 상한이므로 둘 중 작은 값 (스텝 크기는 쌍대 값 기준)
+        best_upper = min(best_dual, total)
+
+        # 실행 가능 해: 매 반복은 완화 해 x(상위 p개)의 커버 수요만 희소 곱으로 계산하고,
+        # 보정(중복 제거 + greedy 채우기)은 쌍대 값이 개선됐거나 repair_every 반복마다 수행
+        x = np.zeros(n_sites, dtype=bool)
+        x[top] = True
+        if improved or iteration % repair_every == 0:
+            x, lower = _repair_selection(A, AT, x, demand, p)
+        else:
+            lower = float(demand[(AT @ x.astype(float)) > 0].sum())
+        if lower > best_lower:
+            best_mask, best_lower = x, lower
+
+        gap = (best_upper - best_lower) / best_upper if best_upper > 0 else 0.0
+        if gap <= gap_tol:
+            stop_reason = 'gap'
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            stop_reason = 'time_budget'
+            break
+
+        # 서브그래디언트 갱신
+        x_top = np.zeros(n_sites)
+        x_top[top] = 1.0
+        subgradient = AT @ x_top - y
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            stop_reason = 'optimal'
+            break
+        step = scale * (dual - best_lower) / norm
+        lam = np.maximum(0.0, lam - step * subgradient)
+
+    summary = {'upper_bound': round(best_upper, 2), 'iterations': iteration, 'stop_reason': stop_reason}
+    if improve:
+        remaining = None if time_budget is None else max(0.0, time_budget - (time.perf_counter() - start))
+        best_mask, improved = improve_selection(best_mask, A, demand, time_budget=remaining, verbose=False)
+        best_lower = max(best_lower, improved['covered_demand'])
+        summary['swaps'] = improved['swaps']
+
+    gap = (best_upper - best_lower) / best_upper if best_upper > 0 else 0.0
+    summary.update({
+        'covered_demand': round(best_lower, 2),
+        'gap': round(gap * 100, 4),
+        'seconds': round(time.perf_counter() - start, 3)
+    })
+
+    if verbose:
+        print(f"[라그랑지안 MCLP] 반복 {iteration}회, 종료 사유: {stop_reason}, {summary['seconds']:.2f}초")
+        print(f"하한(커버 수요): {best_lower:,.2f} / 상한: {best_upper:,.2f} / gap: {summary['gap']:.3f}%")
+
+    return best_mask, summary
+
+
+def _repair_selection(A, AT, mask, demand, p):
+    """
+    완화 해의 설치지에서 추가 커버가 없는 중복 설치지를 빼고, 남은 자리를 미커버 수요 기준 greedy로 채움
+    (중복 제거는 희소 행렬-벡터 곱 몇 번으로 한 번에, greedy 채우기는 빈 자리 수만큼 반복)
+
+    Returns:
+    - tuple(np.ndarray, float): (보정된 설치 여부, 커버 수요)
+    """
+    mask = mask.copy()
+    n_sites = len(mask)
+    counts = AT @ mask.astype(float)
+
+    # 다른 설치지가 모두 커버하는 설치지를 한 번에 제거 (더 뺄 수 없을 때까지 반복)
+    # 함께 빼면 커버가 사라지는 수요지는 그 수요지를 커버하는 후보 중 하나(가장 큰 위치)만 남김
+    while True:
+        loss = A @ (demand * (counts == 1))
+        candidates = np.flatnonzero(mask & (loss <= 0))
+        if len(candidates) == 0:
+            break
+        redundant = np.zeros(n_sites, dtype=bool)
+        redundant[candidates] = True
+        remaining = counts - AT @ redundant.astype(float)
+        lost = np.flatnonzero((remaining <= 0) & (counts > 0) & (demand > 0))
+        if len(lost):
+            lost_cover = AT[lost][:, candidates].tocsr()
+            keepers = candidates[np.maximum.reduceat(lost_cover.indices, lost_cover.indptr[:-1])]
+            redundant[keepers] = False
+        if not redundant.any():
+            break
+        mask &= ~redundant
+        counts -= AT @ redundant.astype(float)
+
+    # 빈 자리 greedy 채우기
+    missing = demand * (counts == 0)
+    gain = A @ missing
+    for _ in range(p - int(mask.sum())):
+        gain[mask] = -np.inf
+        site = int(np.argmax(gain))
+        if gain[site] <= 0:
+            break
+        mask[site] = True
+        points = A.indices[A.indptr[site]:A.indptr[site + 1]]
+        newly = points[counts[points] == 0]
+        counts[points] += 1
+        # 새로 커버된 수요지를 커버하는 설치지의 이득만 차감
+        gain -= AT[newly].T @ missing[newly]
+        missing[newly] = 0.0
+
+    return mask, float(demand[counts > 0].sum())
+
+
+def _best_swap(A, mask, unique, loss, gain):
+    """
+    모든 (out, in) 교체 쌍 중 이득이 가장 큰 쌍 (out, in, 이득)
+    보정 항은 0 이상이므로 최댓값은 '최대 추가 이득 - 최소 제거 손실' 쌍 또는 보정 희소 행렬의 원소 중 하나
+    """
+    inside = np.flatnonzero(mask)
+    outside = np.flatnonzero(~mask)
+    if len(inside) == 0 or len(outside) == 0:
+        return None
+
+    # 보정이 없는 쌍의 최댓값
+    best_out = inside[np.argmin(loss[inside])]
+    best_in = outside[np.argmax(gain[outside])]
+    best = (best_out, best_in, gain[best_in] - loss[best_out])
+
+    # 보정[out, in] = out만 커버하던 수요 중 in도 커버하는 수요 (선택지 행 × 전체 설치지 희소 행렬)
+    overlap = (A[inside] @ diags(unique) @ A.T).tocoo()
+    keep = ~mask[overlap.col]
+    if keep.any():
+        rows, cols = inside[overlap.row[keep]], overlap.col[keep]
+        delta = gain[cols] - loss[rows] + overlap.data[keep]
+        top = np.argmax(delta)
+        if delta[top] > best[2]:
+            best = (rows[top], cols[top], delta[top])
+    return best
+
+
+def _coverage_csr(coverage, n_points):
+    """
+    커버리지 구조를 (설치 후보 × 수요지) float CSR로 통일
+    (scipy 희소 행렬, GridCoverage(.matrix), solve_mclp의 {설치 위치: [수요지 위치]} dict 지원)
+    """
+    if hasattr(coverage, 'matrix') and not isinstance(coverage, np.ndarray):
+        coverage = coverage.matrix
+    if isinstance(coverage, dict):
+        rows = np.repeat(
+            np.fromiter(coverage.keys(), dtype=np.int64, count=len(coverage)),
+            [len(points) for points in coverage.values()]
+        )
+        cols = np.fromiter((j for points in coverage.values() for j in points), dtype=np.int64, count=len(rows))
+        n_sites = max(n_points, int(rows.max()) + 1 if len(rows) else 0)
+        coverage = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_sites, n_points))
+    elif not issparse(coverage):
+        coverage = csr_matrix(np.asarray(coverage))
+
+    A = csr_matrix(coverage, dtype=float)
+    A.sum_duplicates()
+    A.data[:] = 1.0
+    if A.shape[1] != n_points:
+        raise ValueError(f"커버리지 열 수({A.shape[1]})가 수요지 수({n_points})와 다릅니다.")
+    return A
+
+
+def _is_mask_like(selected, n_sites):
+    """설치 후보 수 길이의 bool/0-1 배열인지 여부"""
+    values = np.asarray(list(selected) if isinstance(selected, (set, frozenset)) else selected)
+    return values.shape == (n_sites,) and (values.dtype == bool or np.isin(values, [0, 1]).all())
+
+
+def _selection_mask(selected, n_sites, grid_ids=None):
+    """설치 여부 배열 / 정수 위치 / grid_id 집합을 설치 후보 bool 마스크로 변환"""
+    if _is_mask_like(selected, n_sites):
+        return np.asarray(selected).astype(bool).copy()
+
+    mask = np.zeros(n_sites, dtype=bool)
+    if grid_ids is not None:
+        positions = pd.Index(grid_ids).get_indexer(list(selected))
+        mask[positions[positions >= 0]] = True
+    else:
+        mask[np.asarray(list(selected), dtype=np.int64)] = True
+    return mask
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -166,7 +577,7 @@ def run_sensitivity_analysis(
     result_df = pd.DataFrame(results)
 
     if save_path:
-        result_df.to_csv(save_path, index=False)
+        write_csv_with_manifest(result_df, save_path, encoding='utf-8')
         if verbose:
             print(f"\n민감도 분석 결과 저장 완료: {save_path}")
 
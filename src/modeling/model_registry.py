@@ -0,0 +1,130 @@
+# src/modeling/model_registry.py
+# 학습된 XGBoost 모델 레지스트리 (입력 데이터 + 학습 설정 해시를 키로 모델/예측값 재사용)
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from xgboost import XGBRegressor
+
+# 레지스트리 위치 (기본값: 모델링 출력 폴더의 models/xgboost, 예: data/modeling/models/xgboost)
+REGISTRY_SUBDIR = Path('models') / 'xgboost'
+
+
+def model_registry_dir(output_dir):
+    """모델링 출력 폴더 기준 XGBoost 레지스트리 디렉토리"""
+    return Path(output_dir) / REGISTRY_SUBDIR
+
+
+def model_key(df, features, label, params):
+    """
+    feature/label 값, feature 목록, label, 하이퍼파라미터로 모델 키를 계산합니다.
+    (행 순서와 dtype도 키에 포함되므로 같은 키면 예측값을 행 위치 그대로 재사용할 수 있음)
+
+    Returns:
+    - str: 16자리 해시
+    """
+    frame = df[features + [label]]
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    digest.update(json.dumps({
+        'rows': len(frame),
+        'features': list(features),
+        'label': label,
+        'dtypes': {str(col): str(dtype) for col, dtype in frame.dtypes.items()},
+        'params': params,
+        'xgboost': xgb.__version__
+    }, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _registry_paths(registry_dir, key):
+    registry_dir = Path(registry_dir)
+    return {
+        'model': registry_dir / f'xgb_{key}.ubj',
+        'predictions': registry_dir / f'xgb_{key}.predictions.npy',
+        'metadata': registry_dir / f'xgb_{key}.json'
+    }
+
+
+def register_model(registry_dir, key, model, metrics, predictions, metadata=None):
+    """
+    학습된 모델(UBJSON), 전체 행 예측값, 메타데이터(지표/설정)를 저장합니다.
+    메타데이터 파일을 마지막에 써서, 메타데이터가 있으면 저장이 끝난 항목으로 간주합니다.
+    """
+    paths = _registry_paths(registry_dir, key)
+    paths['model'].parent.mkdir(parents=True, exist_ok=True)
+
+    model.save_model(paths['model'])
+    np.save(paths['predictions'], np.asarray(predictions, dtype=np.float64))
+
+    record = {
+        'key': key,
+        'model_type': type(model).__name__,
+        'metrics': {name: _json_value(value) for name, value in metrics.items()},
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        **(metadata or {})
+    }
+    with open(paths['metadata'], 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2, default=str)
+    return record
+
+
+def load_registered_model(registry_dir, key):
+    """
+    레지스트리에서 키에 해당하는 모델을 읽습니다.
+
+    Returns:
+    - dict 또는 None: {'model', 'metrics', 'predictions', 'metadata'} (없거나 불완전하면 None)
+    """
+    paths = _registry_paths(registry_dir, key)
+    if not all(path.exists() for path in paths.values()):
+        return None
+
+    try:
+        with open(paths['metadata'], 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+    if metadata.get('model_type') == 'XGBRegressor':
+        model = XGBRegressor()
+        model.load_model(paths['model'])
+    else:
+        model = xgb.Booster(model_file=str(paths['model']))
+
+    return {
+        'model': model,
+        'metrics': metadata.get('metrics', {}),
+        'predictions': np.load(paths['predictions']),
+        'metadata': metadata
+    }
+
+
+def list_registered_models(registry_dir):
+    """레지스트리에 저장된 모델 목록 (키, 모델 타입, 지표, 생성 시각)"""
+    rows = []
+    for path in sorted(Path(registry_dir).glob('xgb_*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        rows.append({
+            'key': metadata.get('key'),
+            'model_type': metadata.get('model_type'),
+            'created_at': metadata.get('created_at'),
+            **metadata.get('metrics', {})
+        })
+    return pd.DataFrame(rows)
+
+
+def _json_value(value):
+    """지표 값을 JSON 직렬화 가능한 값으로 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
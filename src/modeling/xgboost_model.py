@@ -1,11 +1,42 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 import xgboost as xgb
+from joblib import Parallel, delayed
 from xgboost import XGBRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GroupKFold, train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import matplotlib.pyplot as plt
 
+try:
+    from modeling.model_registry import load_registered_model, model_key, register_model
+except ImportError:
+    from src.modeling.model_registry import load_registered_model, model_key, register_model
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+# 조기 종료 기준 (eval set RMSE가 이 라운드 수 동안 개선되지 않으면 중단)
+EARLY_STOPPING_ROUNDS = 10
+
+# 하이퍼파라미터 탐색 기본 범위 (리스트는 이산 후보, 튜플은 (최소, 최대) 연속 구간)
+DEFAULT_SEARCH_SPACE = {
+    'max_depth': [3, 4, 5, 6, 8, 10],
+    'learning_rate': (0.01, 0.3),  # 로그 균등 샘플링
+    'subsample': (0.5, 1.0),
+    'n_estimators': [100, 200, 400, 800]
+}
+
+# 공간 블록 CV 격자 ID 형식 (GRID_행_열)
+GRID_ID_PATTERN = r'GRID_(\d+)_(\d+)'
+
+
 def train_and_predict(
     df: pd.DataFrame,
     features: list,
@@ -13,7 +44,11 @@ def train_and_predict(
     n_estimators: int = 100,
     test_size: float = 0.2,
     random_state: int = 42,
-    verbose: bool = True
+    verbose: bool = True,
+    fast: bool = False,
+    n_jobs: int = -1,
+    max_bin: int = 256,
+    registry_dir: str = None
 ) -> tuple[pd.DataFrame, dict]:
     """
     XGBoost 회귀 모델을 학습하고, 예측값과 성능 지표를 반환합니다.
@@ -26,12 +61,72 @@ def train_and_predict(
     - test_size (float): 테스트 데이터셋의 비율 (기본값: 0.2)
     - random_state (int): 데이터 분할 및 모델 재현성을 위한 시드 값
     - verbose (bool): 성능 지표 출력 여부
+    - fast (bool): True면 성능 최적화 모드
+      (tree_method='hist', float32 입력, QuantileDMatrix 한 번 생성 후 eval set에 재사용, 예측 1회)
+    - n_jobs (int): 학습/예측 스레드 수 (-1이면 전체 코어)
+    - max_bin (int): fast 모드 히스토그램 bin 수
+    - registry_dir (str): 모델 레지스트리 디렉토리 (예: model_registry_dir('data/modeling'))
+      feature/label 값 + feature 목록 + 하이퍼파라미터 해시가 같으면 학습 없이
+      저장된 모델과 predicted_demand_score를 반환 (None이면 레지스트리 사용 안 함)
 
     Returns:
     - df (pd.DataFrame): 예측 결과가 추가된 원본 데이터프레임
-    - metrics (dict): 모델 평가 지표 (MAE, RMSE, R2)
-    - model (XGBRegressor): 학습된 XGBoost 모델 객체
+    - metrics (dict): 모델 평가 지표 (MAE, RMSE, R2) + 소요 시간(초)/메모리(MB)
+      (레지스트리 사용 시 registry_status='cached'/'trained', model_key 포함)
+    - model: 학습된 모델 (기본: XGBRegressor, fast=True면 xgb.Booster)
     """
+    registry_key = None
+    if registry_dir is not None:
+        registry_params = {
+            'n_estimators': n_estimators,
+            'test_size': test_size,
+            'random_state': random_state,
+            'fast': fast,
+            'max_bin': max_bin if fast else None,
+            'early_stopping_rounds': EARLY_STOPPING_ROUNDS
+        }
+        registry_key = model_key(df, features, label, registry_params)
+        cached = load_registered_model(registry_dir, registry_key)
+        if cached is not None and len(cached['predictions']) == len(df):
+            df['predicted_demand_score'] = cached['predictions']
+            metrics = {**cached['metrics'], 'registry_status': 'cached', 'model_key': registry_key}
+            if verbose:
+                print(f"📦 [MODEL REGISTRY] 캐시된 모델 사용 (key={registry_key}, 학습 생략)")
+                print(f"MAE: {metrics['MAE']:.2f}")
+                print(f"RMSE: {metrics['RMSE']:.2f}")
+                print(f"R²: {metrics['R2']:.4f}")
+            return df, metrics, cached['model']
+
+    if fast:
+        df, metrics, model = _train_and_predict_fast(
+            df, features, label, n_estimators, test_size, random_state, verbose, n_jobs, max_bin
+        )
+    else:
+        df, metrics, model = _train_and_predict_default(
+            df, features, label, n_estimators, test_size, random_state, verbose, n_jobs
+        )
+
+    if registry_key is not None:
+        register_model(
+            registry_dir, registry_key, model, metrics,
+            predictions=df['predicted_demand_score'].to_numpy(),
+            metadata={
+                'features': list(features),
+                'label': label,
+                'params': registry_params,
+                'categories': _category_levels(df, features)
+            }
+        )
+        metrics.update({'registry_status': 'trained', 'model_key': registry_key})
+        if verbose:
+            print(f"💾 [MODEL REGISTRY] 새로 학습한 모델 저장 (key={registry_key})")
+
+    return df, metrics, model
+
+
+def _train_and_predict_default(df, features, label, n_estimators, test_size, random_state, verbose, n_jobs):
+    """train_and_predict 기본 모드 (XGBRegressor)"""
+    start = time.perf_counter()
 
     # 결측 제거 후 valid subset
     valid_rows = df[features + [label]].dropna()
@@ -49,13 +144,15 @@ def train_and_predict(
         random_state=random_state,
         enable_categorical=True,
         eval_metric="rmse",
-        early_stopping_rounds=10  # 추가 가능
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        n_jobs=_resolve_n_jobs(n_jobs)
     )
     model.fit(
         X_train, y_train,
         eval_set=[(X_test, y_test)],
         verbose=False
     )
+    train_seconds = time.perf_counter() - start
 
     # 성능 평가
     y_pred = model.predict(X_test)
@@ -72,9 +169,521 @@ def train_and_predict(
         print(f"MAE: {mae:.2f}")
         print(f"RMSE: {rmse:.2f}")
         print(f"R²: {r2:.4f}")
-        
+
     return df, {
-        "MAE": round(mae, 2), 
-        "RMSE": round(rmse, 2), 
-        "R2": round(r2, 4)
-        }, model
\ No newline at end of file
+        "MAE": round(mae, 2),
+        "RMSE": round(rmse, 2),
+        "R2": round(r2, 4),
+        **_resource_metrics(start, train_seconds, X)
+        }, model
+
+
+def _train_and_predict_fast(df, features, label, n_estimators, test_size, random_state, verbose, n_jobs, max_bin):
+    """
+    train_and_predict의 성능 최적화 모드 (xgboost 네이티브 API 사용).
+
+    - 숫자 feature는 float32로 변환 (category 컬럼은 그대로 유지)
+    - 학습 QuantileDMatrix를 한 번 만들고 eval set은 ref로 같은 bin 경계를 재사용
+    - 전체 valid 행에 대해 예측을 한 번만 수행하고 테스트 예측은 그 결과에서 추출
+    """
+    start = time.perf_counter()
+
+    valid_index, X, y, train_pos, test_pos = _prepare_fast_inputs(df, features, label, test_size, random_state)
+    dtrain, dtest = _build_quantile_dmatrices(X, y, train_pos, test_pos, max_bin)
+
+    params = _base_params(max_bin, random_state, _resolve_n_jobs(n_jobs))
+    booster = xgb.train(
+        params, dtrain,
+        num_boost_round=n_estimators,
+        evals=[(dtest, 'eval')],
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        verbose_eval=False
+    )
+    # 반환 모델은 best iteration까지의 트리만 유지 (XGBRegressor.predict처럼 최적 반복 기준으로 예측)
+    best_iteration = _best_iteration(booster)
+    booster = booster[: best_iteration + 1]
+    train_seconds = time.perf_counter() - start
+
+    # 예측 1회 → 테스트 예측은 슬라이스
+    all_pred = booster.inplace_predict(X)
+    y_pred = all_pred[test_pos]
+    y_test = y[test_pos]
+
+    mae = mean_absolute_error(y_test, y_pred)
+    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    r2 = r2_score(y_test, y_pred)
+
+    df['predicted_demand_score'] = np.nan
+    df.loc[valid_index, 'predicted_demand_score'] = all_pred
+
+    metrics = {
+        "MAE": round(mae, 2),
+        "RMSE": round(rmse, 2),
+        "R2": round(r2, 4),
+        "best_iteration": best_iteration,
+        **_resource_metrics(start, train_seconds, X)
+    }
+
+    if verbose:
+        print("XGBoost 성능 (fast 모드):")
+        print(f"MAE: {mae:.2f}")
+        print(f"RMSE: {rmse:.2f}")
+        print(f"R²: {r2:.4f}")
+        print(f"⏱️ 학습 {metrics['train_seconds']:.2f}초 / 전체 {metrics['total_seconds']:.2f}초, "
+              f"입력 {metrics['input_mb']:.1f}MB")
+
+    return df, metrics, booster
+
+
+def search_hyperparameters(
+    df: pd.DataFrame,
+    features: list,
+    label: str = 'demand_score',
+    search_space: dict = None,
+    strategy: str = 'random',
+    n_candidates: int = 20,
+    time_budget: float = None,
+    n_jobs: int = -1,
+    threads_per_candidate: int = None,
+    halving_factor: int = 3,
+    min_rounds: int = 50,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    max_bin: int = 256,
+    verbose: bool = True
+):
+    """
+    XGBoost 하이퍼파라미터 탐색 (random search 또는 successive halving).
+
+    - train_and_predict(fast=True)와 같은 분할/QuantileDMatrix를 한 번 만들어 모든 후보가 공유
+    - 후보들은 스레드 풀에서 동시에 학습하며, 후보마다 xgboost 스레드 수를 제한
+    - 각 후보는 eval set RMSE 기준 조기 종료, 전체 탐색은 time_budget(초)을 넘기면 중단
+
+    Parameters:
+    - search_space (dict): 탐색 범위 (None이면 DEFAULT_SEARCH_SPACE)
+      리스트는 이산 후보, 튜플 (최소, 최대)는 연속 구간 (learning_rate는 로그 균등)
+    - strategy (str): 'random' (후보별 n_estimators까지 학습, search_space에 없으면 min_rounds) 또는
+      'halving' (min_rounds 라운드부터 시작해 상위 1/halving_factor만 halving_factor배 라운드로 재학습,
+      최대 라운드는 search_space['n_estimators']의 최댓값)
+    - n_candidates (int): 샘플링할 후보 수
+    - time_budget (float): 전체 탐색 제한 시간(초), None이면 제한 없음
+    - n_jobs (int): 동시에 학습할 후보 수 (-1이면 전체 코어)
+    - threads_per_candidate (int): 후보별 xgboost 스레드 수 (None이면 코어 수 / n_jobs)
+
+    Returns:
+    - best_model (xgb.Booster): eval RMSE가 가장 낮은 모델
+    - leaderboard (pd.DataFrame): 후보별 파라미터, RMSE/MAE/R2, best_iteration, 학습 시간, 상태 (RMSE 오름차순)
+    """
+    if strategy not in ('random', 'halving'):
+        raise ValueError("strategy는 'random' 또는 'halving'이어야 합니다.")
+
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+    search_space = dict(search_space or DEFAULT_SEARCH_SPACE)
+
+    n_workers = min(_resolve_n_jobs(n_jobs), n_candidates)
+    if threads_per_candidate is None:
+        threads_per_candidate = max(1, (os.cpu_count() or 1) // n_workers)
+
+    # 데이터 준비는 한 번만 (모든 후보가 같은 QuantileDMatrix 사용)
+    _, X, y, train_pos, test_pos = _prepare_fast_inputs(df, features, label, test_size, random_state)
+    dtrain, dtest = _build_quantile_dmatrices(X, y, train_pos, test_pos, max_bin)
+    base_params = _base_params(max_bin, random_state, threads_per_candidate)
+    y_test = y[test_pos]
+
+    # halving에서는 라운드 수를 단계별로 정하므로 n_estimators는 샘플링하지 않음
+    sample_space = {
+        key: values for key, values in search_space.items()
+        if not (strategy == 'halving' and key == 'n_estimators')
+    }
+    rng = np.random.default_rng(random_state)
+    candidates = _sample_candidates(sample_space, n_candidates, rng)
+
+    def run_rung(rung, survivors, num_rounds):
+        return Parallel(n_jobs=n_workers, prefer='threads')(
+            delayed(_fit_candidate)(
+                candidate_id, candidates[candidate_id], num_rounds(candidate_id),
+                dtrain, dtest, y_test, base_params, deadline, rung
+            )
+            for candidate_id in survivors
+        )
+
+    # search_space에 n_estimators가 없으면 두 전략 모두 min_rounds 라운드까지 학습
+    max_rounds = int(max(_as_list(search_space.get('n_estimators', [min_rounds]))))
+
+    results = []
+    if strategy == 'random':
+        results = run_rung(0, range(len(candidates)), lambda cid: int(candidates[cid].get('n_estimators', max_rounds)))
+    else:
+        survivors = list(range(len(candidates)))
+        num_rounds = min(min_rounds, max_rounds)
+        rung = 0
+        while survivors:
+            rung_results = run_rung(rung, survivors, lambda cid: num_rounds)
+            results.extend(rung_results)
+
+            finished = [r for r in rung_results if r[1] is not None]
+            if num_rounds >= max_rounds or len(finished) <= 1 or _deadline_passed(deadline):
+                break
+
+            # 상위 1/halving_factor만 다음 단계로 (라운드 수 halving_factor배)
+            # 이미 조기 종료된 후보는 라운드를 늘려도 결과가 같으므로 재학습하지 않음
+            finished.sort(key=lambda r: r[0]['RMSE'])
+            keep = max(1, int(np.ceil(len(finished) / halving_factor)))
+            survivors = [r[0]['candidate'] for r in finished[:keep] if r[0]['status'] == 'completed']
+            num_rounds = min(num_rounds * halving_factor, max_rounds)
+            rung += 1
+
+    trained = [(record, booster) for record, booster in results if booster is not None]
+    if not trained:
+        raise RuntimeError("제한 시간 내에 학습을 마친 후보가 없습니다. time_budget을 늘려주세요.")
+
+    best_record, best_model = min(trained, key=lambda r: r[0]['RMSE'])
+    leaderboard = (
+        pd.DataFrame([record for record, _ in results])
+        .sort_values(['RMSE', 'rung'], ascending=[True, False], na_position='last')
+        .reset_index(drop=True)
+    )
+
+    if verbose:
+        elapsed = time.perf_counter() - start
+        print(f"🔍 하이퍼파라미터 탐색 완료 ({strategy}): {len(trained)}/{len(results)}개 학습, {elapsed:.1f}초 "
+              f"(동시 {n_workers}개 × 스레드 {threads_per_candidate})")
+        print(f"🏆 최적 후보 #{best_record['candidate']}: RMSE {best_record['RMSE']:.2f}, "
+              f"R² {best_record['R2']:.4f}, " + ", ".join(
+                  f"{key}={best_record[key]}" for key in sample_space))
+
+    return best_model, leaderboard
+
+
+def spatial_block_cv(
+    df: pd.DataFrame,
+    features: list,
+    label: str = 'demand_score',
+    block_by: str = 'tile',
+    tile_size: int = 10,
+    n_splits: int = 5,
+    n_estimators: int = 100,
+    params: dict = None,
+    max_workers: int = None,
+    threads_per_fold: int = None,
+    random_state: int = 42,
+    max_bin: int = 256,
+    verbose: bool = True
+):
+    """
+    공간 블록 교차검증: 인접한 격자를 같은 블록으로 묶어 fold를 나눕니다 (GroupKFold).
+    무작위 분할처럼 이웃 격자가 학습/테스트 양쪽에 들어가 성능이 부풀려지는 것을 막습니다.
+
+    - 각 fold는 프로세스 풀에서 동시에 학습 (데이터는 워커 초기화 시 한 번만 전달)
+    - fold별 xgboost 스레드 수를 threads_per_fold로 제한
+    - 테스트 fold를 조기 종료에 쓰지 않도록 n_estimators 라운드를 그대로 학습
+
+    Parameters:
+    - block_by (str): 'tile' (grid_id의 행/열을 tile_size × tile_size 타일로 묶음) 또는
+      'cluster' (KMeans 'cluster' 컬럼을 블록으로 사용)
+    - tile_size (int): 타일 한 변의 격자 수
+    - n_splits (int): fold 수
+    - params (dict): 추가 xgboost 파라미터 (max_depth, learning_rate 등)
+    - max_workers (int): 동시에 학습할 fold 수 (None이면 min(n_splits, 코어 수))
+    - threads_per_fold (int): fold별 xgboost 스레드 수 (None이면 코어 수 / max_workers)
+
+    Returns:
+    - fold_metrics (pd.DataFrame): fold별 학습/테스트 행 수, 블록 수, MAE, RMSE, R2, 학습 시간
+    - summary (dict): 전체 out-of-fold MAE/RMSE/R2, fold 평균/표준편차,
+      전체 소요 시간과 fold 학습 시간 합(순차 실행 시 예상 시간)
+    """
+    start = time.perf_counter()
+
+    valid_rows = df[features + [label]].dropna()
+    blocks = _spatial_blocks(df.loc[valid_rows.index], block_by, tile_size)
+    n_blocks = blocks.nunique()
+    if n_blocks < n_splits:
+        raise ValueError(f"블록 수({n_blocks})가 fold 수({n_splits})보다 적습니다. tile_size 또는 n_splits를 줄여주세요.")
+
+    X = _to_float32(valid_rows[features])
+    y = valid_rows[label].to_numpy(dtype=np.float32)
+    splits = list(GroupKFold(n_splits=n_splits).split(X, y, groups=blocks.to_numpy()))
+
+    cpu_count = os.cpu_count() or 1
+    max_workers = max_workers or min(n_splits, cpu_count)
+    if threads_per_fold is None:
+        threads_per_fold = max(1, cpu_count // max_workers)
+    fold_params = _base_params(max_bin, random_state, threads_per_fold)
+    fold_params.update(params or {})
+
+    oof_pred = np.full(len(y), np.nan, dtype=np.float32)
+    records = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_cv_worker, initargs=(X, y)
+    ) as executor:
+        futures = [
+            executor.submit(_fit_cv_fold, fold, train_pos, test_pos, fold_params, n_estimators, max_bin)
+            for fold, (train_pos, test_pos) in enumerate(splits)
+        ]
+        for future, (train_pos, test_pos) in zip(futures, splits):
+            record, fold_pred = future.result()
+            record['n_blocks'] = int(blocks.iloc[test_pos].nunique())
+            oof_pred[test_pos] = fold_pred
+            records.append(record)
+
+    fold_metrics = pd.DataFrame(records)[
+        ['fold', 'n_train', 'n_test', 'n_blocks', 'MAE', 'RMSE', 'R2', 'seconds']
+    ]
+    total_seconds = time.perf_counter() - start
+    summary = {
+        'MAE': round(float(mean_absolute_error(y, oof_pred)), 2),
+        'RMSE': round(float(np.sqrt(mean_squared_error(y, oof_pred))), 2),
+        'R2': round(float(r2_score(y, oof_pred)), 4),
+        **{f'{metric}_mean': round(float(fold_metrics[metric].mean()), 4) for metric in ('MAE', 'RMSE', 'R2')},
+        **{f'{metric}_std': round(float(fold_metrics[metric].std(ddof=0)), 4) for metric in ('MAE', 'RMSE', 'R2')},
+        'block_by': block_by,
+        'n_blocks': int(n_blocks),
+        'n_splits': n_splits,
+        'total_seconds': round(total_seconds, 3),
+        'sequential_seconds': round(float(fold_metrics['seconds'].sum()), 3)
+    }
+
+    if verbose:
+        print(f"🧩 공간 블록 CV ({block_by}, 블록 {n_blocks}개, {n_splits}-fold, 동시 {max_workers}개 × 스레드 {threads_per_fold})")
+        print(fold_metrics.to_string(index=False))
+        print(f"MAE: {summary['MAE']:.2f} (fold 평균 {summary['MAE_mean']:.2f} ± {summary['MAE_std']:.2f})")
+        print(f"RMSE: {summary['RMSE']:.2f} (fold 평균 {summary['RMSE_mean']:.2f} ± {summary['RMSE_std']:.2f})")
+        print(f"R²: {summary['R2']:.4f} (fold 평균 {summary['R2_mean']:.4f} ± {summary['R2_std']:.4f})")
+        print(f"⏱️ 전체 {total_seconds:.2f}초 (fold 학습 시간 합 {summary['sequential_seconds']:.2f}초)")
+
+    return fold_metrics, summary
+
+
+def _spatial_blocks(df, block_by='tile', tile_size=10):
+    """행별 공간 블록 ID (같은 블록은 같은 fold로 배정)"""
+    if block_by == 'cluster':
+        if 'cluster' not in df.columns:
+            raise ValueError("block_by='cluster'에는 'cluster' 컬럼이 필요합니다 (KMeans 결과).")
+        return df['cluster'].astype(str)
+
+    if block_by != 'tile':
+        raise ValueError("block_by는 'tile' 또는 'cluster'여야 합니다.")
+    if 'grid_id' not in df.columns:
+        raise ValueError("block_by='tile'에는 'grid_id' 컬럼(GRID_행_열)이 필요합니다.")
+
+    lattice = df['grid_id'].astype(str).str.extract(GRID_ID_PATTERN)
+    if lattice.isna().any().any():
+        raise ValueError("grid_id에서 격자 행/열을 읽을 수 없습니다 (형식: GRID_행_열).")
+    rows = lattice[0].astype(int) // tile_size
+    cols = lattice[1].astype(int) // tile_size
+    return rows.astype(str) + '_' + cols.astype(str)
+
+
+# 공간 블록 CV 워커 프로세스의 공유 데이터 (워커 초기화 시 한 번만 전달)
+_CV_DATA = {}
+
+
+def _init_cv_worker(X, y):
+    _CV_DATA['X'] = X
+    _CV_DATA['y'] = y
+
+
+def _fit_cv_fold(fold, train_pos, test_pos, params, n_estimators, max_bin):
+    """워커 프로세스에서 fold 하나를 학습하고 (지표 레코드, 테스트 예측)을 반환"""
+    start = time.perf_counter()
+    X, y = _CV_DATA['X'], _CV_DATA['y']
+
+    dtrain = xgb.QuantileDMatrix(
+        X.iloc[train_pos], y[train_pos], enable_categorical=True, max_bin=max_bin
+    )
+    booster = xgb.train(params, dtrain, num_boost_round=n_estimators, verbose_eval=False)
+    y_pred = booster.inplace_predict(X.iloc[test_pos])
+    y_test = y[test_pos]
+
+    record = {
+        'fold': fold,
+        'n_train': int(len(train_pos)),
+        'n_test': int(len(test_pos)),
+        'MAE': round(float(mean_absolute_error(y_test, y_pred)), 2),
+        'RMSE': round(float(np.sqrt(mean_squared_error(y_test, y_pred))), 2),
+        'R2': round(float(r2_score(y_test, y_pred)), 4),
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    return record, y_pred
+
+
+class _DeadlineCallback(xgb.callback.TrainingCallback):
+    """탐색 제한 시각이 지나면 학습을 중단하는 콜백"""
+
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+        self.stopped = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        if _deadline_passed(self.deadline):
+            self.stopped = True
+            return True
+        return False
+
+
+def _best_iteration(booster):
+    """조기 종료 기준 최적 반복 (조기 종료 기록이 없으면 마지막 반복)"""
+    try:
+        return int(booster.best_iteration)
+    except AttributeError:
+        return max(booster.num_boosted_rounds() - 1, 0)
+
+
+def _deadline_passed(deadline):
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def _as_list(values):
+    """이산 후보(list)는 그대로, 연속 구간(tuple)은 양 끝값 리스트로"""
+    return list(values) if not isinstance(values, tuple) else [values[0], values[1]]
+
+
+def _sample_candidates(search_space, n_candidates, rng):
+    """탐색 범위에서 후보 파라미터 dict 목록을 샘플링"""
+    candidates = []
+    for _ in range(n_candidates):
+        params = {}
+        for key, values in search_space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if key == 'learning_rate':
+                    params[key] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    params[key] = float(rng.uniform(low, high))
+            else:
+                params[key] = np.asarray(values)[rng.integers(len(values))].item()
+        candidates.append(params)
+    return candidates
+
+
+def _fit_candidate(candidate_id, candidate, num_rounds, dtrain, dtest, y_test, base_params, deadline, rung=0):
+    """
+    후보 하나를 학습하고 (leaderboard 레코드, booster)를 반환합니다.
+    제한 시각이 이미 지났으면 학습하지 않고 (status='skipped', None)을 반환합니다.
+    """
+    record = {'candidate': candidate_id, 'rung': rung, 'num_rounds': num_rounds, **candidate}
+    if _deadline_passed(deadline):
+        record.update({'RMSE': np.nan, 'MAE': np.nan, 'R2': np.nan, 'best_iteration': None,
+                       'seconds': 0.0, 'status': 'skipped'})
+        return record, None
+
+    params = dict(base_params)
+    params.update({key: value for key, value in candidate.items() if key != 'n_estimators'})
+    deadline_callback = _DeadlineCallback(deadline)
+
+    start = time.perf_counter()
+    booster = xgb.train(
+        params, dtrain,
+        num_boost_round=num_rounds,
+        evals=[(dtest, 'eval')],
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        callbacks=[deadline_callback],
+        verbose_eval=False
+    )
+    if deadline_callback.stopped:
+        status = 'deadline'
+    elif booster.num_boosted_rounds() < num_rounds:
+        status = 'early_stopped'
+    else:
+        status = 'completed'
+
+    best_iteration = _best_iteration(booster)
+    booster = booster[: best_iteration + 1]
+    y_pred = booster.predict(dtest)
+
+    record.update({
+        'RMSE': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        'MAE': float(mean_absolute_error(y_test, y_pred)),
+        'R2': float(r2_score(y_test, y_pred)),
+        'best_iteration': best_iteration,
+        'seconds': round(time.perf_counter() - start, 3),
+        'status': status
+    })
+    return record, booster
+
+
+def _prepare_fast_inputs(df, features, label, test_size, random_state):
+    """
+    결측 제거 + float32 변환 후 행 위치 기준으로 train/test 분할 (기본 모드와 같은 분할)
+
+    Returns:
+    - (valid_index, X, y, train_pos, test_pos)
+    """
+    valid_rows = df[features + [label]].dropna()
+    X = _to_float32(valid_rows[features])
+    y = valid_rows[label].to_numpy(dtype=np.float32)
+
+    positions = np.arange(len(valid_rows))
+    train_pos, test_pos = train_test_split(positions, test_size=test_size, random_state=random_state)
+    return valid_rows.index, X, y, train_pos, test_pos
+
+
+def _build_quantile_dmatrices(X, y, train_pos, test_pos, max_bin=256):
+    """학습 QuantileDMatrix를 만들고 eval set은 ref로 같은 bin 경계를 재사용"""
+    dtrain = xgb.QuantileDMatrix(
+        X.iloc[train_pos], y[train_pos], enable_categorical=True, max_bin=max_bin
+    )
+    dtest = xgb.QuantileDMatrix(
+        X.iloc[test_pos], y[test_pos], enable_categorical=True, max_bin=max_bin, ref=dtrain
+    )
+    return dtrain, dtest
+
+
+def _base_params(max_bin, random_state, nthread):
+    """fast 모드 공통 xgboost 파라미터"""
+    return {
+        'objective': 'reg:squarederror',
+        'tree_method': 'hist',
+        'max_bin': max_bin,
+        'eval_metric': 'rmse',
+        'seed': random_state,
+        'nthread': nthread
+    }
+
+
+def _category_levels(df, features):
+    """범주형 feature의 카테고리 목록 (배치 예측 시 같은 코드로 변환하기 위해 레지스트리에 저장)"""
+    return {
+        col: [level.item() if isinstance(level, np.generic) else level for level in df[col].cat.categories]
+        for col in features if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+
+
+def _resolve_n_jobs(n_jobs):
+    """n_jobs가 None/-1 이하이면 전체 코어 수 사용"""
+    if n_jobs is None or n_jobs < 1:
+        return os.cpu_count() or 1
+    return int(n_jobs)
+
+
+def _to_float32(X):
+    """숫자 컬럼은 float32로 변환 (category 등 비숫자 컬럼은 그대로)"""
+    numeric_cols = [
+        col for col in X.columns
+        if pd.api.types.is_numeric_dtype(X[col]) and not isinstance(X[col].dtype, pd.CategoricalDtype)
+    ]
+    return X.astype({col: np.float32 for col in numeric_cols})
+
+
+def _peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB), 측정 불가 환경이면 None"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / 1024 ** 2 if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def _resource_metrics(start, train_seconds, X):
+    """학습/전체 소요 시간과 입력 메모리, 프로세스 최대 메모리"""
+    total_seconds = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+    return {
+        "train_seconds": round(train_seconds, 3),
+        "predict_seconds": round(total_seconds - train_seconds, 3),
+        "total_seconds": round(total_seconds, 3),
+        "input_mb": round(float(X.memory_usage(deep=True, index=False).sum()) / 1024 ** 2, 3),
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None
+    }
@@ -3,51 +3,172 @@
 import pandas as pd
 import numpy as np
 import re
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor, wait
 from datetime import datetime
 import logging
 
+from .excel_reader import clean_header_names, find_fuel_header_row, find_sequence_header_row
+
+try:
+    from utils.artifact_manifest import write_csv_with_manifest
+except ImportError:
+    from src.utils.artifact_manifest import write_csv_with_manifest
+
 logger = logging.getLogger(__name__)
 
+# 병렬 전처리 결과를 Arrow IPC로 전달 (pyarrow가 없으면 pickle 사용)
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 서울시 25개 자치구
+SEOUL_DISTRICTS = [
+    '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', 
+    '성북구', '강북구', '도봉구', '노원구', '은평구', '서대문구', '마포구',
+    '양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구',
+    '서초구', '강남구', '송파구', '강동구'
+]
+
+# 자치구 이름 25개를 한 번에 찾는 단일 정규식 (한 번만 컴파일하여 .str 연산에 재사용)
+SEOUL_DISTRICT_REGEX = re.compile('(' + '|'.join(map(re.escape, SEOUL_DISTRICTS)) + ')')
+
 class DataCleaner:
+    # 서울 지역 경계 및 격자 크기 (500m를 위도/경도로 변환)
+    SEOUL_BOUNDS = {
+        'min_lat': 37.4,
+        'max_lat': 37.7,
+        'min_lon': 126.7,
+        'max_lon': 127.2
+    }
+    GRID_SIZE_LAT = 0.0045  # 약 500m
+    GRID_SIZE_LON = 0.0056  # 약 500m
+    
+    # 서로 독립적인 데이터셋별 전처리 단계 (단계 이름 → 전처리 메서드 이름)
+    CLEANING_STAGES = {
+        'ev_registration': '_clean_ev_registration_complete_fix',
+        'charging_stations': '_clean_charging_stations_complete_fix',
+        'charging_hourly': '_clean_charging_hourly_complete_fix',
+        'commercial_facilities': '_clean_commercial_facilities_complete_fix'
+    }
+    
+    # 격자 시스템 생성에 필요한 단계 (수요: 상업시설, 공급: 충전소)
+    GRID_INPUT_STAGES = ('commercial_facilities', 'charging_stations')
+    
     def __init__(self):
         self.processed_data = {}
+        self.stage_timings = {}
     
-    def clean_all_data(self, datasets):
-        """모든 데이터를 전처리합니다."""
+    def clean_all_data(self, datasets, parallel=False, max_workers=None):
+        """
+        모든 데이터를 전처리합니다.
+        
+        Parameters:
+        - datasets (dict): DataLoader.load_all_datasets() 결과
+        - parallel (bool): True면 4개 데이터셋 전처리를 프로세스 풀에서 동시에 실행
+        - max_workers (int): 병렬 모드 프로세스 수 (기본값: 단계 수)
+        
+        각 단계의 소요 시간은 self.stage_timings에 기록됩니다.
+        """
         print("🔧 모든 데이터 전처리를 시작합니다...")
+        self.stage_timings = {}
+        total_start = time.perf_counter()
+        
+        stage_inputs = self._collect_stage_inputs(datasets)
+        
+        if parallel and stage_inputs:
+            self._clean_stages_parallel(stage_inputs, max_workers)
+        else:
+            for stage, stage_input in stage_inputs.items():
+                start = time.perf_counter()
+                self.processed_data[stage] = getattr(self, self.CLEANING_STAGES[stage])(stage_input)
+                self.stage_timings[stage] = time.perf_counter() - start
+            
+            # 격자 시스템 생성 및 수요-공급 분석 (완전 수정)
+            self._timed_grid_system()
+        
+        self.stage_timings['total'] = time.perf_counter() - total_start
+        self._print_stage_timings(parallel)
+        
+        return self.processed_data
+    
+    def _collect_stage_inputs(self, datasets):
+        """로딩된 데이터셋을 전처리 단계별 입력으로 정리합니다."""
+        stage_inputs = {}
         
         # 전기차 등록 데이터 전처리 (완전 수정)
         if 'ev_registration_monthly' in datasets:
-            self.processed_data['ev_registration'] = self._clean_ev_registration_complete_fix(
-                datasets['ev_registration_monthly']
-            )
-        
-        # 충전소 데이터 전처리 (3개월 통합, 완전 수정)
-        charging_datasets = []
-        for month in ['202501', '202502', '202503']:
-            key = f'charging_stations_{month}'
-            if key in datasets:
-                charging_datasets.append(datasets[key])
+            stage_inputs['ev_registration'] = datasets['ev_registration_monthly']
         
-        if charging_datasets:
-            self.processed_data['charging_stations'] = self._clean_charging_stations_complete_fix(charging_datasets)
+        # 충전소 데이터 전처리 (로딩된 모든 월 통합, 완전 수정)
+        charging_keys = sorted(key for key in datasets if key.startswith('charging_stations_'))
+        if charging_keys:
+            stage_inputs['charging_stations'] = [datasets[key] for key in charging_keys]
         
         # 시간별 충전 데이터 전처리 (완전 수정)
         if 'charging_load_hourly' in datasets:
-            self.processed_data['charging_hourly'] = self._clean_charging_hourly_complete_fix(
-                datasets['charging_load_hourly']
-            )
+            stage_inputs['charging_hourly'] = datasets['charging_load_hourly']
         
         # 상업시설 데이터 전처리 (완전 수정)
         if 'commercial_facilities' in datasets:
-            self.processed_data['commercial_facilities'] = self._clean_commercial_facilities_complete_fix(
-                datasets['commercial_facilities']
-            )
+            stage_inputs['commercial_facilities'] = datasets['commercial_facilities']
         
-        # 격자 시스템 생성 및 수요-공급 분석 (완전 수정)
+        return stage_inputs
+    
+    def _clean_stages_parallel(self, stage_inputs, max_workers=None):
+        """데이터셋별 전처리를 프로세스 풀에서 실행하고, 상업시설/충전소가 끝나는 즉시 격자 생성을 시작합니다."""
+        max_workers = max_workers or len(stage_inputs)
+        print(f"⚡ 병렬 전처리 모드: {len(stage_inputs)}개 단계, 프로세스 {max_workers}개 "
+              f"(결과 전달: {'Arrow IPC' if PYARROW_AVAILABLE else 'pickle'})")
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                stage: executor.submit(_run_cleaning_stage, stage, stage_input)
+                for stage, stage_input in stage_inputs.items()
+            }
+            
+            # 격자 입력 단계만 먼저 기다림 (나머지 단계는 격자 생성과 동시에 계속 실행)
+            grid_futures = [futures[stage] for stage in self.GRID_INPUT_STAGES if stage in futures]
+            wait(grid_futures)
+            for stage in self.GRID_INPUT_STAGES:
+                if stage in futures:
+                    self._collect_stage_result(stage, futures[stage])
+            
+            self._timed_grid_system()
+            
+            for stage, future in futures.items():
+                if stage not in self.GRID_INPUT_STAGES:
+                    self._collect_stage_result(stage, future)
+        
+        # 출력 순서를 순차 모드와 맞춤
+        self.processed_data = {
+            name: self.processed_data[name]
+            for name in list(self.CLEANING_STAGES) + ['grid_system']
+            if name in self.processed_data
+        }
+    
+    def _collect_stage_result(self, stage, future):
+        """워커 결과를 DataFrame으로 복원해 processed_data에 저장합니다."""
+        payload_format, payload, elapsed = future.result()
+        self.processed_data[stage] = _deserialize_frame(payload_format, payload)
+        self.stage_timings[stage] = elapsed
+    
+    def _timed_grid_system(self):
+        start = time.perf_counter()
         self._create_grid_system_complete_fix()
-        
-        return self.processed_data
+        self.stage_timings['grid_system'] = time.perf_counter() - start
+    
+    def _print_stage_timings(self, parallel=False):
+        """단계별 소요 시간 출력"""
+        print()
+        print(f"⏱️ 단계별 전처리 시간 ({'병렬' if parallel else '순차'} 모드):")
+        for stage, elapsed in self.stage_timings.items():
+            if stage != 'total':
+                print(f"   {stage:>22}: {elapsed:.2f}초")
+        print(f"   {'total':>22}: {self.stage_timings['total']:.2f}초")
     
     def _clean_ev_registration_complete_fix(self, df):
         """전기차 등록 데이터 완전 해결 - 실제 데이터만 사용"""
@@ -55,40 +176,14 @@ class DataCleaner:
         print(f"📊 원본 데이터 형태: {df.shape}")
         
         try:
-            print("🔍 Excel 파일 상세 구조 분석 중...")
-            
-            # 디버깅: 첫 30행의 모든 컬럼 내용 분석
-            print("📋 첫 30행 데이터 미리보기:")
-            for i in range(min(30, len(df))):
-                row_values = []
-                for j in range(min(len(df.columns), 10)):  # 첫 10개 컬럼만
-                    val = df.iloc[i, j]
-                    if pd.notna(val):
-                        row_values.append(str(val)[:15])
-                    else:
-                        row_values.append("NaN")
-                if any(val != "NaN" for val in row_values):
-                    print(f"   {i:2d}행: {' | '.join(row_values)}")
-            
-            # 1단계: 실제 헤더 행 찾기
-            header_row = self._find_actual_header_row(df)
-            if header_row is None:
-                print("❌ 헤더 행을 찾을 수 없습니다. 데이터 추출을 중단합니다.")
-                return pd.DataFrame()
-            
-            print(f"📍 실제 헤더 행: {header_row}행")
-            
-            # 2단계: 헤더 설정 및 데이터 추출
-            headers = df.iloc[header_row].fillna('').astype(str).tolist()
-            data_start_row = header_row + 1
-            
-            # 헤더 정리
-            cleaned_headers = self._clean_headers(headers)
-            print(f"📋 정리된 헤더: {cleaned_headers[:10]}...")
-            
-            # 데이터 추출
-            df_data = df.iloc[data_start_row:].copy()
-            df_data.columns = cleaned_headers[:len(df_data.columns)]
+            if df.attrs.get('header_sniffed'):
+                # 로더가 헤더 행을 찾아 데이터 영역만 읽은 경우 (2단계 Excel 읽기)
+                print(f"📍 실제 헤더 행: {df.attrs.get('header_row')}행 (로딩 시 탐색 완료)")
+                df_data = df.copy()
+            else:
+                df_data = self._split_header_from_raw_excel(df)
+                if df_data is None:
+                    return pd.DataFrame()
             
             # 빈 행 제거
             df_data = df_data.dropna(how='all').reset_index(drop=True)
@@ -123,112 +218,109 @@ class DataCleaner:
             print("🚫 실제 데이터를 찾을 수 없어 빈 DataFrame을 반환합니다.")
             return pd.DataFrame()
 
-    def _find_actual_header_row(self, df):
-        """실제 헤더 행 찾기"""
-        print("🔍 실제 헤더 행 탐색 중...")
+    def _split_header_from_raw_excel(self, df):
+        """헤더 없이 읽힌 워크북에서 실제 헤더 행을 찾아 데이터 영역을 분리합니다."""
+        print("🔍 Excel 파일 상세 구조 분석 중...")
+        
+        # 디버깅: 첫 30행의 모든 컬럼 내용 분석
+        print("📋 첫 30행 데이터 미리보기:")
+        for i in range(min(30, len(df))):
+            row_values = []
+            for j in range(min(len(df.columns), 10)):  # 첫 10개 컬럼만
+                val = df.iloc[i, j]
+                if pd.notna(val):
+                    row_values.append(str(val)[:15])
+                else:
+                    row_values.append("NaN")
+            if any(val != "NaN" for val in row_values):
+                print(f"   {i:2d}행: {' | '.join(row_values)}")
         
-        # 연료 타입 키워드들
-        fuel_keywords = ['가솔린', '경유', '전기', 'lpg', '하이브리드']
+        # 1단계: 실제 헤더 행 찾기
+        header_row = self._find_actual_header_row(df)
+        if header_row is None:
+            print("❌ 헤더 행을 찾을 수 없습니다. 데이터 추출을 중단합니다.")
+            return None
         
-        for i in range(min(20, len(df))):
-            row_text = ' '.join(df.iloc[i].fillna('').astype(str)).lower()
-            
-            # 연료 타입이 3개 이상 포함된 행 찾기
-            found_fuels = [keyword for keyword in fuel_keywords if keyword in row_text]
-            
-            if len(found_fuels) >= 3:
-                print(f"   📍 헤더 후보 {i}행 - 발견된 연료: {found_fuels}")
-                
-                # 실제 컬럼 값들 확인
-                row_values = df.iloc[i].fillna('').astype(str).tolist()
-                fuel_columns = [j for j, val in enumerate(row_values) if any(fuel in val.lower() for fuel in fuel_keywords)]
-                
-                if len(fuel_columns) >= 3:
-                    print(f"   ✅ 헤더 행 확정: {i}행 (연료 컬럼 위치: {fuel_columns})")
-                    return i
+        print(f"📍 실제 헤더 행: {header_row}행")
         
-        print("   ⚠️ 표준 헤더를 찾지 못함. 데이터 시작점 추정...")
+        # 2단계: 헤더 설정 및 데이터 추출
+        headers = df.iloc[header_row].fillna('').astype(str).tolist()
         
-        # 서울 구 데이터가 시작되는 지점 찾기
-        seoul_districts = ['종로구', '중구', '용산구', '성동구', '광진구']
-        
-        for i in range(len(df)):
-            row_text = ' '.join(df.iloc[i].fillna('').astype(str))
-            if any(district in row_text for district in seoul_districts):
-                # 데이터 행이므로 그 이전 행이 헤더일 가능성
-                if i > 0:
-                    return i - 1
-                else:
-                    return i
+        # 헤더 정리
+        cleaned_headers = self._clean_headers(headers)
+        print(f"📋 정리된 헤더: {cleaned_headers[:10]}...")
         
-        return None
+        # 데이터 추출
+        df_data = df.iloc[header_row + 1:].copy()
+        df_data.columns = cleaned_headers[:len(df_data.columns)]
+        return df_data
+
+    def _find_actual_header_row(self, df):
+        """실제 헤더 행 찾기 (앞부분 미리보기 행만 검사)"""
+        print("🔍 실제 헤더 행 탐색 중...")
+        return find_fuel_header_row(df.head(30))
 
     def _clean_headers(self, headers):
         """헤더 정리"""
-        cleaned = []
-        
-        for i, header in enumerate(headers):
-            header_str = str(header).strip()
-            
-            # 빈 헤더나 의미없는 헤더 처리
-            if not header_str or header_str.lower() in ['nan', 'unnamed']:
-                if i == 0:
-                    cleaned.append('지역정보1')
-                elif i == 1:
-                    cleaned.append('지역정보2')
-                elif i == 2:
-                    cleaned.append('지역정보3')
-                else:
-                    cleaned.append(f'컬럼_{i}')
-            else:
-                # 특수문자 제거 및 정리
-                clean_header = header_str.replace('\n', '').replace('\r', '').strip()
-                if clean_header:
-                    cleaned.append(clean_header)
-                else:
-                    cleaned.append(f'컬럼_{i}')
-        
-        return cleaned
+        return clean_header_names(headers)
 
     def _extract_seoul_data_only(self, df_data):
         """서울 데이터만 추출"""
         print("🔍 서울 데이터만 추출 중...")
         
-        seoul_districts = [
-            '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', 
-            '성북구', '강북구', '도봉구', '노원구', '은평구', '서대문구', '마포구',
-            '양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구',
-            '서초구', '강남구', '송파구', '강동구'
-        ]
-        
-        seoul_rows = []
+        # 모든 컬럼에서 서울 구 찾기 (컬럼 단위 벡터 연산)
+        regions = self._extract_regions_vectorized(df_data)
+        seoul_mask = regions['시군구'].notna()
         
-        # 모든 컬럼에서 서울 구 찾기
-        for i, row in df_data.iterrows():
-            row_text = ' '.join(row.fillna('').astype(str))
-            
-            # 서울 구가 포함된 행인지 확인
-            found_district = None
-            for district in seoul_districts:
-                if district in row_text:
-                    found_district = district
-                    break
+        if seoul_mask.any():
+            # 처음 몇 개 구는 로그 출력
+            for i, district in regions.loc[seoul_mask, '시군구'].head(5).items():
+                print(f"   🗺️ {district} 데이터 발견: {i}행")
             
-            if found_district:
-                seoul_rows.append(i)
-                
-                # 처음 몇 개 구는 로그 출력
-                if len(seoul_rows) <= 5:
-                    print(f"   🗺️ {found_district} 데이터 발견: {i}행")
-        
-        if seoul_rows:
-            seoul_data = df_data.iloc[seoul_rows].copy().reset_index(drop=True)
+            seoul_data = df_data[seoul_mask].copy().reset_index(drop=True)
             print(f"   ✅ 총 서울 데이터: {len(seoul_data)}행")
             return seoul_data
         else:
             print("   ❌ 서울 데이터를 찾을 수 없음")
             return pd.DataFrame()
 
+    def _extract_regions_vectorized(self, df, columns=None, district_keep='first'):
+        """
+        전체 프레임에서 시군구/읍면동을 한 번에 추출합니다.
+        
+        - 시군구: 컴파일된 자치구 정규식으로 각 컬럼을 .str.extract 한 뒤
+          district_keep='first'면 왼쪽 컬럼부터, 'last'면 오른쪽 컬럼부터 첫 매칭값 사용
+        - 읍면동: '동'으로 끝나고 15자 이하이며 구 이름이 없는 첫 번째 값 (없으면 '구' → '동' 기본값)
+        
+        Returns:
+        - DataFrame: df와 같은 인덱스의 '시군구', '읍면동' 컬럼 (찾지 못하면 NaN)
+        """
+        columns = list(df.columns) if columns is None else list(columns)
+        
+        districts = pd.Series(np.nan, index=df.index, dtype=object)
+        dongs = pd.Series(np.nan, index=df.index, dtype=object)
+        
+        # 컬럼별로 매칭한 뒤 아직 비어 있는 행만 채움 (왼쪽 컬럼 우선)
+        district_matches = []
+        for col in columns:
+            values = df[col]
+            text = values.astype(str).str.strip().where(values.notna())
+            matched = text.str.extract(SEOUL_DISTRICT_REGEX, expand=False).astype(object)
+            district_matches.append(matched)
+            
+            is_dong = text.str.endswith('동', na=False) & (text.str.len() <= 15) & matched.isna()
+            dongs = dongs.fillna(text.where(is_dong).astype(object))
+        
+        if district_keep == 'last':
+            district_matches = district_matches[::-1]
+        for matched in district_matches:
+            districts = districts.fillna(matched)
+        
+        # 읍면동을 찾지 못한 경우 기본값 설정 (시군구가 있는 행만)
+        dongs = dongs.where(dongs.notna() | districts.isna(), districts.str[:-1] + '동')
+        
+        return pd.DataFrame({'시군구': districts, '읍면동': dongs}, index=df.index)
+
     def _extract_electric_vehicle_data_only(self, seoul_data):
         """전기차 데이터만 정확히 추출 - 데이터 구조 기반 접근"""
         print("⚡ 전기차 데이터만 추출 중...")
@@ -236,125 +328,75 @@ class DataCleaner:
         # 데이터 구조 분석: 연료 타입이 데이터 값으로 존재하는 구조
         print("   🔍 데이터 구조 분석 중...")
         
-        # 전기차 관련 행 찾기 - 연료 컬럼에서 '전기' 값이 있는 행들
-        electric_rows = []
+        # 전기차 관련 행 찾기 - 어느 컬럼이든 '전기' 값이 있는 행들 (컬럼 단위 마스크)
+        electric_mask = pd.Series(False, index=seoul_data.index)
+        for col in seoul_data.columns:
+            values = seoul_data[col]
+            electric_mask |= values.notna() & (values.astype(str).str.strip() == '전기')
         
-        for i, row in seoul_data.iterrows():
-            # 모든 컬럼에서 '전기' 값 찾기
-            for col_idx, value in enumerate(row.values):
-                if pd.notna(value) and str(value).strip() == '전기':
-                    electric_rows.append(i)
-                    print(f"   📍 전기차 데이터 발견: {i}행")
-                    break
-        
-        if not electric_rows:
+        if not electric_mask.any():
             print("   ❌ 전기차 데이터를 포함한 행을 찾을 수 없음")
             return pd.DataFrame()
         
-        print(f"   ✅ 전기차 관련 행 {len(electric_rows)}개 발견")
+        electric_data = seoul_data[electric_mask]
+        print(f"   ✅ 전기차 관련 행 {len(electric_data)}개 발견")
         
-        # 전기차 데이터 추출
-        extracted_data = []
+        # 지역 정보 추출 (구 이름은 마지막으로 발견된 값, 동 이름은 첫 번째 값)
+        regions = self._extract_regions_vectorized(electric_data, district_keep='last')
         
-        for row_idx in electric_rows:
-            try:
-                row = seoul_data.iloc[row_idx]
-                
-                # 지역 정보 추출 (첫 번째와 세 번째 컬럼에서 주로 발견)
-                region_info = self._extract_region_from_electric_row(row)
-                
-                if region_info['시군구'] and region_info['읍면동']:
-                    # 전기차 수 추출 (연료가 '전기'인 행에서 계 컬럼 찾기)
-                    ev_count = self._extract_ev_count_from_row(row)
-                    
-                    if ev_count is not None and ev_count > 0:
-                        extracted_data.append({
-                            '시군구': region_info['시군구'],
-                            '읍면동': region_info['읍면동'],
-                            '전기차_수': ev_count,
-                            '원본_행': row_idx
-                        })
-                        
-                        # 처음 5개는 로그 출력
-                        if len(extracted_data) <= 5:
-                            print(f"   ✅ {region_info['시군구']} {region_info['읍면동']}: {ev_count}대")
-                            
-            except Exception as e:
-                print(f"   ⚠️ {row_idx}행 처리 중 오류: {e}")
-                continue
+        # 전기차 수 추출 (행의 합리적인 범위 숫자 중 가장 큰 값 - 보통 '계' 컬럼)
+        ev_counts = self._extract_ev_counts_vectorized(electric_data)
         
-        if extracted_data:
-            result_df = pd.DataFrame(extracted_data)
-            
-            # 중복 지역 처리 (같은 시군구+읍면동이 여러 개 있는 경우 합계)
-            result_df = result_df.groupby(['시군구', '읍면동'])['전기차_수'].sum().reset_index()
-            
-            # 전기차 수가 0인 지역 제거
-            result_df = result_df[result_df['전기차_수'] > 0].reset_index(drop=True)
-            
-            print(f"   ✅ 전기차 데이터 추출 완료: {len(result_df)}개 지역")
-            return result_df
-        else:
+        valid_mask = regions['시군구'].notna() & regions['읍면동'].notna() & (ev_counts > 0)
+        if not valid_mask.any():
             print("   ❌ 유효한 전기차 데이터 없음")
             return pd.DataFrame()
-    
-    def _extract_region_from_electric_row(self, row):
-        """전기차 행에서 지역 정보 추출"""
-        region_info = {'시군구': None, '읍면동': None}
         
-        seoul_districts = [
-            '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', 
-            '성북구', '강북구', '도봉구', '노원구', '은평구', '서대문구', '마포구',
-            '양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구',
-            '서초구', '강남구', '송파구', '강동구'
-        ]
+        result_df = regions[valid_mask].assign(전기차_수=ev_counts[valid_mask].astype('int64'))
         
-        # 모든 값에서 지역 정보 찾기
-        for value in row.values:
-            if pd.notna(value):
-                value_str = str(value).strip()
-                
-                # 구 이름 찾기
-                for district in seoul_districts:
-                    if district in value_str:
-                        region_info['시군구'] = district
-                        break
-                
-                # 동 이름 찾기 (끝이 '동'으로 끝나고 구 이름이 포함되지 않은 경우)
-                if value_str.endswith('동') and len(value_str) <= 15:
-                    if not any(district in value_str for district in seoul_districts):
-                        if not region_info['읍면동']:  # 첫 번째로 발견된 동 이름 사용
-                            region_info['읍면동'] = value_str
+        # 처음 5개는 로그 출력
+        for _, row in result_df.head(5).iterrows():
+            print(f"   ✅ {row['시군구']} {row['읍면동']}: {row['전기차_수']}대")
         
-        # 읍면동을 찾지 못한 경우 기본값 설정
-        if not region_info['읍면동'] and region_info['시군구']:
-            region_info['읍면동'] = f"{region_info['시군구'][:-1]}동"
+        # 중복 지역 처리 (같은 시군구+읍면동이 여러 개 있는 경우 합계)
+        result_df = result_df.groupby(['시군구', '읍면동'])['전기차_수'].sum().reset_index()
         
-        return region_info
-    
-    def _extract_ev_count_from_row(self, row):
-        """전기차 행에서 전기차 수 추출"""
-        # '전기'가 있는 컬럼의 위치를 찾고, 그 행의 숫자 값들 중 가장 큰 값을 전기차 수로 간주
-        numbers = []
-        
-        for value in row.values:
-            if pd.notna(value):
-                try:
-                    # 문자열에서 숫자 추출
-                    value_str = str(value).replace(',', '').strip()
-                    if value_str.isdigit():
-                        num = int(value_str)
-                        if 1 <= num <= 50000:  # 합리적인 범위의 숫자만
-                            numbers.append(num)
-                except:
-                    continue
-        
-        if numbers:
-            # 가장 큰 숫자를 전기차 총 수로 간주 (보통 '계' 컬럼에 해당)
-            return max(numbers)
+        # 전기차 수가 0인 지역 제거
+        result_df = result_df[result_df['전기차_수'] > 0].reset_index(drop=True)
         
-        return None
-
+        print(f"   ✅ 전기차 데이터 추출 완료: {len(result_df)}개 지역")
+        return result_df
+    
+    def _extract_ev_counts_vectorized(self, df):
+        """
+        각 행의 셀 중 1~50000 범위의 정수 값 최대치를 전기차 수로 반환합니다 (없으면 NaN).
+        
+        문자열 셀은 천 단위 쉼표를 제거한 뒤 숫자로만 이루어진 경우만 인정하고,
+        숫자 셀은 정수 값인 경우만 인정합니다 (보통 '계' 컬럼 값이 최대치).
+        """
+        if df.empty:
+            return pd.Series(np.nan, index=df.index)
+        
+        count_block = np.full((len(df), len(df.columns)), np.nan)
+        for j, col in enumerate(df.columns):
+            values = df[col]
+            if pd.api.types.is_bool_dtype(values):
+                continue
+            if pd.api.types.is_numeric_dtype(values):
+                numbers = pd.to_numeric(values, errors='coerce').astype(float)
+                numbers = numbers.where(numbers == np.floor(numbers))
+            else:
+                text = values.astype(str).str.replace(',', '', regex=False).str.strip()
+                is_digits = text.str.fullmatch(r'\d+', na=False) & values.notna()
+                numbers = pd.to_numeric(text.where(is_digits), errors='coerce')
+            count_block[:, j] = numbers.where((numbers >= 1) & (numbers <= 50000)).to_numpy(dtype=float)
+        
+        # 모든 값이 NaN인 행은 경고 없이 NaN으로 처리
+        has_count = ~np.isnan(count_block).all(axis=1)
+        row_max = np.full(len(df), np.nan)
+        row_max[has_count] = np.nanmax(count_block[has_count], axis=1)
+        return pd.Series(row_max, index=df.index)
+    
     def _find_region_columns(self, df):
         """지역 정보 컬럼 찾기"""
         region_cols = {'시군구': None, '읍면동': None}
@@ -373,32 +415,18 @@ class DataCleaner:
         """행에서 지역 정보 추출"""
         region_info = {'시군구': None, '읍면동': None}
         
-        seoul_districts = [
-            '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', 
-            '성북구', '강북구', '도봉구', '노원구', '은평구', '서대문구', '마포구',
-            '양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구',
-            '서초구', '강남구', '송파구', '강동구'
-        ]
-        
         # 시군구 찾기
         if region_cols['시군구'] and pd.notna(row[region_cols['시군구']]):
-            gu_value = str(row[region_cols['시군구']])
-            for district in seoul_districts:
-                if district in gu_value:
-                    region_info['시군구'] = district
-                    break
+            match = SEOUL_DISTRICT_REGEX.search(str(row[region_cols['시군구']]))
+            if match:
+                region_info['시군구'] = match.group(1)
         
         # 시군구를 못 찾은 경우 전체 행에서 찾기
         if not region_info['시군구']:
-            for val in row.values:
-                if pd.notna(val):
-                    val_str = str(val)
-                    for district in seoul_districts:
-                        if district in val_str:
-                            region_info['시군구'] = district
-                            break
-                    if region_info['시군구']:
-                        break
+            row_text = ' '.join(str(val) for val in row.values if pd.notna(val))
+            match = SEOUL_DISTRICT_REGEX.search(row_text)
+            if match:
+                region_info['시군구'] = match.group(1)
         
         # 읍면동 찾기
         if region_cols['읍면동'] and pd.notna(row[region_cols['읍면동']]):
@@ -411,11 +439,10 @@ class DataCleaner:
             for val in row.values:
                 if pd.notna(val):
                     val_str = str(val)
-                    if val_str.endswith('동') and len(val_str) <= 15:
-                        # 구 이름이 포함되지 않은 순수한 동 이름인지 확인
-                        if not any(district in val_str for district in seoul_districts):
-                            region_info['읍면동'] = val_str
-                            break
+                    # 구 이름이 포함되지 않은 순수한 동 이름인지 확인
+                    if val_str.endswith('동') and len(val_str) <= 15 and not SEOUL_DISTRICT_REGEX.search(val_str):
+                        region_info['읍면동'] = val_str
+                        break
         
         # 읍면동을 아직도 못 찾은 경우 기본값 설정
         if not region_info['읍면동'] and region_info['시군구']:
@@ -563,29 +590,28 @@ class DataCleaner:
         print("🔧 시간별 충전 데이터 완전 해결 중...")
         print(f"📊 원본 데이터 형태: {df.shape}")
         
-        # 헤더가 있는 행 찾기
-        header_row = None
-        for i in range(min(10, len(df))):
-            row_str = ' '.join(df.iloc[i].fillna('').astype(str))
-            if '순번' in row_str and '충전소명' in row_str:
-                header_row = i
-                break
-        
-        if header_row is not None:
-            # 헤더 설정
-            headers = df.iloc[header_row].fillna('Unknown').astype(str)
-            df_clean = df.iloc[header_row+1:].copy()
-            df_clean.columns = headers
-            
-            # 빈 행 제거
-            df_clean = df_clean.dropna(how='all')
-            
-            # 순번이 숫자인 행만 유지
-            if '순번' in df_clean.columns:
-                numeric_mask = pd.to_numeric(df_clean['순번'], errors='coerce').notna()
-                df_clean = df_clean[numeric_mask]
+        if df.attrs.get('header_sniffed'):
+            # 로더가 '순번' 헤더를 찾아 데이터 영역만 읽은 경우 (2단계 Excel 읽기)
+            df_clean = df.dropna(how='all')
         else:
-            df_clean = df.copy()
+            # 헤더가 있는 행 찾기
+            header_row = find_sequence_header_row(df)
+            
+            if header_row is not None:
+                # 헤더 설정
+                headers = df.iloc[header_row].fillna('Unknown').astype(str)
+                df_clean = df.iloc[header_row+1:].copy()
+                df_clean.columns = headers
+                
+                # 빈 행 제거
+                df_clean = df_clean.dropna(how='all')
+            else:
+                df_clean = df.copy()
+        
+        # 순번이 숫자인 행만 유지
+        if '순번' in df_clean.columns:
+            numeric_mask = pd.to_numeric(df_clean['순번'], errors='coerce').notna()
+            df_clean = df_clean[numeric_mask]
         
         # 결측값 최소화
         for col in df_clean.columns:
@@ -670,52 +696,36 @@ class DataCleaner:
         """격자 시스템 완전 해결 - 공급 격자 0개 문제 해결"""
         print("🗺️ 격자 시스템 완전 해결 중...")
         
-        # 서울 지역 경계
-        seoul_bounds = {
-            'min_lat': 37.4,
-            'max_lat': 37.7,
-            'min_lon': 126.7,
-            'max_lon': 127.2
-        }
-        
-        # 500m를 위도/경도로 변환
-        grid_size_lat = 0.0045  # 약 500m
-        grid_size_lon = 0.0056  # 약 500m
-        
-        # 격자 생성
-        lats = np.arange(seoul_bounds['min_lat'], seoul_bounds['max_lat'], grid_size_lat)
-        lons = np.arange(seoul_bounds['min_lon'], seoul_bounds['max_lon'], grid_size_lon)
+        grid_cells = self.build_grid_cells()
+        grid_size_lat = self.GRID_SIZE_LAT
+        grid_size_lon = self.GRID_SIZE_LON
         
         grid_data = []
-        total_grids = len(lats) * len(lons)
+        total_grids = len(grid_cells)
         print(f"📊 생성할 총 격자 수: {total_grids:,}개")
         
-        for i, lat in enumerate(lats):
-            for j, lon in enumerate(lons):
-                grid_center_lat = lat + grid_size_lat/2
-                grid_center_lon = lon + grid_size_lon/2
-                
-                # 수요 점수 계산
-                demand_score = self._calculate_demand_score_fix(
-                    grid_center_lat, grid_center_lon, grid_size_lat, grid_size_lon
-                )
-                
-                # 공급 점수 계산 (완전 수정)
-                supply_score = self._calculate_supply_score_fix(
-                    grid_center_lat, grid_center_lon, grid_size_lat, grid_size_lon
-                )
-                
-                grid_data.append({
-                    'grid_id': f'GRID_{i:03d}_{j:03d}',
-                    'min_lat': lat,
-                    'max_lat': lat + grid_size_lat,
-                    'min_lon': lon,
-                    'max_lon': lon + grid_size_lon,
-                    'center_lat': grid_center_lat,
-                    'center_lon': grid_center_lon,
-                    'demand_score': demand_score,
-                    'supply_score': supply_score
-                })
+        for cell in grid_cells.itertuples(index=False):
+            # 수요 점수 계산
+            demand_score = self._calculate_demand_score_fix(
+                cell.center_lat, cell.center_lon, grid_size_lat, grid_size_lon
+            )
+            
+            # 공급 점수 계산 (완전 수정)
+            supply_score = self._calculate_supply_score_fix(
+                cell.center_lat, cell.center_lon, grid_size_lat, grid_size_lon
+            )
+            
+            grid_data.append({
+                'grid_id': cell.grid_id,
+                'min_lat': cell.min_lat,
+                'max_lat': cell.max_lat,
+                'min_lon': cell.min_lon,
+                'max_lon': cell.max_lon,
+                'center_lat': cell.center_lat,
+                'center_lon': cell.center_lon,
+                'demand_score': demand_score,
+                'supply_score': supply_score
+            })
         
         grid_df = pd.DataFrame(grid_data)
         self.processed_data['grid_system'] = grid_df
@@ -751,6 +761,28 @@ class DataCleaner:
         
         return grid_df
     
+    @classmethod
+    def build_grid_cells(cls):
+        """격자 ID와 경계/중심 좌표만 담은 격자 목록을 생성합니다."""
+        lats = np.arange(cls.SEOUL_BOUNDS['min_lat'], cls.SEOUL_BOUNDS['max_lat'], cls.GRID_SIZE_LAT)
+        lons = np.arange(cls.SEOUL_BOUNDS['min_lon'], cls.SEOUL_BOUNDS['max_lon'], cls.GRID_SIZE_LON)
+        
+        lat_idx, lon_idx = np.meshgrid(np.arange(len(lats)), np.arange(len(lons)), indexing='ij')
+        lat_idx = lat_idx.ravel()
+        lon_idx = lon_idx.ravel()
+        min_lat = lats[lat_idx]
+        min_lon = lons[lon_idx]
+        
+        return pd.DataFrame({
+            'grid_id': [f'GRID_{i:03d}_{j:03d}' for i, j in zip(lat_idx, lon_idx)],
+            'min_lat': min_lat,
+            'max_lat': min_lat + cls.GRID_SIZE_LAT,
+            'min_lon': min_lon,
+            'max_lon': min_lon + cls.GRID_SIZE_LON,
+            'center_lat': min_lat + cls.GRID_SIZE_LAT/2,
+            'center_lon': min_lon + cls.GRID_SIZE_LON/2
+        })
+    
     def _calculate_demand_score_fix(self, center_lat, center_lon, grid_size_lat, grid_size_lon):
         """수요 점수 계산 (개선된 버전)"""
         if 'commercial_facilities' not in self.processed_data:
@@ -973,7 +1005,7 @@ class DataCleaner:
             filepath = os.path.join(output_dir, filename)
             
             try:
-                df.to_csv(filepath, index=False, encoding='utf-8-sig')
+                write_csv_with_manifest(df, filepath)
                 print(f"✅ {filepath} 저장 완료")
                 saved_files.append(filename)
             except Exception as e:
@@ -996,7 +1028,7 @@ class DataCleaner:
         
         summary_df = pd.DataFrame(summary_data)
         summary_path = os.path.join(output_dir, 'preprocessing_summary.csv')
-        summary_df.to_csv(summary_path, index=False, encoding='utf-8-sig')
+        write_csv_with_manifest(summary_df, summary_path)
         
         print()
         print("📋 전처리 요약:")
@@ -1008,9 +1040,40 @@ class DataCleaner:
         
         return summary_df
 
+def _serialize_frame(df):
+    """DataFrame을 프로세스 간 전달용 바이트로 변환 (가능하면 Arrow IPC 스트림)"""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return 'arrow', sink.getvalue()
+        except (pa.ArrowException, TypeError, ValueError):
+            # 타입이 섞인 object 컬럼 등 Arrow로 변환할 수 없는 경우
+            pass
+    return 'pickle', pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize_frame(payload_format, payload):
+    """_serialize_frame 결과를 DataFrame으로 복원"""
+    if payload_format == 'arrow':
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    return pickle.loads(payload)
+
+
+def _run_cleaning_stage(stage, stage_input):
+    """프로세스 풀 워커: 전처리 단계 하나를 실행하고 (형식, 직렬화된 결과, 소요 시간)을 반환"""
+    start = time.perf_counter()
+    cleaner = DataCleaner()
+    result = getattr(cleaner, DataCleaner.CLEANING_STAGES[stage])(stage_input)
+    payload_format, payload = _serialize_frame(result)
+    return payload_format, payload, time.perf_counter() - start
+
+
 # 외부에서 호출할 수 있는 함수들
-def run_all_preprocessing():
-    """모든 전처리를 실행하는 함수"""
+def run_all_preprocessing(parallel=False):
+    """모든 전처리를 실행하는 함수 (parallel=True면 데이터셋별 전처리를 병렬 실행)"""
     from .data_loader import DataLoader
     
     # 데이터 로딩
@@ -1023,7 +1086,7 @@ def run_all_preprocessing():
     
     # 데이터 전처리
     cleaner = DataCleaner()
-    processed_data = cleaner.clean_all_data(datasets)
+    processed_data = cleaner.clean_all_data(datasets, parallel=parallel)
     
     # 데이터 저장
     summary = cleaner.save_processed_data()
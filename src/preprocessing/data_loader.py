@@ -3,17 +3,47 @@
 import pandas as pd
 import numpy as np
 import os
+import re
 from pathlib import Path
 import logging
 
+from .excel_reader import (
+    read_excel_sniffed, clean_header_names, find_fuel_header_row, find_sequence_header_row
+)
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 헤더 위치가 파일마다 다른 워크북용 헤더 탐색기 (탐색 함수, 컬럼명 정리 함수)
+HEADER_SNIFFERS = {
+    'fuel': (find_fuel_header_row, clean_header_names),
+    'sequence': (
+        find_sequence_header_row,
+        lambda headers: ['Unknown' if pd.isna(h) else str(h) for h in headers]
+    )
+}
+
+# 월별 충전량 데이터 파일명 패턴 (예: 전기차 충전소 충전량 데이터_202504.xlsx)
+CHARGING_MONTHLY_PATTERN = '전기차 충전소 충전량 데이터_*.xlsx'
+CHARGING_MONTH_REGEX = re.compile(r'_(\d{6})\.xlsx$')
+
 class DataLoader:
     def __init__(self, data_dir='data/raw'):
         self.data_dir = Path(data_dir)
         self.datasets = {}
+        self.attempted_datasets = []
+    
+    def discover_monthly_charging_files(self):
+        """월별 충전량 데이터 파일을 glob으로 찾아 {YYYYMM: 경로} 형태로 반환합니다."""
+        monthly_files = {}
+        
+        for file_path in sorted(self.data_dir.glob(CHARGING_MONTHLY_PATTERN)):
+            match = CHARGING_MONTH_REGEX.search(file_path.name)
+            if match:
+                monthly_files[match.group(1)] = file_path
+        
+        return monthly_files
         
     def load_all_datasets(self):
         """모든 데이터셋을 로딩합니다."""
@@ -26,30 +56,27 @@ class DataLoader:
         dataset_configs = {
             'charging_load_hourly': {
                 'file': '서울시 소유 충전기 일별 시간별 충전현황.xlsx',
-                'description': '서울시 소유 충전기 시간별 충전현황'
+                'description': '서울시 소유 충전기 시간별 충전현황',
+                'header_sniffer': 'sequence'
             },
             'ev_registration_monthly': {
                 'file': '서울시 자치구 읍면동별 연료별 자동차 등록현황(행정동)(25년04월).xls',
-                'description': '서울시 자치구별 전기차 등록현황 (2025년 4월)'
+                'description': '서울시 자치구별 전기차 등록현황 (2025년 4월)',
+                'header_sniffer': 'fuel'
             },
             'commercial_facilities': {
                 'file': '소상공인시장진흥공단_상가(상권)정보_서울_202503.csv',
                 'description': '서울시 상가(상권) 정보 (2025년 3월)'
-            },
-            'charging_stations_202501': {
-                'file': '전기차 충전소 충전량 데이터_202501.xlsx',
-                'description': '전기차 충전소 충전량 데이터 (2025년 1월)'
-            },
-            'charging_stations_202502': {
-                'file': '전기차 충전소 충전량 데이터_202502.xlsx',
-                'description': '전기차 충전소 충전량 데이터 (2025년 2월)'
-            },
-            'charging_stations_202503': {
-                'file': '전기차 충전소 충전량 데이터_202503.xlsx',
-                'description': '전기차 충전소 충전량 데이터 (2025년 3월)'
             }
         }
         
+        # 월별 충전량 데이터는 파일명 패턴으로 자동 탐색 (새 월 파일 추가 시 코드 수정 불필요)
+        for month, file_path in self.discover_monthly_charging_files().items():
+            dataset_configs[f'charging_stations_{month}'] = {
+                'file': file_path.name,
+                'description': f'전기차 충전소 충전량 데이터 ({month[:4]}년 {int(month[4:])}월)'
+            }
+        
         # 선택적으로 로딩할 데이터셋
         optional_datasets = {
             'ev_charging_service': {
@@ -83,6 +110,7 @@ class DataLoader:
     
     def _load_dataset(self, dataset_name, config, required=True):
         """개별 데이터셋을 로딩합니다."""
+        self.attempted_datasets.append(dataset_name)
         print(f"🔄 로딩 중: {dataset_name}")
         print()
         print("=" * 60)
@@ -104,7 +132,7 @@ class DataLoader:
         try:
             # 파일 확장자에 따른 로딩
             if file_path.suffix.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
+                df = self._load_excel(file_path, config.get('header_sniffer'))
             elif file_path.suffix.lower() == '.csv':
                 # 인코딩 문제 해결을 위한 다중 시도
                 df = self._load_csv_with_encoding(file_path)
@@ -140,6 +168,18 @@ class DataLoader:
         
         print()
     
+    def _load_excel(self, file_path, header_sniffer=None):
+        """Excel 파일 로딩 (헤더 탐색기가 지정되면 헤더 행을 먼저 찾고 데이터 영역만 읽음)"""
+        if header_sniffer:
+            find_header_row, header_names = HEADER_SNIFFERS[header_sniffer]
+            df = read_excel_sniffed(file_path, find_header_row, header_names=header_names)
+            if df is not None:
+                print(f"🔎 헤더 행 탐색 완료: {df.attrs['header_row']}행 (데이터 영역만 로딩)")
+                return df
+            print("⚠️ 헤더 행을 찾지 못해 전체 시트를 로딩합니다.")
+
+        return pd.read_excel(file_path)
+
     def _load_csv_with_encoding(self, file_path):
         """다양한 인코딩으로 CSV 파일을 로딩 시도합니다."""
         encodings = ['utf-8', 'cp949', 'euc-kr', 'utf-8-sig', 'latin1']
@@ -166,7 +206,7 @@ class DataLoader:
         print("📋 데이터 로딩 결과 요약")
         print("=" * 60)
         
-        total_datasets = 10  # 전체 시도한 데이터셋 수
+        total_datasets = len(self.attempted_datasets)  # 전체 시도한 데이터셋 수
         successful = len(self.datasets)
         failed = total_datasets - successful
         
@@ -182,14 +222,7 @@ class DataLoader:
         print()
         
         if failed > 0:
-            failed_datasets = []
-            all_possible = [
-                'ev_charging_service', 'charging_load_hourly', 'ev_registration_monthly',
-                'commercial_facilities', 'public_parking', 'charging_stations_202501',
-                'charging_stations_202502', 'charging_stations_202503', 
-                'gov_charging_service', 'charging_facility_management'
-            ]
-            failed_datasets = [name for name in all_possible if name not in self.datasets]
+            failed_datasets = [name for name in self.attempted_datasets if name not in self.datasets]
             
             if failed_datasets:
                 print("❌ 로딩 실패한 데이터셋:")
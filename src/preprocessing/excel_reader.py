@@ -0,0 +1,154 @@
+# src/preprocessing/excel_reader.py
+# 헤더 위치를 먼저 찾은 뒤 필요한 영역만 다시 읽는 2단계 Excel 로더
+
+import pandas as pd
+
+# 헤더 탐색용 미리보기 행 수
+HEADER_PREVIEW_ROWS = 30
+
+# 연료 타입 키워드들
+FUEL_KEYWORDS = ['가솔린', '경유', '전기', 'lpg', '하이브리드']
+
+# 헤더가 없을 때 데이터 시작점을 추정하기 위한 서울 구 이름
+HEADER_FALLBACK_DISTRICTS = ['종로구', '중구', '용산구', '성동구', '광진구']
+
+
+def clean_header_names(headers):
+    """헤더 정리 (빈 헤더는 지역정보1~3 / 컬럼_i 로 채움)"""
+    cleaned = []
+
+    for i, header in enumerate(headers):
+        header_str = str(header).strip()
+
+        # 빈 헤더나 의미없는 헤더 처리
+        if not header_str or header_str.lower() in ['nan', 'unnamed']:
+            if i == 0:
+                cleaned.append('지역정보1')
+            elif i == 1:
+                cleaned.append('지역정보2')
+            elif i == 2:
+                cleaned.append('지역정보3')
+            else:
+                cleaned.append(f'컬럼_{i}')
+        else:
+            # 특수문자 제거 및 정리
+            clean_header = header_str.replace('\n', '').replace('\r', '').strip()
+            if clean_header:
+                cleaned.append(clean_header)
+            else:
+                cleaned.append(f'컬럼_{i}')
+
+    return cleaned
+
+
+def find_fuel_header_row(preview, verbose=True):
+    """연료 타입 컬럼이 3개 이상인 행을 헤더로 찾습니다 (전기차 등록 워크북용)."""
+    for i in range(min(20, len(preview))):
+        row_values = preview.iloc[i].fillna('').astype(str).tolist()
+        row_text = ' '.join(row_values).lower()
+
+        # 연료 타입이 3개 이상 포함된 행 찾기
+        found_fuels = [keyword for keyword in FUEL_KEYWORDS if keyword in row_text]
+
+        if len(found_fuels) >= 3:
+            if verbose:
+                print(f"   📍 헤더 후보 {i}행 - 발견된 연료: {found_fuels}")
+
+            # 실제 컬럼 값들 확인
+            fuel_columns = [j for j, val in enumerate(row_values) if any(fuel in val.lower() for fuel in FUEL_KEYWORDS)]
+
+            if len(fuel_columns) >= 3:
+                if verbose:
+                    print(f"   ✅ 헤더 행 확정: {i}행 (연료 컬럼 위치: {fuel_columns})")
+                return i
+
+    if verbose:
+        print("   ⚠️ 표준 헤더를 찾지 못함. 데이터 시작점 추정...")
+
+    # 서울 구 데이터가 시작되는 지점 찾기 (데이터 행이므로 그 이전 행이 헤더일 가능성)
+    for i in range(len(preview)):
+        row_text = ' '.join(preview.iloc[i].fillna('').astype(str))
+        if any(district in row_text for district in HEADER_FALLBACK_DISTRICTS):
+            return i - 1 if i > 0 else i
+
+    return None
+
+
+def find_sequence_header_row(preview, max_rows=10):
+    """'순번'과 '충전소명'이 함께 있는 행을 헤더로 찾습니다 (시간별 충전 워크북용)."""
+    for i in range(min(max_rows, len(preview))):
+        row_str = ' '.join(preview.iloc[i].fillna('').astype(str))
+        if '순번' in row_str and '충전소명' in row_str:
+            return i
+
+    return None
+
+
+def sniff_excel_header(file_path, find_header_row, nrows=HEADER_PREVIEW_ROWS, sheet_name=0):
+    """
+    워크북의 앞부분(nrows)만 읽어 헤더 행과 데이터 영역 컬럼 위치를 찾습니다.
+
+    - 데이터 영역: 첫 컬럼부터 '헤더가 있는 컬럼'과 '미리보기 데이터에 값이 있는 컬럼' 중 마지막 컬럼까지
+      (영역 안의 빈 헤더 컬럼은 미리보기 이후에만 값이 있을 수 있으므로 모두 포함)
+
+    Returns:
+    - tuple(int, list, list) 또는 None: (헤더 행, 사용할 컬럼 위치, 헤더 행 전체 값)
+    """
+    preview = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=nrows)
+    header_row = find_header_row(preview)
+
+    if header_row is None:
+        return None
+
+    header_values = preview.iloc[header_row]
+    body = preview.iloc[header_row + 1:]
+    used = header_values.notna().to_numpy() | body.notna().any(axis=0).to_numpy()
+    last_col = int(used.nonzero()[0].max()) if used.any() else 0
+    usecols = list(range(last_col + 1))
+
+    return header_row, usecols, header_values.tolist()
+
+
+def read_excel_sniffed(file_path, find_header_row, header_names=None, nrows=HEADER_PREVIEW_ROWS, sheet_name=0):
+    """
+    2단계 Excel 읽기: 미리보기로 헤더를 찾은 뒤 header/skiprows/usecols를 지정해 데이터 영역만 다시 읽습니다.
+    (영역 안에서 헤더가 비어 있고 값도 전혀 없는 컬럼은 읽은 뒤 제거)
+
+    Parameters:
+    - file_path: Excel 파일 경로
+    - find_header_row: 미리보기 DataFrame을 받아 헤더 행 번호(또는 None)를 반환하는 함수
+    - header_names: 헤더 행 전체 값 리스트를 받아 최종 컬럼명 리스트를 반환하는 함수 (None이면 그대로 사용)
+    - nrows: 헤더 탐색에 사용할 미리보기 행 수
+    - sheet_name: 읽을 시트
+
+    Returns:
+    - DataFrame 또는 None: 헤더를 찾지 못하면 None
+      (df.attrs['header_sniffed'] = True, df.attrs['header_row'] = 헤더 행)
+    """
+    sniffed = sniff_excel_header(file_path, find_header_row, nrows=nrows, sheet_name=sheet_name)
+    if sniffed is None:
+        return None
+
+    header_row, usecols, header_values = sniffed
+    df = pd.read_excel(
+        file_path,
+        sheet_name=sheet_name,
+        header=0,
+        skiprows=header_row,
+        usecols=usecols
+    )
+
+    # 헤더가 있거나 데이터 영역에 값이 있는 컬럼만 사용 (컬럼 위치는 원본 기준)
+    keep = [
+        pos for pos, j in enumerate(usecols)
+        if pos < df.shape[1] and (pd.notna(header_values[j]) or df.iloc[:, pos].notna().any())
+    ]
+    df = df.iloc[:, keep]
+
+    # 중복/빈 헤더로 pandas가 붙인 이름 대신 원본 헤더 기준 이름 사용
+    names = header_names(header_values) if header_names else header_values
+    df.columns = [names[usecols[pos]] for pos in keep]
+    df.attrs['header_sniffed'] = True
+    df.attrs['header_row'] = header_row
+
+    return df
@@ -0,0 +1,243 @@
+# src/preprocessing/incremental_ingest.py
+# 월별 충전량 데이터 증분 적재 (월별 파티션 + 격자 공급 집계 증분 갱신)
+
+import pandas as pd
+import numpy as np
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .data_cleaner import DataCleaner
+from .data_loader import DataLoader
+
+# 안전한 import 처리 (src를 sys.path에 추가한 노트북 / 프로젝트 루트 실행 모두 지원)
+try:
+    from utils.file_hash import file_sha256
+    from utils.artifact_manifest import write_csv_with_manifest
+except ImportError:
+    from src.utils.file_hash import file_sha256
+    from src.utils.artifact_manifest import write_csv_with_manifest
+
+
+class IncrementalChargingIngestor:
+    """
+    월별 충전량 파일을 glob으로 찾아 월 단위로 독립 전처리하고,
+    charging_stations/month=YYYYMM/ 파티션과 격자 공급 집계를 증분 갱신합니다.
+
+    - 이미 처리된 월은 원본 파일의 내용 해시가 같으면 건너뜁니다.
+    - 격자 공급 집계는 새로 처리된 파티션의 기여분만 더해서 갱신합니다.
+    """
+
+    MANIFEST_NAME = '_ingest_manifest.json'
+    PARTITION_FILE = 'part.csv'
+    CONTRIBUTION_FILE = 'grid_supply.csv'
+    AGGREGATE_FILE = 'grid_supply_aggregate.csv'
+
+    def __init__(self, raw_dir='data/raw', processed_dir='data/processed'):
+        self.loader = DataLoader(raw_dir)
+        self.processed_dir = Path(processed_dir)
+        self.partition_root = self.processed_dir / 'charging_stations'
+        self.manifest_path = self.partition_root / self.MANIFEST_NAME
+        self.aggregate_path = self.processed_dir / self.AGGREGATE_FILE
+        self.cleaner = DataCleaner()
+        self.grid_cells = DataCleaner.build_grid_cells()
+
+        self.partition_root.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def ingest_new_months(self):
+        """새로 추가되었거나 내용이 바뀐 월 파일만 전처리하고 격자 공급 집계를 갱신합니다."""
+        print("🔄 월별 충전량 데이터 증분 적재 시작...")
+
+        monthly_files = self.loader.discover_monthly_charging_files()
+        if not monthly_files:
+            print("⚠️ 월별 충전량 데이터 파일이 없습니다.")
+            return []
+
+        processed_months = []
+        for month, file_path in monthly_files.items():
+            content_hash = file_sha256(file_path)
+            previous = self.manifest.get(month)
+
+            if previous and previous.get('sha256') == content_hash and self._partition_dir(month).exists():
+                print(f"   ⏭️ {month}: 변경 없음 (건너뜀)")
+                continue
+
+            print(f"   📥 {month}: {file_path.name} 전처리 중...")
+            raw_df = pd.read_excel(file_path)
+            cleaned_df = self.cleaner._clean_charging_stations_complete_fix([raw_df])
+
+            contribution = self.compute_grid_supply_contribution(cleaned_df)
+            old_contribution = self._read_contribution(month) if previous else None
+
+            self._write_partition(month, cleaned_df, contribution)
+            self._update_aggregate(contribution, old_contribution)
+
+            self.manifest[month] = {
+                'file': file_path.name,
+                'sha256': content_hash,
+                'rows': int(len(cleaned_df)),
+                'processed_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save_manifest()
+            processed_months.append(month)
+            print(f"   ✅ {month}: {len(cleaned_df):,}행 파티션 저장 완료")
+
+        print(f"✅ 증분 적재 완료: 신규/변경 {len(processed_months)}개월, 전체 {len(self.manifest)}개월")
+        return processed_months
+
+    def compute_grid_supply_contribution(self, charging_df):
+        """
+        한 달치 충전 데이터가 각 격자 공급 점수에 기여하는 값을 계산합니다.
+
+        DataCleaner._calculate_supply_score_fix와 같은 규칙을 따르되,
+        좌표 기반 점수와 행정구역 기반 점수를 따로 저장하여 월별 합산이 가능하게 합니다.
+        """
+        grid_ids = self.grid_cells['grid_id'].values
+        center_lats = self.grid_cells['center_lat'].values
+        center_lons = self.grid_cells['center_lon'].values
+
+        coord_supply = np.zeros(len(grid_ids))
+        district_supply = np.zeros(len(grid_ids))
+
+        # 서울 지역 충전소만 필터링
+        if '시도' in charging_df.columns:
+            seoul_charging = charging_df[charging_df['시도'].str.contains('서울', na=False)]
+        else:
+            seoul_charging = charging_df
+
+        has_amount = '충전량_numeric' in seoul_charging.columns
+
+        # 방법 1: 격자 중심점으로부터 반경 0.01도(약 1km) 내 충전소
+        if len(seoul_charging) > 0 and '경도' in seoul_charging.columns and '위도' in seoul_charging.columns:
+            coord_charging = seoul_charging[seoul_charging['경도'].notna() & seoul_charging['위도'].notna()]
+            station_lats = coord_charging['위도'].to_numpy(dtype=float)
+            station_lons = coord_charging['경도'].to_numpy(dtype=float)
+            amounts = coord_charging['충전량_numeric'].to_numpy(dtype=float) if has_amount else None
+
+            for idx in range(len(grid_ids)):
+                nearby = np.sqrt(
+                    (station_lats - center_lats[idx]) ** 2 + (station_lons - center_lons[idx]) ** 2
+                ) < 0.01
+                if amounts is not None:
+                    coord_supply[idx] = amounts[nearby].sum() / 100
+                else:
+                    coord_supply[idx] = nearby.sum() * 10
+
+        # 방법 2: 행정구역 기반 (구별 합계를 한 번만 계산)
+        district_col = '시군구' if '시군구' in seoul_charging.columns else (
+            '주소' if '주소' in seoul_charging.columns else None
+        )
+        if len(seoul_charging) > 0 and district_col:
+            district_totals = {}
+            for idx in range(len(grid_ids)):
+                for district in self.cleaner._get_districts_in_grid_fix(center_lats[idx], center_lons[idx]):
+                    if district not in district_totals:
+                        district_rows = seoul_charging[
+                            seoul_charging[district_col].str.contains(district, na=False)
+                        ]
+                        if has_amount:
+                            district_totals[district] = district_rows['충전량_numeric'].sum() / 1000
+                        else:
+                            district_totals[district] = len(district_rows) * 5
+                    district_supply[idx] += district_totals[district]
+
+        return pd.DataFrame({
+            'grid_id': grid_ids,
+            'coord_supply': coord_supply,
+            'district_supply': district_supply
+        })
+
+    def load_partitions(self, months=None):
+        """저장된 월별 파티션을 읽어 하나의 DataFrame으로 반환합니다."""
+        months = sorted(self.manifest) if months is None else months
+        frames = []
+        for month in months:
+            part_path = self._partition_dir(month) / self.PARTITION_FILE
+            if part_path.exists():
+                part_df = pd.read_csv(part_path)
+                part_df['month'] = month
+                frames.append(part_df)
+
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def load_grid_supply(self):
+        """격자별 누적 공급 점수(supply_score)를 반환합니다."""
+        if not self.aggregate_path.exists():
+            return pd.DataFrame(columns=['grid_id', 'coord_supply', 'district_supply', 'supply_score'])
+        return pd.read_csv(self.aggregate_path)
+
+    def apply_to_grid_system(self, grid_file=None):
+        """누적 공급 점수를 grid_system_processed.csv의 supply_score에 반영합니다."""
+        grid_file = Path(grid_file) if grid_file else self.processed_dir / 'grid_system_processed.csv'
+        if not grid_file.exists() or not self.aggregate_path.exists():
+            print("⚠️ 격자 시스템 또는 공급 집계 파일이 없어 반영을 건너뜁니다.")
+            return None
+
+        grid_df = pd.read_csv(grid_file)
+        supply = self.load_grid_supply().set_index('grid_id')['supply_score']
+        grid_df['supply_score'] = grid_df['grid_id'].map(supply).fillna(0)
+        write_csv_with_manifest(grid_df, grid_file)
+
+        print(f"💾 격자 공급 점수 반영 완료: {grid_file}")
+        return grid_df
+
+    def _update_aggregate(self, contribution, old_contribution=None):
+        """새 파티션의 기여분만 누적 집계에 더합니다 (재처리된 월은 이전 기여분을 뺍니다)."""
+        if self.aggregate_path.exists():
+            aggregate = pd.read_csv(self.aggregate_path).set_index('grid_id')
+        else:
+            aggregate = pd.DataFrame(
+                0.0, index=self.grid_cells['grid_id'], columns=['coord_supply', 'district_supply']
+            )
+
+        value_cols = ['coord_supply', 'district_supply']
+        delta = contribution.set_index('grid_id')[value_cols]
+        if old_contribution is not None:
+            delta = delta.sub(old_contribution.set_index('grid_id')[value_cols], fill_value=0)
+
+        aggregate = aggregate[value_cols].add(delta, fill_value=0)
+
+        # 좌표 기반 점수가 없을 때만 행정구역 기반 점수 사용 (기존 공급 점수 규칙과 동일)
+        aggregate['supply_score'] = np.where(
+            aggregate['coord_supply'] != 0, aggregate['coord_supply'], aggregate['district_supply']
+        ).clip(min=0)
+
+        write_csv_with_manifest(
+            aggregate.reset_index().rename(columns={'index': 'grid_id'}), self.aggregate_path
+        )
+
+    def _partition_dir(self, month):
+        return self.partition_root / f'month={month}'
+
+    def _write_partition(self, month, cleaned_df, contribution):
+        partition_dir = self._partition_dir(month)
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        write_csv_with_manifest(cleaned_df, partition_dir / self.PARTITION_FILE)
+        write_csv_with_manifest(contribution, partition_dir / self.CONTRIBUTION_FILE)
+
+    def _read_contribution(self, month):
+        contribution_path = self._partition_dir(month) / self.CONTRIBUTION_FILE
+        return pd.read_csv(contribution_path) if contribution_path.exists() else None
+
+    def _load_manifest(self):
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_manifest(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+
+# 외부에서 호출할 수 있는 함수들
+def run_incremental_charging_ingest(raw_dir='data/raw', processed_dir='data/processed'):
+    """새 월 파일만 적재하고 격자 공급 점수를 갱신하는 함수"""
+    ingestor = IncrementalChargingIngestor(raw_dir, processed_dir)
+    processed_months = ingestor.ingest_new_months()
+
+    if processed_months:
+        ingestor.apply_to_grid_system()
+
+    return processed_months
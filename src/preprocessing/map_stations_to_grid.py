@@ -1,6 +1,11 @@
 import pandas as pd
 from tqdm import tqdm
 
+try:
+    from utils.artifact_manifest import write_csv_with_manifest
+except ImportError:
+    from src.utils.artifact_manifest import write_csv_with_manifest
+
 def map_stations_to_grid(env_path, grid_path, output_path, encoding='cp949'):
     # 📂 데이터 로드
     env_station = pd.read_csv(env_path, encoding=encoding)
@@ -35,5 +40,5 @@ def map_stations_to_grid(env_path, grid_path, output_path, encoding='cp949'):
     ]].copy()
 
     # 6. 저장
-    processed.to_csv(output_path, index=False)
+    write_csv_with_manifest(processed, output_path, encoding='utf-8')
     print(f"✅ 저장 완료: {output_path}")
\ No newline at end of file
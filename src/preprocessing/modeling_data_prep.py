@@ -6,6 +6,11 @@ import numpy as np
 from pathlib import Path
 import os
 import sys
+import json
+import hashlib
+import io
+import time
+from datetime import datetime
 
 # 안전한 import 처리
 try:
@@ -14,7 +19,82 @@ try:
 except ImportError:
     pass
 
+from sklearn.neighbors import KDTree
+
+try:
+    from utils.file_hash import file_sha256
+    from utils.artifact_manifest import write_csv_with_manifest, write_manifest, load_manifest
+except ImportError:
+    from src.utils.file_hash import file_sha256
+    from src.utils.artifact_manifest import write_csv_with_manifest, write_manifest, load_manifest
+
+# read_csv가 문자열 컬럼에 쓰는 dtype (pandas 3은 str, 이전 버전은 object)
+CSV_STRING_DTYPE = pd.read_csv(io.StringIO('value\nx')).dtypes['value']
+
 class ModelingDataPreprocessor:
+    # 단계 결과 캐시 파일 (입력 해시 기반 지문 + 파일 해시 캐시)
+    CACHE_FILE = '.modeling_cache.json'
+    
+    # 모델링 데이터 준비 단계 DAG (의존 순서대로 나열)
+    # - inputs/outputs: (디렉토리 속성, 파일명) - 앞 단계의 출력이 뒤 단계의 입력이 됨
+    # - params: 결과에 영향을 주는 파라미터 (바뀌면 다시 실행)
+    MODELING_STEPS = [
+        {
+            'name': 'grid_system',
+            'title': '1️⃣ 격자 시스템 데이터 준비',
+            'method': '_prepare_grid_system',
+            'inputs': [('processed_dir', 'grid_system_processed.csv')],
+            'outputs': [('processed_dir', 'grid_system_processed.csv')],
+            'params': {'required_cols': ['grid_id', 'center_lat', 'center_lon', 'demand_score', 'supply_score']},
+            'messages': ('격자 시스템 준비 완료', '격자 시스템 준비 부분 성공')
+        },
+        {
+            'name': 'grid_features',
+            'title': '2️⃣ 격자 특성 데이터 생성',
+            'method': '_prepare_grid_features',
+            'inputs': [
+                ('processed_dir', 'grid_system_processed.csv'),
+                ('processed_dir', 'commercial_facilities_processed.csv'),
+                ('processed_dir', 'charging_stations_processed.csv')
+            ],
+            'outputs': [('output_dir', 'grid_features.csv')],
+            'params': {'commercial_radius': 0.005, 'station_radius': 0.01, 'random_state': 42},
+            'messages': ('격자 특성 데이터 생성 완료', '격자 특성 데이터 생성 부분 성공')
+        },
+        {
+            'name': 'demand_supply_analysis',
+            'title': '3️⃣ 수요-공급 분석 데이터 생성',
+            'method': '_prepare_demand_supply_analysis',
+            'inputs': [('output_dir', 'grid_features.csv')],
+            'outputs': [('output_dir', 'demand_supply_analysis.csv')],
+            'params': {'underserved_threshold': 2.0, 'high_quantile': 0.8},
+            'messages': ('수요-공급 분석 완료', '수요-공급 분석 부분 성공')
+        },
+        {
+            'name': 'optimal_locations',
+            'title': '4️⃣ 최적 위치 데이터 생성',
+            'method': '_prepare_optimal_locations',
+            'inputs': [('output_dir', 'demand_supply_analysis.csv')],
+            'outputs': [('output_dir', 'optimal_locations.csv')],
+            'params': {'top_n': 100},
+            'messages': ('최적 위치 데이터 생성 완료', '최적 위치 데이터 생성 부분 성공')
+        },
+        {
+            'name': 'validation',
+            'title': '5️⃣ 생성된 데이터 검증',
+            'method': '_validate_generated_data',
+            'inputs': [
+                ('output_dir', 'grid_system_processed.csv'),
+                ('output_dir', 'grid_features.csv'),
+                ('output_dir', 'demand_supply_analysis.csv'),
+                ('output_dir', 'optimal_locations.csv')
+            ],
+            'outputs': [],
+            'params': {'min_valid_files': 3},
+            'messages': ('데이터 검증 완료', '데이터 검증 부분 성공')
+        }
+    ]
+    
     def __init__(self, processed_data_dir='data/processed', output_dir='data/processed'):
         """모델링 데이터 전처리 클래스 초기화"""
         self.project_root = self._find_project_root()
@@ -34,6 +114,11 @@ class ModelingDataPreprocessor:
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # 이미 읽은 산출물 CSV 프레임 (파일 경로 → DataFrame, 같은 파일을 다시 읽지 않음)
+        self._frames = {}
+        self.cache_path = self.output_dir / self.CACHE_FILE
+        self.cache = self._load_cache()
+        
         print(f"🔧 모델링 전처리 초기화 완료")
         print(f"   📁 입력 디렉토리: {self.processed_dir}")
         print(f"   📁 출력 디렉토리: {self.output_dir}")
@@ -51,57 +136,34 @@ class ModelingDataPreprocessor:
         # 찾지 못한 경우 현재 디렉토리 반환
         return Path.cwd()
     
-    def prepare_all_modeling_data(self):
-        """모델링에 필요한 모든 데이터를 준비합니다."""
+    def prepare_all_modeling_data(self, force=False):
+        """
+        모델링에 필요한 모든 데이터를 준비합니다.
+        
+        각 단계는 입력 파일 내용 해시와 파라미터로 지문을 만들고,
+        지문과 출력 파일이 이전 실행과 같으면 건너뜁니다 (force=True면 모두 다시 실행).
+        연속으로 실행되는 단계끼리는 CSV를 다시 읽지 않고 메모리의 DataFrame을 넘겨받습니다.
+        """
         print("🚀 모델링 데이터 전처리 시작...")
         
         success_count = 0
-        total_steps = 5
+        total_steps = len(self.MODELING_STEPS)
+        start_time = time.perf_counter()
         
         try:
-            # 1. grid_system_processed.csv 확인 및 생성
-            print("\n1️⃣ 격자 시스템 데이터 준비...")
-            if self._prepare_grid_system():
-                success_count += 1
-                print("   ✅ 격자 시스템 준비 완료")
-            else:
-                print("   ⚠️ 격자 시스템 준비 부분 성공")
-            
-            # 2. grid_features.csv 생성
-            print("\n2️⃣ 격자 특성 데이터 생성...")
-            if self._prepare_grid_features():
-                success_count += 1
-                print("   ✅ 격자 특성 데이터 생성 완료")
-            else:
-                print("   ⚠️ 격자 특성 데이터 생성 부분 성공")
-            
-            # 3. demand_supply_analysis.csv 생성
-            print("\n3️⃣ 수요-공급 분석 데이터 생성...")
-            if self._prepare_demand_supply_analysis():
-                success_count += 1
-                print("   ✅ 수요-공급 분석 완료")
-            else:
-                print("   ⚠️ 수요-공급 분석 부분 성공")
-            
-            # 4. optimal_locations.csv 생성
-            print("\n4️⃣ 최적 위치 데이터 생성...")
-            if self._prepare_optimal_locations():
-                success_count += 1
-                print("   ✅ 최적 위치 데이터 생성 완료")
-            else:
-                print("   ⚠️ 최적 위치 데이터 생성 부분 성공")
+            for step in self.MODELING_STEPS:
+                print(f"\n{step['title']}...")
+                if self._run_step(step, force=force):
+                    success_count += 1
+                    print(f"   ✅ {step['messages'][0]}")
+                else:
+                    print(f"   ⚠️ {step['messages'][1]}")
             
-            # 5. 데이터 검증
-            print("\n5️⃣ 생성된 데이터 검증...")
-            if self._validate_generated_data():
-                success_count += 1
-                print("   ✅ 데이터 검증 완료")
-            else:
-                print("   ⚠️ 데이터 검증 부분 성공")
+            self._save_cache()
             
             # 결과 요약
             success_rate = success_count / total_steps * 100
-            print(f"\n📊 모델링 데이터 전처리 완료!")
+            print(f"\n📊 모델링 데이터 전처리 완료! ({time.perf_counter() - start_time:.2f}초)")
             print(f"   성공률: {success_count}/{total_steps} ({success_rate:.1f}%)")
             
             if success_count >= 4:
@@ -120,17 +182,131 @@ class ModelingDataPreprocessor:
             print(f"상세 오류: {traceback.format_exc()}")
             return False
     
+    def _run_step(self, step, force=False):
+        """단계 하나를 실행하거나, 입력/파라미터/출력이 그대로면 이전 결과를 재사용합니다."""
+        record = self.cache['steps'].get(step['name'])
+        
+        if not force and record and self._is_step_up_to_date(step, record):
+            print("   ⏭️ 입력 변경 없음 - 이전 결과 사용")
+            return record['result']
+        
+        result = bool(getattr(self, step['method'])())
+        
+        # 자기 입력을 보정하는 단계(격자 시스템)도 있으므로 지문은 실행 후 기준으로 기록
+        self.cache['steps'][step['name']] = {
+            'fingerprint': self._step_fingerprint(step),
+            'outputs': {str(path): self._file_hash(path) for path in self._step_paths(step, 'outputs')},
+            'result': result,
+            'ran_at': datetime.now().isoformat(timespec='seconds')
+        }
+        return result
+    
+    def _is_step_up_to_date(self, step, record):
+        if record.get('fingerprint') != self._step_fingerprint(step):
+            return False
+        
+        # 출력 파일이 지워졌거나 외부에서 바뀌었으면 다시 실행
+        for path in self._step_paths(step, 'outputs'):
+            if record.get('outputs', {}).get(str(path)) != self._file_hash(path) or not path.exists():
+                return False
+        return True
+    
+    def _step_params(self, name):
+        return next(step['params'] for step in self.MODELING_STEPS if step['name'] == name)
+    
+    def _step_paths(self, step, kind):
+        return [getattr(self, dir_attr) / filename for dir_attr, filename in step[kind]]
+    
+    def _step_fingerprint(self, step):
+        """입력 파일 내용 해시 + 파라미터로 단계 지문 계산"""
+        payload = {
+            'step': step['name'],
+            'params': step['params'],
+            'inputs': {str(path): self._file_hash(path) for path in self._step_paths(step, 'inputs')}
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _file_hash(self, path):
+        """파일 내용 해시 (크기/수정 시각이 같으면 캐시된 해시 재사용, 파일이 없으면 None)"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        
+        stat = path.stat()
+        cached = self.cache['file_hashes'].get(str(path))
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        
+        digest = file_sha256(path)
+        self.cache['file_hashes'][str(path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest
+        }
+        return digest
+    
+    def _load_frame(self, path):
+        """앞 단계에서 메모리에 남긴 프레임이 있으면 사용하고, 없으면 CSV를 읽습니다."""
+        path = Path(path)
+        if path in self._frames:
+            return self._frames[path].copy()
+        
+        df = pd.read_csv(path)
+        self._frames[path] = df
+        return df.copy()
+    
+    def _store_frame(self, path, df):
+        """
+        프레임을 CSV(+ manifest)로 저장하고 다음 단계가 쓸 수 있도록 메모리에도 보관합니다.
+        (보관하는 프레임은 CSV를 다시 읽었을 때와 같은 dtype - 앞 단계를 캐시로 건너뛴 경우와 동일)
+        """
+        path = Path(path)
+        write_csv_with_manifest(df, path)
+        self._frames[path] = self._as_csv_dtypes(df)
+    
+    def _as_csv_dtypes(self, df):
+        """범주형(pd.cut 등)은 값 dtype으로, 문자열 object는 read_csv의 문자열 dtype으로 맞춘 복사본"""
+        df = df.copy()
+        for col in df.columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                value_dtype = values.cat.categories.dtype
+                if value_dtype.kind in 'iub' and values.isna().any():
+                    value_dtype = np.dtype(float)
+                values = values.astype(value_dtype)
+            if (values.dtype == object and CSV_STRING_DTYPE != object
+                    and pd.api.types.infer_dtype(values, skipna=True) == 'string'):
+                values = values.astype(CSV_STRING_DTYPE)
+            df[col] = values
+        return df
+    
+    def _load_cache(self):
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                cache.setdefault('file_hashes', {})
+                cache.setdefault('steps', {})
+                return cache
+            except (json.JSONDecodeError, OSError):
+                print("   ⚠️ 단계 캐시 파일을 읽을 수 없어 새로 만듭니다.")
+        return {'file_hashes': {}, 'steps': {}}
+    
+    def _save_cache(self):
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+    
     def _prepare_grid_system(self):
         """grid_system_processed.csv 확인 및 보정"""
         try:
             grid_file = self.processed_dir / 'grid_system_processed.csv'
             
             if grid_file.exists():
-                df = pd.read_csv(grid_file)
+                df = self._load_frame(grid_file)
                 print(f"   📊 기존 격자 파일 발견: {len(df):,}행")
                 
                 # 필수 컬럼 확인 및 추가
-                required_cols = ['grid_id', 'center_lat', 'center_lon', 'demand_score', 'supply_score']
+                required_cols = self._step_params('grid_system')['required_cols']
                 missing_cols = [col for col in required_cols if col not in df.columns]
                 
                 if missing_cols:
@@ -165,7 +341,7 @@ class ModelingDataPreprocessor:
                             df[col] = 0
                     
                     # 수정된 파일 저장
-                    df.to_csv(grid_file, index=False, encoding='utf-8-sig')
+                    self._store_frame(grid_file, df)
                     print(f"   💾 격자 시스템 파일 보정 및 저장 완료")
                 
                 # 통계 출력
@@ -226,7 +402,7 @@ class ModelingDataPreprocessor:
             
             # 파일 저장
             grid_file = self.processed_dir / 'grid_system_processed.csv'
-            df.to_csv(grid_file, index=False, encoding='utf-8-sig')
+            self._store_frame(grid_file, df)
             
             print(f"   ✅ 기본 격자 시스템 생성 완료: {len(df):,}개 격자")
             return True
@@ -245,64 +421,50 @@ class ModelingDataPreprocessor:
                 print("   ❌ 격자 시스템 파일이 없습니다.")
                 return False
             
-            grid_df = pd.read_csv(grid_file)
+            grid_df = self._load_frame(grid_file)
             print(f"   📊 격자 데이터 로딩: {len(grid_df):,}행")
             
-            # 격자별 특성 계산
-            features_list = []
-            total_grids = len(grid_df)
+            params = self._step_params('grid_features')
+            rng = np.random.default_rng(params['random_state'])
             
-            for idx, grid in grid_df.iterrows():
-                # 진행률 표시 (1000개마다)
-                if idx % 1000 == 0 and idx > 0:
-                    progress = idx / total_grids * 100
-                    print(f"   진행률: {progress:.1f}% ({idx:,}/{total_grids:,})")
-                
-                # 기본 격자 정보
-                grid_features = {
-                    'grid_id': grid['grid_id'],
-                    'center_lat': grid['center_lat'],
-                    'center_lon': grid['center_lon'],
-                    'demand_score': float(grid.get('demand_score', 0)),  # 수요 점수
-                    'supply_score': float(grid.get('supply_score', 0))   # 공급 점수
-                }
-                
-                # 상업시설 수 계산 (안전한 방식)
-                commercial_count = self._safe_count_commercial(
-                    grid['center_lat'], grid['center_lon']
-                )
-                grid_features['commercial_count'] = commercial_count
-                
-                # 충전소 수 계산 (안전한 방식)
-                station_count = self._safe_count_stations(
-                    grid['center_lat'], grid['center_lon']
-                )
-                grid_features['station_count'] = station_count
-                
-                # 수요-공급 비율 계산
-                supply_safe = max(1, grid_features['supply_score'])  # 0으로 나누기 방지
-                grid_features['supply_demand_ratio'] = grid_features['demand_score'] / supply_safe
-                
-                # 인구 밀도 추정 (상업시설 수 기반)
-                grid_features['population_density'] = commercial_count * 12  # 계수 조정
-                
-                # 서울 중심부와의 거리 기반 접근성 점수
-                seoul_center_lat, seoul_center_lon = 37.5665, 126.9780
-                distance = np.sqrt(
-                    (grid['center_lat'] - seoul_center_lat)**2 + 
-                    (grid['center_lon'] - seoul_center_lon)**2
-                )
-                # 거리가 가까울수록 높은 점수 (0-100)
-                grid_features['accessibility_score'] = max(0, 100 - distance * 800)
-                
-                # 교통 접근성 점수 (랜덤 + 중심부 가중치)
-                center_bonus = max(0, 50 - distance * 400)
-                grid_features['transport_score'] = min(100, np.random.uniform(20, 80) + center_bonus)
-                
-                features_list.append(grid_features)
+            # 격자별 특성을 컬럼 단위 벡터 연산으로 계산
+            center_lat = grid_df['center_lat'].to_numpy(dtype=float)
+            center_lon = grid_df['center_lon'].to_numpy(dtype=float)
+            demand_score = self._numeric_column(grid_df, 'demand_score')
+            supply_score = self._numeric_column(grid_df, 'supply_score')
+            
+            # 상업시설/충전소 수 (파일을 한 번만 읽고 전체 격자를 한 번에 계산)
+            commercial_count = self._count_commercial_vectorized(
+                center_lat, center_lon, params['commercial_radius'], rng
+            )
+            station_count = self._count_stations_vectorized(
+                center_lat, center_lon, params['station_radius'], rng
+            )
             
-            # DataFrame 생성
-            features_df = pd.DataFrame(features_list)
+            # 서울 중심부와의 거리
+            seoul_center_lat, seoul_center_lon = 37.5665, 126.9780
+            distance = np.sqrt((center_lat - seoul_center_lat)**2 + (center_lon - seoul_center_lon)**2)
+            
+            # 교통 접근성 점수 (랜덤 + 중심부 가중치) - 전체 격자에 대해 한 번에 추출
+            center_bonus = np.maximum(0, 50 - distance * 400)
+            transport_score = np.minimum(100, rng.uniform(20, 80, size=len(grid_df)) + center_bonus)
+            
+            features_df = pd.DataFrame({
+                'grid_id': grid_df['grid_id'].to_numpy(),
+                'center_lat': center_lat,
+                'center_lon': center_lon,
+                'demand_score': demand_score,   # 수요 점수
+                'supply_score': supply_score,   # 공급 점수
+                'commercial_count': commercial_count,
+                'station_count': station_count,
+                # 수요-공급 비율 (0으로 나누기 방지)
+                'supply_demand_ratio': demand_score / np.maximum(1, supply_score),
+                # 인구 밀도 추정 (상업시설 수 기반)
+                'population_density': commercial_count * 12,
+                # 거리가 가까울수록 높은 접근성 점수 (0-100)
+                'accessibility_score': np.maximum(0, 100 - distance * 800),
+                'transport_score': transport_score
+            })
             
             # 데이터 타입 정리 및 결측값 처리
             numeric_columns = ['demand_score', 'supply_score', 'commercial_count', 'station_count', 
@@ -314,7 +476,7 @@ class ModelingDataPreprocessor:
             
             # 파일 저장
             output_file = self.output_dir / 'grid_features.csv'
-            features_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+            self._store_frame(output_file, features_df)
             
             # 통계 요약
             print(f"   💾 격자 특성 파일 저장: {output_file}")
@@ -332,91 +494,81 @@ class ModelingDataPreprocessor:
             print(f"   상세 오류: {traceback.format_exc()}")
             return False
     
-    def _safe_count_commercial(self, center_lat, center_lon, radius=0.005):
-        """안전한 상업시설 수 계산"""
+    def _numeric_column(self, df, col):
+        """숫자 컬럼을 float 배열로 반환 (없거나 숫자가 아니면 0)"""
+        if col not in df.columns:
+            return np.zeros(len(df))
+        return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=float)
+    
+    def _count_points_within(self, point_lat, point_lon, center_lat, center_lon, radius):
+        """각 격자 중심에서 위도/경도 차이가 모두 radius 이내인 지점 수 (체비셰프 거리 KDTree)"""
+        valid = ~(np.isnan(point_lat) | np.isnan(point_lon))
+        if not valid.any():
+            return np.zeros(len(center_lat), dtype=int)
+        
+        tree = KDTree(np.column_stack([point_lat[valid], point_lon[valid]]), metric='chebyshev')
+        return tree.query_radius(np.column_stack([center_lat, center_lon]), r=radius, count_only=True)
+    
+    def _count_commercial_vectorized(self, center_lat, center_lon, radius, rng):
+        """전체 격자의 상업시설 수 계산 (상업시설 CSV를 한 번 읽어 KDTree로 계산)"""
+        commercial_file = self.processed_dir / 'commercial_facilities_processed.csv'
+        if not commercial_file.exists():
+            # 파일이 없으면 위치 기반 추정값 반환
+            return self._estimate_commercial_vectorized(center_lat, center_lon, rng)
+        
         try:
-            commercial_file = self.processed_dir / 'commercial_facilities_processed.csv'
-            if not commercial_file.exists():
-                # 파일이 없으면 위치 기반 추정값 반환
-                return self._estimate_commercial_by_location(center_lat, center_lon)
-            
-            # 파일 크기 체크 (너무 크면 샘플링)
+            counts = np.zeros(len(center_lat), dtype=int)
             file_size_mb = commercial_file.stat().st_size / (1024 * 1024)
             
-            if file_size_mb > 200:  # 200MB 이상이면 청크 단위로 처리
-                return self._count_commercial_chunked(commercial_file, center_lat, center_lon, radius)
-            else:
-                df = pd.read_csv(commercial_file)
-                return self._count_commercial_direct(df, center_lat, center_lon, radius)
-                
+            # 200MB 이상이면 청크 단위로 누적
+            chunks = pd.read_csv(
+                commercial_file, usecols=lambda col: col in ('위도', '경도'),
+                chunksize=50000 if file_size_mb > 200 else None
+            )
+            for chunk in ([chunks] if isinstance(chunks, pd.DataFrame) else chunks):
+                if '경도' not in chunk.columns or '위도' not in chunk.columns:
+                    return np.zeros(len(center_lat), dtype=int)
+                counts += self._count_points_within(
+                    pd.to_numeric(chunk['위도'], errors='coerce').to_numpy(dtype=float),
+                    pd.to_numeric(chunk['경도'], errors='coerce').to_numpy(dtype=float),
+                    center_lat, center_lon, radius
+                )
+            
+            return np.minimum(counts, 200)  # 최대값 제한
+            
         except Exception:
             # 모든 예외 상황에서 추정값 반환
-            return self._estimate_commercial_by_location(center_lat, center_lon)
+            return self._estimate_commercial_vectorized(center_lat, center_lon, rng)
     
-    def _count_commercial_chunked(self, file_path, center_lat, center_lon, radius):
-        """청크 단위로 상업시설 수 계산"""
-        try:
-            total_count = 0
-            chunk_size = 50000
-            
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size):
-                if '경도' in chunk.columns and '위도' in chunk.columns:
-                    lat_diff = abs(chunk['위도'] - center_lat)
-                    lon_diff = abs(chunk['경도'] - center_lon)
-                    nearby = (lat_diff <= radius) & (lon_diff <= radius)
-                    total_count += nearby.sum()
-                    
-            return min(total_count, 200)  # 최대값 제한
-        except:
-            return self._estimate_commercial_by_location(center_lat, center_lon)
-    
-    def _count_commercial_direct(self, df, center_lat, center_lon, radius):
-        """직접 상업시설 수 계산"""
-        try:
-            if '경도' in df.columns and '위도' in df.columns:
-                lat_diff = abs(df['위도'] - center_lat)
-                lon_diff = abs(df['경도'] - center_lon)
-                nearby = (lat_diff <= radius) & (lon_diff <= radius)
-                return min(nearby.sum(), 200)  # 최대값 제한
-            return 0
-        except:
-            return self._estimate_commercial_by_location(center_lat, center_lon)
-    
-    def _estimate_commercial_by_location(self, center_lat, center_lon):
-        """위치 기반 상업시설 수 추정"""
+    def _estimate_commercial_vectorized(self, center_lat, center_lon, rng):
+        """위치 기반 상업시설 수 추정 (격자 전체를 한 번에 계산)"""
         # 서울 주요 상권 중심부들
-        major_centers = [
+        major_centers = np.array([
             (37.5665, 126.9780),  # 명동/중구
             (37.5173, 127.0473),  # 강남역
             (37.5407, 127.0700),  # 홍대
             (37.4837, 127.0324),  # 서초
             (37.5145, 127.1065),  # 잠실/송파
-        ]
+        ])
         
-        min_distance = float('inf')
-        for center_lat_ref, center_lon_ref in major_centers:
-            distance = np.sqrt((center_lat - center_lat_ref)**2 + (center_lon - center_lon_ref)**2)
-            min_distance = min(min_distance, distance)
+        min_distance = np.sqrt(
+            (center_lat[:, None] - major_centers[:, 0])**2 + (center_lon[:, None] - major_centers[:, 1])**2
+        ).min(axis=1)
         
-        # 거리에 반비례하는 상업시설 밀도
-        if min_distance < 0.01:  # 1km 이내
-            return np.random.randint(80, 150)
-        elif min_distance < 0.02:  # 2km 이내
-            return np.random.randint(40, 80)
-        elif min_distance < 0.05:  # 5km 이내
-            return np.random.randint(10, 40)
-        else:
-            return np.random.randint(0, 15)
+        # 거리에 반비례하는 상업시설 밀도 (1km / 2km / 5km / 그 외)
+        low = np.select([min_distance < 0.01, min_distance < 0.02, min_distance < 0.05], [80, 40, 10], 0)
+        high = np.select([min_distance < 0.01, min_distance < 0.02, min_distance < 0.05], [150, 80, 40], 15)
+        return rng.integers(low, high)
     
-    def _safe_count_stations(self, center_lat, center_lon, radius=0.01):
-        """안전한 충전소 수 계산"""
+    def _count_stations_vectorized(self, center_lat, center_lon, radius, rng):
+        """전체 격자의 충전소 수 계산 (충전소 CSV를 한 번 읽어 KDTree로 계산)"""
+        charging_file = self.processed_dir / 'charging_stations_processed.csv'
+        if not charging_file.exists():
+            # 파일이 없으면 추정값 반환
+            return self._estimate_stations_vectorized(center_lat, center_lon, rng)
+        
         try:
-            charging_file = self.processed_dir / 'charging_stations_processed.csv'
-            if not charging_file.exists():
-                # 파일이 없으면 추정값 반환
-                return self._estimate_stations_by_location(center_lat, center_lon)
-            
-            df = pd.read_csv(charging_file)
+            df = pd.read_csv(charging_file, usecols=lambda col: col in ('시도', '위도', '경도'))
             
             # 서울 지역 필터링
             if '시도' in df.columns:
@@ -425,36 +577,32 @@ class ModelingDataPreprocessor:
                 seoul_df = df
             
             if len(seoul_df) == 0:
-                return 0
-            
-            # 좌표 기반 계산
-            if '경도' in seoul_df.columns and '위도' in seoul_df.columns:
-                lat_diff = abs(seoul_df['위도'] - center_lat)
-                lon_diff = abs(seoul_df['경도'] - center_lon)
-                nearby = (lat_diff <= radius) & (lon_diff <= radius)
-                return min(nearby.sum(), 50)  # 최대 50개로 제한
+                return np.zeros(len(center_lat), dtype=int)
             
             # 좌표가 없으면 추정값 반환
-            return self._estimate_stations_by_location(center_lat, center_lon)
+            if '경도' not in seoul_df.columns or '위도' not in seoul_df.columns:
+                return self._estimate_stations_vectorized(center_lat, center_lon, rng)
+            
+            counts = self._count_points_within(
+                pd.to_numeric(seoul_df['위도'], errors='coerce').to_numpy(dtype=float),
+                pd.to_numeric(seoul_df['경도'], errors='coerce').to_numpy(dtype=float),
+                center_lat, center_lon, radius
+            )
+            return np.minimum(counts, 50)  # 최대 50개로 제한
             
-        except:
-            return self._estimate_stations_by_location(center_lat, center_lon)
+        except Exception:
+            return self._estimate_stations_vectorized(center_lat, center_lon, rng)
     
-    def _estimate_stations_by_location(self, center_lat, center_lon):
-        """위치 기반 충전소 수 추정"""
-        # 서울 중심부와의 거리 계산
+    def _estimate_stations_vectorized(self, center_lat, center_lon, rng):
+        """위치 기반 충전소 수 추정 (격자 전체를 한 번에 계산)"""
         seoul_center_lat, seoul_center_lon = 37.5665, 126.9780
         distance = np.sqrt((center_lat - seoul_center_lat)**2 + (center_lon - seoul_center_lon)**2)
         
-        # 거리에 따른 충전소 밀도 추정
-        if distance < 0.02:  # 2km 이내 (중심부)
-            return np.random.randint(5, 15)
-        elif distance < 0.05:  # 5km 이내 (도심)
-            return np.random.randint(2, 8)
-        elif distance < 0.1:   # 10km 이내 (외곽)
-            return np.random.randint(0, 5)
-        else:  # 10km 이상 (변두리)
-            return np.random.randint(0, 2)
+        # 거리에 따른 충전소 밀도 추정 (중심부 / 도심 / 외곽 / 변두리)
+        conditions = [distance < 0.02, distance < 0.05, distance < 0.1]
+        low = np.select(conditions, [5, 2, 0], 0)
+        high = np.select(conditions, [15, 8, 5], 2)
+        return rng.integers(low, high)
     
     def _prepare_demand_supply_analysis(self):
         """demand_supply_analysis.csv 생성"""
@@ -465,14 +613,15 @@ class ModelingDataPreprocessor:
                 print("   ❌ grid_features.csv 파일이 필요합니다.")
                 return False
             
-            df = pd.read_csv(grid_features_file)
+            df = self._load_frame(grid_features_file)
             print(f"   📊 격자 특성 데이터 로딩: {len(df):,}행")
+            params = self._step_params('demand_supply_analysis')
             
             # 불균형 점수 계산
             df['imbalance_score'] = df['demand_score'] / (df['supply_score'] + 1)
             
             # 불균형 지역 식별
-            df['is_underserved'] = df['imbalance_score'] > 2.0
+            df['is_underserved'] = df['imbalance_score'] > params['underserved_threshold']
             
             # 우선순위 등급 분류
             df['priority_level'] = pd.cut(
@@ -483,16 +632,16 @@ class ModelingDataPreprocessor:
             )
             
             # 고수요 지역 식별 (상위 20%)
-            demand_threshold = df['demand_score'].quantile(0.8)
+            demand_threshold = df['demand_score'].quantile(params['high_quantile'])
             df['high_demand'] = df['demand_score'] > demand_threshold
             
             # 고공급 지역 식별 (상위 20%)
-            supply_threshold = df['supply_score'].quantile(0.8)
+            supply_threshold = df['supply_score'].quantile(params['high_quantile'])
             df['high_supply'] = df['supply_score'] > supply_threshold
             
             # 분석 결과 저장
             analysis_file = self.output_dir / 'demand_supply_analysis.csv'
-            df.to_csv(analysis_file, index=False, encoding='utf-8-sig')
+            self._store_frame(analysis_file, df)
             
             # 통계 요약
             underserved_count = df['is_underserved'].sum()
@@ -521,7 +670,7 @@ class ModelingDataPreprocessor:
                 print("   ❌ demand_supply_analysis.csv 파일이 필요합니다.")
                 return False
             
-            df = pd.read_csv(analysis_file)
+            df = self._load_frame(analysis_file)
             print(f"   📊 분석 데이터 로딩: {len(df):,}행")
             
             # 최적 위치 점수 계산 (여러 요소 가중합)
@@ -540,11 +689,11 @@ class ModelingDataPreprocessor:
             ) * 100
             
             # 상위 100개 최적 위치 선정
-            top_locations = df.nlargest(100, 'optimization_score')
+            top_locations = df.nlargest(self._step_params('optimal_locations')['top_n'], 'optimization_score')
             
             # 결과 저장
             optimal_file = self.output_dir / 'optimal_locations.csv'
-            top_locations.to_csv(optimal_file, index=False, encoding='utf-8-sig')
+            self._store_frame(optimal_file, top_locations)
             
             print(f"   💾 최적 위치 파일 저장: {optimal_file}")
             print(f"   📊 선정된 최적 위치: {len(top_locations)}개")
@@ -582,15 +731,22 @@ class ModelingDataPreprocessor:
                 
                 if file_path.exists():
                     try:
-                        df = pd.read_csv(file_path)
+                        # manifest의 해시가 현재 파일과 같으면 파일을 다시 읽지 않음
+                        manifest = load_manifest(file_path)
+                        if manifest is None:
+                            print(f"   🔄 {filename}: manifest 없음/불일치 - 파일 재스캔")
+                            df = pd.read_csv(file_path)
+                            self._frames[Path(file_path)] = df
+                            manifest = write_manifest(file_path)
+                        
                         validation_results[filename] = {
                             'exists': True,
-                            'rows': len(df),
-                            'columns': len(df.columns),
+                            'rows': manifest['rows'],
+                            'columns': manifest['columns'],
                             'size_mb': file_path.stat().st_size / (1024 * 1024),
-                            'valid': len(df) > 0
+                            'valid': manifest['rows'] > 0
                         }
-                        print(f"   ✅ {filename}: {len(df):,}행, {len(df.columns)}컬럼")
+                        print(f"   ✅ {filename}: {manifest['rows']:,}행, {manifest['columns']}컬럼")
                     except Exception as e:
                         validation_results[filename] = {
                             'exists': True,
@@ -611,7 +767,7 @@ class ModelingDataPreprocessor:
             
             print(f"   📊 파일 검증 결과: {valid_files}/{total_files}개 파일 유효")
             
-            return valid_files >= 3  # 최소 3개 파일이 유효하면 성공
+            return valid_files >= self._step_params('validation')['min_valid_files']  # 최소 3개 파일이 유효하면 성공
             
         except Exception as e:
             print(f"   ❌ 데이터 검증 중 오류: {e}")
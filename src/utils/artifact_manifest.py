@@ -0,0 +1,192 @@
+# src/utils/artifact_manifest.py
+# 파이프라인 산출물(CSV) 옆에 두는 JSON 메타데이터 (<파일명>.manifest.json)
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from utils.file_hash import file_sha256
+except ImportError:
+    from src.utils.file_hash import file_sha256
+
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def manifest_path(file_path):
+    """산출물 파일에 대응하는 manifest 경로 (예: grid_features.csv → grid_features.csv.manifest.json)"""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + MANIFEST_SUFFIX)
+
+
+def json_scalar(value):
+    """numpy/pandas 스칼라를 JSON 직렬화 가능한 값으로 변환"""
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def build_manifest(file_path, chunk_size=100000):
+    """
+    저장된 CSV의 메타데이터를 계산합니다.
+    통계는 메모리 프레임이 아니라 CSV를 scan_csv_stats로 다시 읽어 계산하므로,
+    manifest 유무와 관계없이 같은 파일은 검증 시 같은 통계가 나옵니다.
+
+    Returns:
+    - dict: rows, columns, schema(컬럼별 dtype), null_counts, min/max(숫자 컬럼),
+      duplicate_rows, memory_usage, validation_mode, built_at
+    """
+    manifest = scan_csv_stats(file_path, mode='exact', chunk_size=chunk_size)
+    manifest['built_at'] = datetime.now().isoformat(timespec='seconds')
+    return manifest
+
+
+def has_stats(manifest):
+    """manifest에 CSV 스캔 통계가 들어 있는지 여부"""
+    return manifest is not None and 'null_counts' in manifest
+
+
+def scan_csv_stats(file_path, mode='exact', chunk_size=100000, sample_rate=0.1):
+    """
+    CSV를 청크 단위로 읽으며 manifest 통계를 계산합니다 (메모리 사용량은 청크 크기로 제한).
+
+    - 중복 행: 행마다 pd.util.hash_pandas_object로 uint64 해시를 만들고,
+      정렬된 고유 해시 배열과 병합하며 이미 본 해시 수를 셉니다.
+    - approx 모드: 해시 값으로 행을 표본 추출하므로 같은 행의 복사본은 함께 뽑히며,
+      중복 수는 (전체 행 수 - 표본 고유 해시 수 / 표본 비율)로, 메모리 사용량은 표본 비율로 나눠
+      추정합니다 (결측값/행 수/최소·최대는 정확).
+
+    Returns:
+    - dict: rows, columns, schema, null_counts, min, max, duplicate_rows, memory_usage, validation_mode
+    """
+    approx = mode == 'approx'
+    sample_threshold = np.uint64(min(max(sample_rate, 0.0), 1.0) * np.iinfo(np.uint64).max)
+
+    rows = 0
+    duplicates = 0
+    memory_usage = 0.0
+    schema = {}
+    null_counts = None
+    col_min, col_max = {}, {}
+    seen_hashes = np.empty(0, dtype=np.uint64)
+
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+        rows += len(chunk)
+        for col, dtype in chunk.dtypes.items():
+            schema.setdefault(str(col), str(dtype))
+
+        chunk_nulls = chunk.isnull().sum()
+        null_counts = chunk_nulls if null_counts is None else null_counts.add(chunk_nulls, fill_value=0)
+
+        for col in chunk.columns:
+            values = chunk[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                lo, hi = values.min(), values.max()
+                if pd.notna(lo):
+                    col_min[col] = lo if col not in col_min else min(col_min[col], lo)
+                    col_max[col] = hi if col not in col_max else max(col_max[col], hi)
+
+        # 청크마다 정수/실수 추론이 달라도 같은 행이 같은 해시가 되도록 숫자 컬럼은 float64로 통일
+        hash_frame = chunk.apply(
+            lambda values: values.astype('float64')
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+            else values
+        )
+        row_hashes = pd.util.hash_pandas_object(hash_frame, index=False).to_numpy(dtype=np.uint64)
+
+        if approx:
+            sampled = row_hashes <= sample_threshold
+            row_hashes = row_hashes[sampled]
+            memory_usage += float(chunk[sampled].memory_usage(deep=True, index=False).sum())
+        else:
+            memory_usage += float(chunk.memory_usage(deep=True, index=False).sum())
+
+        unique_hashes = np.unique(row_hashes)
+        duplicates += len(row_hashes) - len(unique_hashes)
+        duplicates += int(np.isin(unique_hashes, seen_hashes, assume_unique=True).sum())
+        seen_hashes = np.union1d(seen_hashes, unique_hashes)
+
+    if approx and sample_rate > 0:
+        duplicates = max(0.0, rows - len(seen_hashes) / sample_rate)
+        memory_usage = memory_usage / sample_rate
+    # 인덱스 바이트는 청크마다가 아니라 전체 프레임(RangeIndex) 기준으로 한 번만 (df.memory_usage(deep=True).sum()과 동일)
+    memory_usage += float(pd.RangeIndex(rows).memory_usage(deep=True))
+
+    return {
+        'rows': int(rows),
+        'columns': int(len(schema)),
+        'schema': schema,
+        'null_counts': {} if null_counts is None else {str(col): int(count) for col, count in null_counts.items()},
+        'min': {str(col): json_scalar(value) for col, value in col_min.items()},
+        'max': {str(col): json_scalar(value) for col, value in col_max.items()},
+        'duplicate_rows': int(round(duplicates)),
+        'memory_usage': float(memory_usage),
+        'validation_mode': mode
+    }
+
+
+def write_manifest(file_path):
+    """이미 저장된 산출물 파일을 한 번 스캔해 manifest를 작성합니다."""
+    return save_manifest(build_manifest(file_path), file_path)
+
+
+def save_manifest(manifest, file_path, sha256=None):
+    """
+    계산된 메타데이터에 파일 정보(file/size_bytes/sha256)를 붙여 manifest로 저장합니다.
+    (sha256: 이미 계산한 파일 해시가 있으면 전달해 다시 계산하지 않음)
+    """
+    file_path = Path(file_path)
+    manifest = dict(manifest)
+    manifest.setdefault('built_at', datetime.now().isoformat(timespec='seconds'))
+    manifest['file'] = file_path.name
+    manifest['size_bytes'] = int(file_path.stat().st_size)
+    manifest['sha256'] = sha256 or file_sha256(file_path)
+
+    with open(manifest_path(file_path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def write_csv_with_manifest(df, file_path, index=False, encoding='utf-8-sig', **kwargs):
+    """DataFrame을 CSV로 저장하고, 저장된 파일을 한 번 스캔해 옆에 manifest를 함께 작성합니다."""
+    df.to_csv(file_path, index=index, encoding=encoding, **kwargs)
+    return write_manifest(file_path)
+
+
+def load_manifest(file_path, verify=True, sha256=None):
+    """
+    산출물의 manifest를 읽습니다.
+
+    Parameters:
+    - file_path: 산출물 파일 경로
+    - verify (bool): True면 현재 파일 크기/해시가 manifest와 같은지 확인
+    - sha256 (str): 이미 계산한 현재 파일 해시 (있으면 다시 계산하지 않음)
+
+    Returns:
+    - dict 또는 None: manifest가 없거나 파일이 바뀌었으면 None (다시 스캔 필요)
+    """
+    file_path = Path(file_path)
+    path = manifest_path(file_path)
+    if not file_path.exists() or not path.exists():
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+    if verify:
+        if manifest.get('size_bytes') != file_path.stat().st_size:
+            return None
+        if manifest.get('sha256') != (sha256 or file_sha256(file_path)):
+            return None
+
+    return manifest
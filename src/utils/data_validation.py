@@ -3,20 +3,62 @@
 import pandas as pd
 import numpy as np
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import logging
 
+try:
+    from utils.artifact_manifest import load_manifest, save_manifest, has_stats, scan_csv_stats
+    from utils.file_hash import file_sha256
+except ImportError:
+    from src.utils.artifact_manifest import load_manifest, save_manifest, has_stats, scan_csv_stats
+    from src.utils.file_hash import file_sha256
+
 logger = logging.getLogger(__name__)
 
 class DataValidator:
-    def __init__(self):
+    # 파일별 검증 결과 캐시 (파일 내용 해시가 같으면 재검증하지 않음)
+    CACHE_FILE = '.validation_cache.json'
+    
+    # 데이터 타입별 특별 검증에 필요한 컬럼 (manifest가 유효하면 이 컬럼만 읽음)
+    SPECIAL_COLUMNS = {
+        'charging_stations': ['충전량_numeric', '충전소ID', '시도'],
+        'commercial_facilities': ['경도', '위도', '상권업종대분류명'],
+        'grid_system': ['min_lat', 'max_lat', 'min_lon', 'max_lon', 'demand_score', 'supply_score']
+    }
+    
+    # 전기차 등록 데이터의 지역/전기차 컬럼 판별 키워드
+    EV_REGION_KEYWORDS = ['시군구', '구', '지역', '동']
+    EV_COLUMN_KEYWORDS = ['전기', 'EV', '전동']
+    
+    def __init__(self, mode='exact', chunk_size=100000, sample_rate=0.1):
+        """
+        Parameters:
+        - mode (str): 'exact' (전체 행 해시로 중복 계산) 또는 'approx' (해시 기반 표본으로 중복/메모리 추정)
+        - chunk_size (int): 파일 스트리밍 시 한 번에 읽을 행 수
+        - sample_rate (float): approx 모드 표본 비율 (0~1)
+        """
+        if mode not in ('exact', 'approx'):
+            raise ValueError("mode는 'exact' 또는 'approx'여야 합니다.")
+        
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.sample_rate = sample_rate
         self.validation_results = {}
         self.quality_score = 0
         self.issues = []
         self.recommendations = []
     
-    def validate_all_data(self, processed_data_dir='data/processed'):
-        """모든 전처리된 데이터의 품질을 검증합니다."""
+    def validate_all_data(self, processed_data_dir='data/processed', max_workers=None, use_cache=True):
+        """
+        모든 전처리된 데이터의 품질을 검증합니다.
+        
+        Parameters:
+        - processed_data_dir: 전처리 결과 디렉토리
+        - max_workers (int): 파일 검증 프로세스 수 (None이면 CPU 수, 1이면 순차 실행)
+        - use_cache (bool): 파일 해시가 같으면 .validation_cache.json의 이전 결과 재사용
+        """
         print("🔍 데이터 검증 프로세스를 시작합니다...")
         print("=" * 60)
         print()
@@ -32,16 +74,38 @@ class DataValidator:
             'grid_system': 'grid_system_processed.csv'
         }
         
-        # 각 파일 검증
-        for data_type, filename in files_to_validate.items():
-            file_path = processed_dir / filename
-            if file_path.exists():
-                try:
-                    df = pd.read_csv(file_path)
-                    self._validate_dataset(data_type, df)
-                except Exception as e:
-                    logger.error(f"Error validating {filename}: {e}")
-                    self.issues.append(f"{data_type}: 파일 읽기 오류")
+        existing_files = {
+            data_type: processed_dir / filename
+            for data_type, filename in files_to_validate.items()
+            if (processed_dir / filename).exists()
+        }
+        
+        # 해시가 바뀐 파일만 검증 (변경 없는 파일은 캐시 결과 사용)
+        cache = self._load_validation_cache(processed_dir) if use_cache else {}
+        outcomes, pending = {}, {}
+        for data_type, file_path in existing_files.items():
+            file_hash = file_sha256(file_path)
+            cached = cache.get(data_type)
+            if cached and self._cache_matches(cached, file_hash):
+                print(f"⏭️ {file_path.name}: 변경 없음 (캐시된 검증 결과 사용)")
+                outcomes[data_type] = cached
+            else:
+                pending[data_type] = (file_path, file_hash)
+        
+        outcomes.update(self._validate_files(pending, max_workers))
+        
+        # 파일 순서대로 결과 병합 (순차 실행과 같은 리포트)
+        for data_type in existing_files:
+            outcome = outcomes[data_type]
+            if outcome.get('result') is not None:
+                self.validation_results[data_type] = outcome['result']
+            self.issues.extend(outcome['issues'])
+        
+        if use_cache:
+            for data_type, outcome in outcomes.items():
+                if not outcome.get('error'):
+                    cache[data_type] = outcome
+            self._save_validation_cache(processed_dir, cache)
         
         # 데이터 간 일관성 검증
         self._validate_data_consistency(processed_dir)
@@ -62,17 +126,105 @@ class DataValidator:
         
         return report
     
-    def _validate_dataset(self, data_type, df):
-        """개별 데이터셋을 검증합니다."""
-        validation_result = {
-            'rows': int(len(df)),  # numpy int64를 Python int로 변환
-            'columns': int(len(df.columns)),
-            'missing_values': int(df.isnull().sum().sum()),
-            'duplicate_rows': int(df.duplicated().sum()),
-            'data_types': {str(k): str(v) for k, v in df.dtypes.to_dict().items()},  # 문자열로 변환
-            'memory_usage': float(df.memory_usage(deep=True).sum())  # numpy int64를 float로 변환
+    def _validate_files(self, pending, max_workers=None):
+        """검증이 필요한 파일들을 프로세스 풀에서 동시에 검증합니다."""
+        if not pending:
+            return {}
+        
+        max_workers = min(len(pending), max_workers or os.cpu_count() or 1)
+        args = {
+            data_type: (data_type, str(file_path), file_hash, self.mode, self.chunk_size, self.sample_rate)
+            for data_type, (file_path, file_hash) in pending.items()
         }
         
+        if max_workers <= 1:
+            return {data_type: _validate_file_worker(*task) for data_type, task in args.items()}
+        
+        print(f"⚡ {len(pending)}개 파일 병렬 검증 (프로세스 {max_workers}개)")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {data_type: executor.submit(_validate_file_worker, *task) for data_type, task in args.items()}
+            return {data_type: future.result() for data_type, future in futures.items()}
+    
+    def _cache_matches(self, cached, file_hash):
+        """캐시된 결과가 같은 파일 내용 + 같은 검증 설정(mode, chunk_size, sample_rate)으로 만들어졌는지 여부"""
+        return (
+            cached.get('sha256') == file_hash
+            and cached.get('mode') == self.mode
+            and cached.get('chunk_size') == self.chunk_size
+            and cached.get('sample_rate') == self.sample_rate
+        )
+    
+    def _validate_file(self, data_type, file_path, file_hash=None):
+        """파일 하나를 검증해 validation_results/issues에 기록합니다 (file_hash: 이미 계산한 파일 해시)."""
+        filename = Path(file_path).name
+        try:
+            # manifest 해시가 현재 파일과 같고 통계가 있으면 필요한 컬럼만 읽고, 아니면 CSV 스캔
+            manifest = load_manifest(file_path, sha256=file_hash)
+            if not has_stats(manifest):
+                stats = self._stream_file_stats(file_path)
+                if self.mode == 'exact':
+                    save_manifest({**(manifest or {}), **stats}, file_path, sha256=file_hash)
+                manifest = stats
+            
+            special_cols = self._special_columns(data_type, manifest['schema'])
+            df = pd.read_csv(file_path, usecols=special_cols) if special_cols else pd.DataFrame()
+            self._validate_dataset(data_type, df, manifest)
+        except Exception as e:
+            logger.error(f"Error validating {filename}: {e}")
+            self.issues.append(f"{data_type}: 파일 읽기 오류")
+            return False
+        return True
+    
+    def _load_validation_cache(self, processed_dir):
+        cache_path = Path(processed_dir) / self.CACHE_FILE
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                logger.warning(f"Validation cache unreadable, rebuilding: {cache_path}")
+        return {}
+    
+    def _save_validation_cache(self, processed_dir, cache):
+        with open(Path(processed_dir) / self.CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2, default=str)
+    
+    def _stream_file_stats(self, file_path):
+        """CSV를 청크 단위로 읽어 manifest와 같은 형식의 통계를 계산합니다 (scan_csv_stats 참고)."""
+        return scan_csv_stats(file_path, mode=self.mode, chunk_size=self.chunk_size, sample_rate=self.sample_rate)
+    
+    def _special_columns(self, data_type, schema):
+        """특별 검증에 필요한 컬럼 중 파일에 있는 것만 반환"""
+        if data_type == 'ev_registration':
+            keywords = self.EV_REGION_KEYWORDS + self.EV_COLUMN_KEYWORDS
+            return [col for col in schema if any(x in str(col) for x in keywords)]
+        return [col for col in self.SPECIAL_COLUMNS.get(data_type, []) if col in schema]
+    
+    def _validate_dataset(self, data_type, df, manifest=None):
+        """
+        개별 데이터셋을 검증합니다.
+        
+        manifest가 주어지면 기본 통계는 manifest 값을 쓰고, df는 특별 검증용 컬럼만 포함합니다.
+        """
+        if manifest is not None:
+            validation_result = {
+                'rows': manifest['rows'],
+                'columns': manifest['columns'],
+                'missing_values': int(sum(manifest['null_counts'].values())),
+                'duplicate_rows': manifest['duplicate_rows'],
+                'data_types': manifest['schema'],
+                'memory_usage': manifest['memory_usage']
+            }
+        else:
+            validation_result = {
+                'rows': int(len(df)),  # numpy int64를 Python int로 변환
+                'columns': int(len(df.columns)),
+                'missing_values': int(df.isnull().sum().sum()),
+                'duplicate_rows': int(df.duplicated().sum()),
+                'data_types': {str(k): str(v) for k, v in df.dtypes.to_dict().items()},  # 문자열로 변환
+                'memory_usage': float(df.memory_usage(deep=True).sum())  # numpy int64를 float로 변환
+            }
+        
         # 데이터 타입별 특별 검증
         if data_type == 'charging_stations':
             validation_result.update(self._validate_charging_stations(df))
@@ -121,13 +273,13 @@ class DataValidator:
         result = {}
         
         # 지역 정보 검증
-        region_columns = [col for col in df.columns if any(x in str(col) for x in ['시군구', '구', '지역', '동'])]
+        region_columns = [col for col in df.columns if any(x in str(col) for x in self.EV_REGION_KEYWORDS)]
         if region_columns:
             result['region_columns'] = region_columns
             result['unique_regions'] = int(df[region_columns[0]].nunique())
         
         # 전기차 관련 컬럼 찾기
-        ev_columns = [col for col in df.columns if any(x in str(col) for x in ['전기', 'EV', '전동'])]
+        ev_columns = [col for col in df.columns if any(x in str(col) for x in self.EV_COLUMN_KEYWORDS)]
         if ev_columns:
             result['ev_columns'] = ev_columns
         
@@ -344,6 +496,20 @@ class DataValidator:
         else:
             return "F (불량)"
 
+def _validate_file_worker(data_type, file_path, file_hash, mode, chunk_size, sample_rate):
+    """프로세스 풀 워커: 파일 하나를 검증하고 캐시에 저장할 수 있는 결과 dict를 반환"""
+    validator = DataValidator(mode=mode, chunk_size=chunk_size, sample_rate=sample_rate)
+    ok = validator._validate_file(data_type, file_path, file_hash)
+    return {
+        'sha256': file_hash,
+        'mode': mode,
+        'chunk_size': chunk_size,
+        'sample_rate': sample_rate,
+        'result': validator.validation_results.get(data_type),
+        'issues': validator.issues,
+        'error': not ok
+    }
+
 # 외부에서 호출할 수 있는 함수들
 def run_data_validation():
     """데이터 검증을 실행하는 함수"""
@@ -0,0 +1,22 @@
+# src/utils/file_hash.py
+
+import hashlib
+from pathlib import Path
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """
+    파일 내용을 청크 단위로 읽어 SHA-256 해시를 계산합니다.
+
+    Parameters:
+    - file_path (str 또는 Path): 해시를 계산할 파일 경로
+    - chunk_size (int): 한 번에 읽을 바이트 수 (기본값: 1MB)
+
+    Returns:
+    - str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(Path(file_path), 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
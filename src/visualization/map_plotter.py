@@ -2,6 +2,11 @@ import folium
 import pandas as pd
 import os
 
+try:
+    from modeling.feature_contributions import format_drivers
+except ImportError:
+    from src.modeling.feature_contributions import format_drivers
+
 def plot_strategy_map(
     final_df: pd.DataFrame,
     coord_df: pd.DataFrame,
@@ -9,7 +14,8 @@ def plot_strategy_map(
     demand_col: str = "predicted_demand_score",
     center_lat: float = 37.55,
     center_lon: float = 126.98,
-    zoom_start: int = 11
+    zoom_start: int = 11,
+    drivers: pd.DataFrame = None
 ):
     """
     전략별 신규 커버 격자 위치를 지도 위에 시각화
@@ -18,6 +24,8 @@ def plot_strategy_map(
     - final_df: 전략별 신규 격자 데이터 (grid_id, strategy, percentile 등 포함)
     - coord_df: 좌표 정보 포함된 원본 데이터 (grid_id, center_lat, center_lon 포함)
     - output_path: 저장할 html 파일 경로
+    - drivers: 격자별 상위 예측 요인 (feature_contributions.top_drivers 결과, grid_id 인덱스)
+      지정하면 팝업에 '주요 요인'을 함께 표시
     """
     # 좌표 병합
     map_df = final_df.merge(coord_df[['grid_id', 'center_lat', 'center_lon']], on='grid_id', how='left')
@@ -32,8 +40,18 @@ def plot_strategy_map(
         '랜덤 설치': 'green'
     }
 
+    # 격자별 요인 문구는 지도에 표시할 격자에 대해서만 미리 만들어 둠
+    driver_texts = {}
+    if drivers is not None:
+        for grid_id, drivers_row in drivers.reindex(map_df['grid_id'].unique()).dropna(how='all').iterrows():
+            driver_texts[grid_id] = format_drivers(drivers_row)
+
     # 마커 추가
     for _, row in map_df.iterrows():
+        popup_html = f"{row['grid_id']}<br>{row['strategy']}<br>수요: {row[demand_col]:.1f}<br>상위 {row['percentile']:.2f}%"
+        if row['grid_id'] in driver_texts:
+            popup_html += f"<br><b>주요 요인</b><br>{driver_texts[row['grid_id']]}"
+
         folium.CircleMarker(
             location=[row['center_lat'], row['center_lon']],
             radius=7,
@@ -41,10 +59,7 @@ def plot_strategy_map(
             fill=True,
             fill_color=color_map.get(row['strategy'], 'gray'),
             fill_opacity=0.8,
-            popup=folium.Popup(
-                f"{row['grid_id']}<br>{row['strategy']}<br>수요: {row[demand_col]:.1f}<br>상위 {row['percentile']:.2f}%",
-                max_width=250
-            )
+            popup=folium.Popup(popup_html, max_width=250)
         ).add_to(m)
 
     # 저장